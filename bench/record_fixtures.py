@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import random
+from datetime import datetime, timedelta
+
+# Records the fixtures replayed by bench/run_bench.py.
+#
+#   python bench/record_fixtures.py              # fetch live responses (needs network)
+#   python bench/record_fixtures.py --synthetic  # deterministic stand-ins, no network
+#
+# Every HTTP fixture is listed in fixtures/manifest.json with the URL prefix it
+# answers and its Content-Type, the yfinance frame is stored as CSV.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "tools"))
+
+NEWS_QUERY = "AI OR 人工智慧"
+
+# url prefix (query string ignored when replaying), file, request params
+HTTP_FIXTURES = [
+    {"url": "https://www.coolpc.com.tw/evaluate.php", "file": "coolpc_evaluate.html", "params": None},
+    {"url": "https://news.google.com/rss/search", "file": "news_rss.xml",
+     "params": {"q": NEWS_QUERY, "hl": "zh-TW", "gl": "TW", "ceid": "TW:zh-Hant"}},
+    {"url": "https://store-site-backend-static-ipv4.ak.epicgames.com/freeGamesPromotions", "file": "epic_free_games.json",
+     "params": {"locale": "zh-Hant", "country": "TW", "allowCountries": "TW"}},
+    {"url": "https://store.steampowered.com/api/featuredcategories", "file": "steam_featured.json",
+     "params": {"cc": "TW", "l": "tchinese"}},
+    {"url": "https://api.open-meteo.com/v1/forecast", "file": "open_meteo.json",
+     "params": {"latitude": 25.0330, "longitude": 121.5654,
+                "daily": "weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max",
+                "timezone": "Asia/Taipei"}},
+]
+YF_FIXTURE = "yfinance_5d.csv"
+
+def yf_tickers():
+    """The tickers fetch_market_data asks for: base tickers plus config/stocks.json."""
+    import metal_history
+
+    with open(os.path.join(ROOT_DIR, "config", "stocks.json"), "r", encoding="utf-8") as f:
+        stocks = list(json.load(f)["stocks"])
+    return list(dict.fromkeys(metal_history.BASE_TICKERS + stocks))
+
+def write_manifest(content_types, source):
+    manifest = {
+        "source": source,
+        "recorded": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "http": [
+            {"url": f["url"], "file": f["file"], "content_type": content_types[f["file"]]}
+            for f in HTTP_FIXTURES
+        ],
+        "yfinance": YF_FIXTURE,
+    }
+    with open(os.path.join(FIXTURE_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+def record_live():
+    import http_client
+    import yfinance as yf
+
+    content_types = {}
+    for fixture in HTTP_FIXTURES:
+        print(f"Recording {fixture['url']}...")
+        response = http_client.get(fixture["url"], params=fixture["params"],
+                                   headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        with open(os.path.join(FIXTURE_DIR, fixture["file"]), "wb") as f:
+            f.write(response.content)
+        content_types[fixture["file"]] = response.headers.get("Content-Type", "")
+
+    print("Recording yfinance frame...")
+    yf.download(yf_tickers(), period="5d").to_csv(os.path.join(FIXTURE_DIR, YF_FIXTURE))
+    write_manifest(content_types, "live")
+
+def _synthetic_coolpc(rng):
+    brands = ["華碩", "技嘉", "微星", "華擎", "Intel", "AMD", "Crucial", "ADATA", "Seagate", "海盜船", "酷碼", "Lian Li"]
+    words = ["GAMING", "PRO", "WIFI", "TUF", "ROG", "AERO", "ARGB", "RGB", "DDR5", "Gen5", "ATX", "mATX", "OC", "EVO"]
+    rows = ['<html><head><meta http-equiv="Content-Type" content="text/html; charset=big5"></head><body><table>']
+    # Make sure the parts of config/builds.json exist in the page
+    builds_path = os.path.join(ROOT_DIR, "config", "builds.json")
+    wanted = []
+    if os.path.exists(builds_path):
+        with open(builds_path, "r", encoding="utf-8") as f:
+            for build in json.load(f).get("builds", []):
+                wanted.extend(part["model"] for part in build["parts"])
+    for cat in range(30):
+        rows.append(f'<tr><td>分類 {cat}</td><td><select name="n{cat}"><option value=0>請選擇</option>')
+        for group in range(6):
+            rows.append(f'<optgroup label="{rng.choice(brands)} 系列 {group}">')
+            for _ in range(35):
+                name = " ".join([rng.choice(brands)] + rng.sample(words, 4) + [f"{rng.choice('ABXZ')}{rng.randint(100, 999)}"])
+                rows.append(f"<option value={rng.randint(1, 99999)}>{name}【保固{rng.randint(1, 5)}年】, ${rng.randint(300, 60000)} ◆")
+            rows.append("</optgroup>")
+        rows.append("</select></td></tr>")
+    rows.append('<tr><td>指定</td><td><select name="n99">')
+    for model in wanted:
+        rows.append(f"<option value=1>{model} 盒裝, ${rng.randint(1000, 40000)} ★熱賣")
+    rows.append("</select></td></tr></table></body></html>")
+    return "\n".join(rows).encode("cp950", errors="replace")
+
+def _synthetic_rss(rng):
+    topics = ["台積電法說會", "輝達新晶片", "電動車補助", "AI 伺服器需求", "雷射切割機出口", "NBA 季後賽", "半導體設備", "ChatGPT 新功能"]
+    items = []
+    start = datetime(2026, 10, 1)
+    for i in range(100):
+        topic = rng.choice(topics)
+        title = f"{topic}{rng.choice(['引爆', '帶動', '衝擊', '點燃'])}{rng.choice(['市場', '股價', '供應鏈', '討論'])} 第{rng.randint(1, 30)}波 - 新聞{rng.randint(1, 9)}台"
+        date = (start + timedelta(hours=i)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        items.append(
+            f"<item><title>{title}</title><link>https://news.google.com/rss/articles/{i:05d}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">{i:05d}</guid><pubDate>{date}</pubDate>"
+            f"<description>&lt;a href=\"https://example.com/{i}\"&gt;{title}&lt;/a&gt;{' 內文' * 40}</description>"
+            f"<source url=\"https://example.com\">新聞{rng.randint(1, 9)}台</source></item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?><rss version="2.0"><channel>'
+            "<title>Google 新聞</title>" + "".join(items) + "</channel></rss>").encode("utf-8")
+
+def _synthetic_epic(rng):
+    elements = []
+    for i in range(40):
+        free = i % 8 == 0
+        elements.append({
+            "title": f"Game {i}",
+            "productSlug": f"game-{i}",
+            "keyImages": [{"type": "OfferImageWide", "url": f"https://example.com/{i}.jpg"}],
+            "price": {"totalPrice": {"discountPrice": 0 if free else rng.randint(100, 1500), "originalPrice": rng.randint(300, 1500)}},
+            "promotions": {"promotionalOffers": [{"promotionalOffers": [
+                {"startDate": "2026-10-16T15:00:00.000Z", "endDate": "2026-10-23T15:00:00.000Z"}
+            ]}]} if free or i % 3 == 0 else None,
+        })
+    return json.dumps({"data": {"Catalog": {"searchStore": {"elements": elements}}}}).encode("utf-8")
+
+def _synthetic_steam(rng):
+    items = [{"id": 1000 + i, "name": f"Steam Game {i}", "original_price": rng.randint(10000, 90000),
+              "final_price": rng.randint(1000, 9000), "discount_percent": rng.randint(10, 90),
+              "large_capsule_image": f"https://example.com/s{i}.jpg"} for i in range(30)]
+    return json.dumps({"specials": {"items": items}}).encode("utf-8")
+
+def _synthetic_open_meteo(rng):
+    days = [(datetime(2026, 10, 17) + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+    return json.dumps({"daily": {
+        "time": days,
+        "weather_code": [rng.choice([0, 1, 3, 61, 95]) for _ in days],
+        "temperature_2m_max": [round(rng.uniform(25, 33), 1) for _ in days],
+        "temperature_2m_min": [round(rng.uniform(18, 24), 1) for _ in days],
+        "precipitation_probability_max": [rng.randint(0, 100) for _ in days],
+    }}).encode("utf-8")
+
+def _synthetic_yfinance(rng):
+    fields = ["Close", "High", "Low", "Open", "Volume"]
+    base = {"CPER": 30.0, "TWD=X": 32.4, "GC=F": 2650.0, "SI=F": 31.0, "2002.TW": 22.0, "2015.TW": 70.0, "2027.TW": 35.0}
+    tickers = yf_tickers()
+    lines = [",".join(["Price"] + [f for f in fields for _ in tickers]),
+             ",".join(["Ticker"] + [t for _ in fields for t in tickers]),
+             "Date" + "," * (len(fields) * len(tickers))]
+    for i in range(5):
+        date = (datetime(2026, 10, 13) + timedelta(days=i)).strftime("%Y-%m-%d")
+        values = []
+        for field in fields:
+            for t in tickers:
+                price = base.get(t, 100.0) * rng.uniform(0.98, 1.02)
+                values.append(str(rng.randint(1000, 900000)) if field == "Volume" else f"{price:.4f}")
+        lines.append(",".join([date] + values))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def record_synthetic():
+    rng = random.Random(20261017)
+    makers = {
+        "coolpc_evaluate.html": (_synthetic_coolpc, "text/html"),
+        "news_rss.xml": (_synthetic_rss, "application/xml; charset=utf-8"),
+        "epic_free_games.json": (_synthetic_epic, "application/json"),
+        "steam_featured.json": (_synthetic_steam, "application/json"),
+        "open_meteo.json": (_synthetic_open_meteo, "application/json"),
+    }
+    content_types = {}
+    for name, (maker, content_type) in makers.items():
+        with open(os.path.join(FIXTURE_DIR, name), "wb") as f:
+            f.write(maker(rng))
+        content_types[name] = content_type
+    with open(os.path.join(FIXTURE_DIR, YF_FIXTURE), "wb") as f:
+        f.write(_synthetic_yfinance(rng))
+    write_manifest(content_types, "synthetic")
+    print(f"Synthetic fixtures written to {FIXTURE_DIR}")
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    if "--synthetic" in sys.argv:
+        record_synthetic()
+    else:
+        record_live()
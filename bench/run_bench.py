@@ -0,0 +1,292 @@
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import contextlib
+from datetime import datetime
+
+# Offline benchmarks: replays the recorded responses in bench/fixtures through
+# the real scraper code, with no network.
+#
+#   python bench/run_bench.py                    # all benchmarks, compared to bench/baseline.json
+#   python bench/run_bench.py news_dedupe        # selected benchmarks
+#   python bench/run_bench.py --repeat 10
+#   python bench/run_bench.py --save-baseline    # store this run as the new baseline
+#
+# HTTP is answered by a transport adapter mounted on the shared http_client
+# session, yfinance.download returns the recorded frame. Exits 1 when a
+# benchmark is slower than the baseline by more than BENCH_TOLERANCE.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+BENCH_TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "0.25"))
+DEFAULT_REPEAT = 5
+# fetch_market_data goes through the market cache: keep benchmark bars out of data/
+os.environ.setdefault("MARKET_CACHE_DIR", tempfile.mkdtemp(prefix="bench_market_"))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "tools"))
+
+import requests
+from requests.adapters import BaseAdapter
+
+import http_client
+
+class FixtureAdapter(BaseAdapter):
+    """Answers requests from recorded files, by URL prefix (query string ignored).
+    Unknown URLs raise, so a benchmark can never reach the network."""
+
+    def __init__(self, manifest):
+        super().__init__()
+        self.routes = []
+        for entry in manifest["http"]:
+            with open(os.path.join(FIXTURE_DIR, entry["file"]), "rb") as f:
+                self.routes.append((entry["url"], f.read(), entry["content_type"]))
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        url = request.url.split("?", 1)[0]
+        for prefix, body, content_type in self.routes:
+            if url.startswith(prefix):
+                self.calls += 1
+                response = requests.Response()
+                response.status_code = 200
+                response.reason = "OK"
+                response.url = request.url
+                response.request = request
+                response.headers["Content-Type"] = content_type
+                response.raw = io.BytesIO(body)
+                response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+                return response
+        raise requests.ConnectionError(f"No fixture for {request.url}")
+
+    def close(self):
+        pass
+
+def load_manifest():
+    path = os.path.join(FIXTURE_DIR, "manifest.json")
+    if not os.path.exists(path):
+        raise SystemExit(f"No fixtures in {FIXTURE_DIR}. Run: python bench/record_fixtures.py [--synthetic]")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def install_fixtures(manifest):
+    """Routes http_client and yfinance to the fixtures."""
+    import pandas as pd
+    import yfinance
+
+    adapter = FixtureAdapter(manifest)
+    session = http_client.get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    frame = pd.read_csv(os.path.join(FIXTURE_DIR, manifest["yfinance"]), header=[0, 1], index_col=0, parse_dates=True)
+    yfinance.download = lambda *args, **kwargs: frame.copy()
+    return adapter
+
+# Each benchmark: setup() -> state (untimed), run(state) -> units processed (timed)
+
+def _coolpc_fetch_setup(_):
+    from main import CoolpcScraper
+    return CoolpcScraper(fetch_mode="http")
+
+def _coolpc_fetch(scraper):
+    return len(scraper.fetch_catalog())
+
+def _coolpc_match_setup(_):
+    from main import CoolpcScraper
+    from build_pricing import load_builds
+
+    options = CoolpcScraper(fetch_mode="http").fetch_catalog()
+    return options, load_builds()
+
+def _coolpc_match(state):
+    from coolpc_catalog import CatalogIndex
+    from build_pricing import price_builds
+
+    options, builds = state
+    # A fresh index every run: CatalogIndex caches expanded postings
+    results = price_builds(CatalogIndex(options), builds)
+    return sum(len(r["prices"]) for r in results)
+
+def _news_fetch(_):
+    from news_scraper import CATEGORIES, fetch_news
+    return len(fetch_news(CATEGORIES[0]["query"], limit=100))
+
+def _news_top(_):
+    from news_scraper import CATEGORIES, fetch_news
+    # What the daily run asks for: a few items per category (parsing stops early)
+    return sum(len(fetch_news(cat["query"], limit=3)) for cat in CATEGORIES)
+
+def _news_dedupe_setup(_):
+    from news_scraper import CATEGORIES, fetch_news
+    # The same feed for every category, like overlapping queries on a busy day
+    return [item for cat in CATEGORIES for item in fetch_news(cat["query"], limit=30)]
+
+def _news_dedupe(items):
+    from news_scraper import deduplicate_news
+    deduplicate_news(items)
+    return len(items)
+
+def _epic_parse(_):
+    from game_scraper import fetch_epic_free_games
+    return len(fetch_epic_free_games())
+
+def _steam_parse(_):
+    from game_scraper import fetch_steam_specials
+    return len(fetch_steam_specials())
+
+def _weather_parse(_):
+    from weather_scraper import fetch_weather
+    return 1 if fetch_weather(25.0330, 121.5654) else 0
+
+def _market_data(_):
+    from metal_scraper import fetch_market_data
+    data = fetch_market_data()
+    return len(data["stocks"]) + 4 if data else 0
+
+def _history_build_setup(_):
+    import numpy as np
+    import pandas as pd
+    import metal_history
+
+    # Three years of daily closes for the base tickers and the configured stocks
+    with open(os.path.join(ROOT_DIR, "config", "stocks.json"), "r", encoding="utf-8") as f:
+        stocks = list(json.load(f)["stocks"])
+    tickers = metal_history.BASE_TICKERS + stocks
+    days = pd.bdate_range("2024-01-01", periods=3 * 261)
+    walk = 100 + np.random.default_rng(0).normal(0, 1, (len(days), len(tickers))).cumsum(axis=0)
+    walk[::17, -1] = 0  # holidays the TW feed reports as 0
+    columns = pd.MultiIndex.from_product([["Close"], tickers], names=["Price", "Ticker"])
+    return pd.DataFrame(walk, index=days, columns=columns), stocks
+
+def _history_build(state):
+    import metal_history
+    df, stocks = state
+    return len(metal_history.build_history(df, stocks, rebar=18800))
+
+def _plot_trends_setup(_):
+    from metal_store import MetalStore
+    records = MetalStore().records()
+    return records, os.path.join(tempfile.mkdtemp(prefix="bench_"), "metal_trend.png")
+
+def _plot_trends(state):
+    from metal_scraper import plot_trends
+    records, filename = state
+    plot_trends(records, filename)
+    return len(records)
+
+BENCHMARKS = [
+    {"name": "coolpc_fetch", "unit": "options", "setup": _coolpc_fetch_setup, "run": _coolpc_fetch},
+    {"name": "coolpc_match", "unit": "parts", "setup": _coolpc_match_setup, "run": _coolpc_match},
+    {"name": "news_fetch", "unit": "items", "setup": None, "run": _news_fetch},
+    {"name": "news_top", "unit": "items", "setup": None, "run": _news_top},
+    {"name": "news_dedupe", "unit": "items", "setup": _news_dedupe_setup, "run": _news_dedupe},
+    {"name": "epic_parse", "unit": "games", "setup": None, "run": _epic_parse},
+    {"name": "steam_parse", "unit": "games", "setup": None, "run": _steam_parse},
+    {"name": "weather_parse", "unit": "cities", "setup": None, "run": _weather_parse},
+    {"name": "market_data", "unit": "tickers", "setup": None, "run": _market_data},
+    {"name": "history_build", "unit": "rows", "setup": _history_build_setup, "run": _history_build},
+    {"name": "plot_trends", "unit": "rows", "setup": _plot_trends_setup, "run": _plot_trends, "repeat": 3},
+]
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_benchmark(bench, repeat=None):
+    """One warm-up run, then `repeat` timed runs. Scraper output is discarded."""
+    repeat = repeat or bench.get("repeat", DEFAULT_REPEAT)
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        state = bench["setup"](None) if bench["setup"] else None
+        units = bench["run"](state)
+        times = []
+        for _ in range(repeat):
+            quiet.seek(0)
+            quiet.truncate()
+            t = time.perf_counter()
+            units = bench["run"](state)
+            times.append(time.perf_counter() - t)
+
+    times.sort()
+    mean = sum(times) / len(times)
+    return {
+        "units": units,
+        "repeat": repeat,
+        "mean_ms": round(mean * 1000, 3),
+        "p50_ms": round(_percentile(times, 50) * 1000, 3),
+        "p95_ms": round(_percentile(times, 95) * 1000, 3),
+        "per_s": round(units / mean, 1) if mean > 0 else 0.0,
+    }
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(results, manifest, path=BASELINE_PATH):
+    baseline = load_baseline(path)
+    baseline.setdefault("results", {}).update(results)
+    baseline["fixtures"] = manifest.get("source")
+    baseline["saved"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+    print(f"Baseline saved to {path}")
+
+def main(argv):
+    names = [arg for arg in argv if not arg.startswith("--") and not arg.isdigit()]
+    repeat = None
+    if "--repeat" in argv:
+        repeat = int(argv[argv.index("--repeat") + 1])
+
+    unknown = set(names) - {b["name"] for b in BENCHMARKS}
+    if unknown:
+        raise SystemExit(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    selected = [b for b in BENCHMARKS if not names or b["name"] in names]
+
+    os.chdir(ROOT_DIR)
+    manifest = load_manifest()
+    adapter = install_fixtures(manifest)
+    baseline = load_baseline().get("results", {})
+
+    print(f"Fixtures: {manifest.get('source')} ({manifest.get('recorded')})")
+    print(f"{'benchmark':<16}{'units':>8}{'mean ms':>11}{'p50 ms':>10}{'p95 ms':>10}{'per s':>12}{'vs base':>10}")
+    results = {}
+    regressions = []
+    empty = []
+    for bench in selected:
+        result = run_benchmark(bench, repeat)
+        results[bench["name"]] = result
+        if not result["units"]:
+            # Nothing processed: the timing is of a failure path, not the benchmark
+            empty.append(bench["name"])
+        base = baseline.get(bench["name"])
+        change = ""
+        if base and base.get("mean_ms"):
+            ratio = result["mean_ms"] / base["mean_ms"]
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio > 1 + BENCH_TOLERANCE:
+                change += " !"
+                regressions.append(bench["name"])
+        print(f"{bench['name']:<16}{result['units']:>8}{result['mean_ms']:>11.2f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['per_s']:>12.1f}{change:>10}")
+    print(f"({adapter.calls} fixture responses served, no network)")
+
+    if empty:
+        print(f"Processed nothing (broken code path or fixtures): {', '.join(empty)}")
+        return 1
+    if "--save-baseline" in argv:
+        save_baseline(results, manifest)
+        return 0
+    if regressions:
+        print(f"Slower than baseline by more than {BENCH_TOLERANCE:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,30 +3,33 @@ import sys
 import json
 import time
 import base64
-import requests
-import gspread
-import difflib
-try:
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    PLOTTING_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Plotting libraries not available ({e}). Charts will be skipped.")
-    PLOTTING_AVAILABLE = False
-except Exception as e:
-    print(f"Warning: Error importing plotting libraries ({e}). Charts will be skipped.")
-    PLOTTING_AVAILABLE = False
-import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+import startup_budget
+startup_budget.install()
+
+import http_client
+import endpoints
+import sheets_client
+import sheet_batch
 from datetime import datetime
-from oauth2client.service_account import ServiceAccountCredentials
-from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
 
+# Heavy dependencies (gspread, pandas, matplotlib, playwright) are
+# imported inside the functions that use them, see HEAVY_MODULES.
+from coolpc_catalog import CatalogIndex, catalog_hash, matched_hash, parse_catalog_stream, validate_options
+from build_pricing import builds_hash, format_details, load_builds, price_builds, price_parts
+from catalog_snapshots import SnapshotStore
+from price_store import PriceStore
+import tracing
+
+HEAVY_MODULES = ["gspread", "pandas", "matplotlib.figure", "playwright.sync_api"]
+
 # Load environment variables from .env file
 load_dotenv()
 
 # LINE Bot SDK removed to avoid compatibility issues.
-# Using raw requests instead.
+# Using raw HTTP calls through the shared http_client instead.
 LINE_BOT_AVAILABLE = True
 
 # --- Configuration ---
@@ -37,26 +40,26 @@ LINE_USER_ID = os.environ.get("LINE_USER_ID")
 IMGBB_API_KEY = os.environ.get("IMGBB_API_KEY") # 改用 ImgBB
 GOOGLE_SHEET_URL = os.environ.get("GOOGLE_SHEET_URL", "https://docs.google.com/spreadsheets")
 
+# Coolpc fetch mode: "auto" (plain HTTP, Playwright fallback), "http" or "browser"
+COOLPC_FETCH_MODE = os.environ.get("COOLPC_FETCH_MODE", "auto")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+# Hashes and results of the last run, used to skip work when Coolpc has not changed
+RUN_STATE_PATH = os.environ.get(
+    "COOLPC_STATE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "coolpc_state.json")
+)
+
 SHEET_NAME = "PC_Price_Tracker"
 WORKSHEET_NAME = "Price_History"
 
-# --- Target Components (Updated from Screenshot) ---
-TARGETS = [
-    {"name": "CPU", "model": "Core Ultra 7 265KF"},
-    {"name": "MB", "model": "TUF GAMING Z890-PRO WIFI"},
-    {"name": "RAM", "model": "LancerBlade 64G"}, # Updated to 64G based on user image
-    {"name": "SSD", "model": "T700 2TB"}, 
-    {"name": "Cooler", "model": "TUF GAMING LC III 360 ARGB"},
-    {"name": "VGA", "model": "TUF-RTX5070Ti-O16G"},
-    {"name": "Case", "model": "GT502 Horizon"},
-    {"name": "PSU", "model": "TITAN GOLD 1000W"},
-    {"name": "OS", "model": "Windows 11 Pro 隨機"}, # Updated to OEM version
-]
+# --- Target Components ---
+# The builds and their parts are defined in config/builds.json only (build_pricing.py)
 
 class ImgBBUploader:
     def __init__(self, api_key):
         self.api_key = api_key
-        self.api_url = "https://api.imgbb.com/1/upload"
+        self.api_url = endpoints.IMGBB_UPLOAD_URL
 
     def upload(self, image_path):
         if not self.api_key:
@@ -69,7 +72,8 @@ class ImgBBUploader:
                     "key": self.api_key,
                     "image": base64.b64encode(file.read()),
                 }
-                response = requests.post(self.api_url, data=payload)
+                response = http_client.post(self.api_url, data=payload)
+                tracing.annotate(http_status=response.status_code, bytes=len(payload["image"]))
                 if response.status_code == 200:
                     data = response.json()
                     link = data['data']['url']
@@ -86,9 +90,10 @@ class LineBotNotifier:
     def __init__(self, access_token, user_id):
         self.access_token = access_token
         self.user_id = user_id
-        self.api_url = "https://api.line.me/v2/bot/message/push"
+        self.api_url = endpoints.LINE_PUSH_URL
 
-    def send_report(self, date_str, total_price, image_url=None, sheet_url=None, price_diff=0):
+    def send_report(self, date_str, total_price, image_url=None, sheet_url=None, price_diff=0, other_builds=None):
+        """other_builds: [(name, total, diff)] listed under the headline build."""
         if not self.access_token or not self.user_id:
             print("LINE Messaging API credentials not set.")
             return
@@ -151,6 +156,25 @@ class LineBotNotifier:
                 ]
             }
         }
+
+        # One row per additional build
+        for name, build_total, build_diff in other_builds or []:
+            if build_diff > 0:
+                build_diff_text, build_color = f"▲ ${build_diff:,}", "#FF334B"
+            elif build_diff < 0:
+                build_diff_text, build_color = f"▼ ${abs(build_diff):,}", "#33A1FF"
+            else:
+                build_diff_text, build_color = "-", "#1DB446"
+            contents["body"]["contents"].append({
+                "type": "box",
+                "layout": "horizontal",
+                "margin": "sm",
+                "contents": [
+                    {"type": "text", "text": name, "size": "sm", "color": "#555555", "flex": 3},
+                    {"type": "text", "text": f"${build_total:,}", "size": "sm", "weight": "bold", "align": "end", "flex": 2},
+                    {"type": "text", "text": build_diff_text, "size": "xs", "color": build_color, "align": "end", "flex": 2}
+                ]
+            })
         
         # Add Image if exists
         if image_url:
@@ -200,7 +224,8 @@ class LineBotNotifier:
         }
 
         try:
-            response = requests.post(self.api_url, headers=headers, json=data)
+            response = http_client.post(self.api_url, headers=headers, json=data)
+            tracing.annotate(http_status=response.status_code)
             if response.status_code == 200:
                 print("LINE Flex Message sent successfully.")
             else:
@@ -211,7 +236,7 @@ class LineBotNotifier:
                     "to": self.user_id,
                     "messages": [{"type": "text", "text": text_msg}]
                 }
-                requests.post(self.api_url, headers=headers, json=fallback_data)
+                http_client.post(self.api_url, headers=headers, json=fallback_data)
                 print("Fallback text message sent.")
 
         except Exception as e:
@@ -219,147 +244,152 @@ class LineBotNotifier:
 
 class SheetManager:
     def __init__(self, json_key_content, sheet_url):
-        self.scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        
-        if os.path.exists(json_key_content):
-            self.creds = ServiceAccountCredentials.from_json_keyfile_name(json_key_content, self.scope)
-        else:
-            try:
-                key_dict = json.loads(json_key_content)
-                self.creds = ServiceAccountCredentials.from_json_keyfile_dict(key_dict, self.scope)
-            except json.JSONDecodeError:
-                try:
-                    decoded = base64.b64decode(json_key_content).decode('utf-8')
-                    key_dict = json.loads(decoded)
-                    self.creds = ServiceAccountCredentials.from_json_keyfile_dict(key_dict, self.scope)
-                except Exception as e:
-                    print(f"Error parsing GSPREAD_JSON: {e}")
-                    raise
-
-        self.client = gspread.authorize(self.creds)
+        import gspread
+
+        # One client and spreadsheet handle per process, shared with the other jobs of the run
+        # (SHEETS_API_BASE / MOCK_BASE_URL point at a local stand-in that needs no credentials)
+        self.client = sheets_client.get_client(json_key_content)
         
         try:
-            self.sheet = self.client.open_by_url(sheet_url)
+            self.sheet = sheets_client.open_spreadsheet(sheet_url)
             print(f"Opened spreadsheet by URL: {sheet_url}")
-
-            try:
-                self.worksheet = self.sheet.worksheet(WORKSHEET_NAME)
-            except gspread.WorksheetNotFound:
-                print(f"Worksheet '{WORKSHEET_NAME}' not found, creating it...")
-                self.worksheet = self.sheet.add_worksheet(title=WORKSHEET_NAME, rows=1000, cols=10)
-                # Updated header for new data structure
-                self.worksheet.append_row(["Date", "Vendor", "Total Price", "Details"])
+            # Updated header for new data structure
+            self.worksheet = sheets_client.worksheet(self.sheet, WORKSHEET_NAME,
+                                                     header=["Date", "Vendor", "Total Price", "Details"])
         except gspread.SpreadsheetNotFound:
             print(f"Spreadsheet '{sheet_url}' not found. Please create it and share with the service account.")
             raise
 
+        # Local SQLite mirror: read path for last prices and charts, synced incrementally
+        self.store = PriceStore()
+        self.pulled_rows = self.store.pull(self.worksheet)
+
     def save_to_sheet(self, data_rows):
-        """Appends multiple rows of data to the worksheet."""
-        self.worksheet.append_rows(data_rows)
-        print(f"Appended {len(data_rows)} rows to Google Sheet.")
+        """Queues the rows for the run's Sheets flush (sheet_batch.commit())."""
+        sheet_batch.batch_for(self.sheet).append(self.worksheet, data_rows)
+        # The mirror is in sync with the sheet (pulled above), so the rows land right after its last row
+        self.store.record_appended(None, data_rows)
+        print(f"Queued {len(data_rows)} rows for Google Sheet.")
 
     def get_last_price(self, vendor):
         """Retrieves the last recorded total price for a given vendor."""
         try:
-            # Get all records and convert to DataFrame for easier filtering
-            all_records = self.worksheet.get_all_records()
-            if not all_records:
-                return 0
-
-            df = pd.DataFrame(all_records)
-            
-            # Ensure 'Date' is datetime and 'Total Price' is numeric
-            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-            df['Total Price'] = pd.to_numeric(df['Total Price'], errors='coerce').fillna(0)
-            
-            # Filter by vendor and sort by date to get the latest
-            vendor_df = df[df['Vendor'] == vendor].sort_values(by='Date', ascending=False)
-            
-            if not vendor_df.empty:
-                return vendor_df.iloc[0]['Total Price']
-            else:
-                return 0
+            return self.store.last_price(vendor)
         except Exception as e:
             print(f"Error getting last price for {vendor}: {e}")
             return 0
 
 class CoolpcScraper:
-    def __init__(self, browser):
-        self.url = "https://www.coolpc.com.tw/evaluate.php"
+    def __init__(self, browser=None, fetch_mode=COOLPC_FETCH_MODE):
+        self.url = endpoints.COOLPC_EVALUATE_URL
         self.browser = browser
+        self.fetch_mode = fetch_mode
+        # Filled by fetch_catalog(): which path produced the options and how long it took
+        self.fetch_path = None
+        self.fetch_seconds = 0.0
+        # Filled by scrape(): the parsed catalog, reused for snapshots
+        self.catalog = None
+
+    def fetch_catalog(self):
+        """Returns evaluate.php (category, option text) pairs, trying plain HTTP before Playwright."""
+        start = time.perf_counter()
+        options = None
+        self.fetch_path = None
+
+        if self.fetch_mode != "browser":
+            try:
+                options = self._fetch_options_http()
+                if validate_options([text for _, text in options]):
+                    self.fetch_path = "http"
+                else:
+                    print(f"[Coolpc] HTTP parse failed validation ({len(options)} options), falling back to Playwright.")
+                    options = None
+            except Exception as e:
+                print(f"[Coolpc] HTTP fetch failed ({e}), falling back to Playwright.")
+                options = None
+
+        if options is None and self.fetch_mode != "http":
+            options = self._fetch_options_browser()
+            self.fetch_path = "playwright"
+
+        self.fetch_seconds = time.perf_counter() - start
+        options = options or []
+        print(f"[Coolpc] Fetched {len(options)} options via {self.fetch_path} in {self.fetch_seconds:.2f}s")
+        return options
+
+    def _fetch_options_http(self):
+        headers = {"User-Agent": USER_AGENT, "Accept-Language": "zh-TW,zh;q=0.9"}
+        with http_client.get(self.url, headers=headers, stream=True, timeout=30) as response:
+            tracing.annotate(http_status=response.status_code)
+            response.raise_for_status()
+            return parse_catalog_stream(
+                response.iter_content(chunk_size=64 * 1024),
+                response.headers.get("Content-Type"),
+            )
+
+    def _fetch_options_browser(self):
+        if self.browser is not None:
+            return self._read_options(self.browser)
+
+        from playwright.sync_api import sync_playwright
+
+        with sync_playwright() as p:
+            browser = p.chromium.launch(
+                headless=True,
+                args=["--disable-blink-features=AutomationControlled", f"--user-agent={USER_AGENT}"]
+            )
+            try:
+                return self._read_options(browser)
+            finally:
+                browser.close()
 
-    def scrape(self):
-        print("Scraping Coolpc...")
-        page = self.browser.new_page()
-        prices = {}
-        
+    def _read_options(self, browser):
+        page = browser.new_page()
         try:
             page.goto(self.url)
             page.wait_for_load_state('networkidle')
-            
-            options = page.locator("select option").all_text_contents()
-            
-            for target in TARGETS:
-                model_keyword = target["model"]
-                found_price = 0
-                
-                # Multi-keyword matching logic
-                # Split model_keyword by space and require ALL parts to be present
-                keywords = model_keyword.lower().split()
-                candidates = [opt for opt in options if all(k in opt.lower() for k in keywords)]
-
-                if candidates:
-                    print(f"DEBUG: Candidates for {target['name']} ({model_keyword}):")
-                    for c in candidates:
-                         print(f"  - {c}")
-                    
-                    # If multiple match, logic depends on component type
-                    if target["name"] == "Case":
-                         # For cases, prefer higher price to avoid accessories (fans, kits)
-                         best_match = max(candidates, key=lambda x: self._extract_price(x))
-                    else:
-                         # Default: pick shortest match (most precise)
-                         best_match = min(candidates, key=len)
-                    
-                    try:
-                        price = self._extract_price(best_match)
-                        if price > 0:
-                            matched_opt = best_match
-                            prices[target["name"]] = (price, matched_opt)
-                            print(f"[Coolpc] Found {target['name']}: ${price} ({matched_opt})")
-                    except:
-                        pass
-                
-                if prices.get(target["name"], (0, ""))[0] == 0:
-                    print(f"[Coolpc] Not found: {target['name']}")
-                    prices[target["name"]] = (0, "") 
+            pairs = page.eval_on_selector_all(
+                "select option",
+                """els => els.map(o => [
+                    o.parentElement.tagName === 'OPTGROUP' ? (o.parentElement.label || '').trim() : (o.closest('select')?.name || ''),
+                    o.textContent.trim()
+                ])"""
+            )
+            return [(category, text) for category, text in pairs if text]
+        finally:
+            page.close()
+
+    def load_catalog(self):
+        """Fetches evaluate.php once and parses it into a CatalogIndex (also kept on self.catalog)."""
+        # Parse every option once (name, tokens, price) and index it by token
+        self.catalog = CatalogIndex(self.fetch_catalog())
+        return self.catalog
 
+    def scrape(self, targets=None):
+        """Prices `targets` (default: the parts of the first build in config/builds.json)."""
+        print("Scraping Coolpc...")
+        if targets is None:
+            targets = load_builds()[0]["parts"]
+        prices = {}
+        
+        try:
+            catalog = self.load_catalog()
+            prices = price_parts(catalog, targets)
         except Exception as e:
             print(f"Error scraping Coolpc: {e}")
-        finally:
-            page.close()
         
         return prices
 
-    def _extract_price(self, text):
-        try:
-            if '$' in text:
-                parts = text.split('$')
-                price_part = parts[-1].strip()
-                match = re.search(r'(\d+)', price_part)
-                if match:
-                    return int(match.group(1))
-        except:
-            pass
-        return 0
-
-def plot_trend(worksheet, output_file="trend.png"):
-    if not PLOTTING_AVAILABLE:
-        print("Skipping plot: libraries not available.")
+def plot_trend(data_records, output_file="trend.png", vendors=("Coolpc",)):
+    try:
+        import pandas as pd
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+    except Exception as e:
+        print(f"Warning: Plotting libraries not available ({e}). Charts will be skipped.")
         return None
 
     try:
-        data_records = worksheet.get_all_records()
         if not data_records:
             print("No data to plot.")
             return None
@@ -374,111 +404,228 @@ def plot_trend(worksheet, output_file="trend.png"):
         df['Total Price'] = pd.to_numeric(df['Total Price'], errors='coerce').fillna(0)
         df['Date'] = pd.to_datetime(df['Date'])
         
-        # Filter for Coolpc data only for this plot
-        coolpc_df = df[df['Vendor'] == 'Coolpc'].sort_values(by='Date')
+        # One line per build (Vendor column holds the build key)
+        coolpc_df = df[df['Vendor'].isin(vendors)].sort_values(by='Date')
         
         if coolpc_df.empty:
             print("No Coolpc data to plot.")
             return None
 
-        plt.figure(figsize=(10, 6))
+        # A Figure of its own on the Agg canvas: no pyplot global state, so this is
+        # safe next to metal_scraper's chart under tools/job_runner.py
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         
-        plt.plot(coolpc_df['Date'], coolpc_df['Total Price'], marker='o', label='Coolpc Total Price')
+        for vendor in vendors:
+            vendor_df = coolpc_df[coolpc_df['Vendor'] == vendor]
+            if not vendor_df.empty:
+                ax.plot(vendor_df['Date'], vendor_df['Total Price'], marker='o', label=f'{vendor} Total Price')
             
-        plt.title("Coolpc PC Total Price Trend")
-        plt.xlabel("Date")
-        plt.ylabel("Total Price (TWD)")
-        plt.grid(True)
-        plt.legend()
+        ax.set_title("Coolpc PC Total Price Trend")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Total Price (TWD)")
+        ax.grid(True)
+        ax.legend()
         
         # Import mdates locally to ensure it's available
         import matplotlib.dates as mdates
         
-        ax = plt.gca()
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=1)) # Tick every day
-        plt.gcf().autofmt_xdate() # Rotate labels
+        fig.autofmt_xdate() # Rotate labels
         
-        plt.tight_layout()
-        plt.savefig(output_file)
+        fig.tight_layout()
+        fig.savefig(output_file)
         print(f"Plot saved to {output_file}")
         return output_file
     except Exception as e:
         print(f"Error plotting trend: {e}")
         return None
 
+def save_snapshot(catalog, date_str):
+    """Stores the whole scraped catalog as today's (delta encoded) snapshot."""
+    if catalog is None or not len(catalog):
+        print("No catalog to snapshot.")
+        return
+    try:
+        rows = catalog.snapshot_rows()
+        size = SnapshotStore().save(date_str, rows)
+        print(f"Snapshot saved: {len(rows)} items, {size:,} bytes")
+    except Exception as e:
+        print(f"Error saving catalog snapshot: {e}")
+
+def load_run_state(path=RUN_STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_run_state(state, path=RUN_STATE_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        print(f"Error saving run state: {e}")
+
+def snapshot_only():
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    coolpc_scraper = CoolpcScraper()
+    save_snapshot(coolpc_scraper.load_catalog(), date_str)
+
 def main():
-    if not GSPREAD_JSON:
+    if "--snapshot-only" in sys.argv:
+        snapshot_only()
+        return
+
+    if not GSPREAD_JSON and not endpoints.sheets_mocked():
         print("Error: GSPREAD_JSON not set.")
         return
 
     print(f"Starting job at {datetime.now()}")
+    with tracing.trace("pc_price"):
+        try:
+            run_pipeline()
+        finally:
+            with tracing.span("flush"):
+                sheet_batch.commit()
+
+def run_pipeline():
     date_str = datetime.now().strftime("%Y-%m-%d")
     
-    sheet_manager = SheetManager(os.environ["GSPREAD_JSON"], os.environ["GOOGLE_SHEET_URL"])
-
-    # Get previous price BEFORE scraping new one (to compare)
-    last_coolpc_price = sheet_manager.get_last_price("Coolpc")
-    print(f"Last Coolpc Price: ${last_coolpc_price:,}")
+    with tracing.span("last_price") as span:
+        sheet_manager = SheetManager(os.environ.get("GSPREAD_JSON", ""), os.environ["GOOGLE_SHEET_URL"])
+        builds = load_builds()
+
+        # Get previous prices BEFORE scraping new ones (to compare)
+        last_prices = {}
+        for build in builds:
+            last_prices[build["key"]] = sheet_manager.get_last_price(build["key"])
+            print(f"Last {build['key']} Price: ${last_prices[build['key']]:,}")
+        span.set("rows_read", sheet_manager.pulled_rows)
+        span.set("builds", len(builds))
     
-    # 1. Scrape
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=["--disable-blink-features=AutomationControlled", "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"]
-        )
-        coolpc_scraper = CoolpcScraper(browser)
-        coolpc_prices = coolpc_scraper.scrape()
-        
-        # [REMOVED] Sinya scraping
-        # sinya_scraper = SinyaScraper(browser)
-        # sinya_prices = sinya_scraper.scrape()
-        browser.close()
-
-    # 2. Process
-    coolpc_total = sum(item[0] for item in coolpc_prices.values())
+    # 1. Scrape once (plain HTTP first, Playwright only if the static page is unusable)
+    coolpc_scraper = CoolpcScraper()
+    with tracing.span("scrape") as span:
+        try:
+            entries = coolpc_scraper.fetch_catalog()
+        except Exception as e:
+            print(f"Error scraping Coolpc: {e}")
+            entries = []
+        span.set("path", coolpc_scraper.fetch_path)
+        span.set("options", len(entries))
+    
+    # [REMOVED] Sinya scraping
+    # sinya_scraper = SinyaScraper(browser)
+    # sinya_prices = sinya_scraper.scrape()
+
+    # Compare with the last run: same page + same builds means the same results
+    state = load_run_state()
+    page_hash = catalog_hash(entries)
+    config_hash = builds_hash(builds)
+    catalog_unchanged = (
+        bool(entries)
+        and state.get("catalog_hash") == page_hash
+        and state.get("builds_hash") == config_hash
+        and bool(state.get("results"))
+    )
+
+    with tracing.span("process", unchanged=catalog_unchanged) as span:
+        if catalog_unchanged:
+            # 2. Process: reuse the last results, skip parsing and matching
+            print(f"[Coolpc] Catalog unchanged since {state.get('date')}, skipping parse/plot/upload.")
+            results = [
+                {"key": r["key"], "name": r["name"], "total": r["total"],
+                 "prices": {k: tuple(v) for k, v in r["prices"].items()}}
+                for r in state["results"]
+            ]
+            try:
+                SnapshotStore().save_unchanged(date_str)
+            except Exception as e:
+                print(f"Error saving catalog snapshot: {e}")
+        else:
+            # 2. Process: every build is priced from the same catalog
+            catalog = CatalogIndex(entries)
+            coolpc_scraper.catalog = catalog
+            save_snapshot(catalog, date_str)
+            results = price_builds(catalog, builds)
+            span.set("items", len(catalog))
+
+    picked_hash = matched_hash(results)
+    # Only the matched parts feed the chart, so an unrelated catalog change does not re-plot
+    matches_unchanged = picked_hash == state.get("matched_hash") and bool(state.get("image_url"))
     
     # 3. Save
     today = datetime.now().strftime("%Y-%m-%d")
     
-    # Format details for sheet
-    coolpc_detail_str = "\n".join([f"{k}: ${v[0]} ({v[1]})" for k, v in coolpc_prices.items()])
-    
-    sheet_manager.save_to_sheet([
-        [today, "Coolpc", coolpc_total, coolpc_detail_str],
-    ])
+    if catalog_unchanged:
+        # Lightweight "unchanged" point, keeps the daily history continuous
+        rows = [[today, r["key"], r["total"], f"(unchanged since {state.get('date')})"] for r in results]
+    else:
+        rows = [[today, r["key"], r["total"], format_details(r["prices"])] for r in results]
+    with tracing.span("save", rows_written=len(rows)):
+        sheet_manager.save_to_sheet(rows)
     
     # 4. Plot
     image_url = None
-    try:
-        plot_file = plot_trend(sheet_manager.worksheet)
-        if plot_file:
-            print(f"Plot saved to {plot_file}")
-            uploader = ImgBBUploader(os.environ["IMGBB_API_KEY"])
-            image_url = uploader.upload(plot_file)
-            print(f"Image uploaded: {image_url}")
-    except Exception as e:
-        print(f"Error in plotting/uploading: {e}")
-
-    # 5. Notify
+    if matches_unchanged:
+        image_url = state.get("image_url")
+        print(f"Matched parts unchanged, reusing chart: {image_url}")
+    else:
+        try:
+            with tracing.span("plot") as span:
+                vendors = [r["key"] for r in results]
+                records = sheet_manager.store.records(vendors)
+                span.set("rows_read", len(records))
+                plot_file = plot_trend(records, vendors=vendors)
+            if plot_file:
+                print(f"Plot saved to {plot_file}")
+                with tracing.span("upload"):
+                    uploader = ImgBBUploader(os.environ["IMGBB_API_KEY"])
+                    image_url = uploader.upload(plot_file)
+                print(f"Image uploaded: {image_url}")
+        except Exception as e:
+            print(f"Error in plotting/uploading: {e}")
+
+    if entries:
+        save_run_state({
+            "date": state.get("date") if catalog_unchanged else today,
+            "catalog_hash": page_hash,
+            "builds_hash": config_hash,
+            "matched_hash": picked_hash,
+            "image_url": image_url,
+            "results": results,
+        })
+
+    # 5. Notify (first build is the headline, the rest are listed below it)
     try:
         notifier = LineBotNotifier(os.environ["LINE_CHANNEL_ACCESS_TOKEN"], os.environ["LINE_USER_ID"])
         
         # Calculate diff
-        diff = coolpc_total - last_coolpc_price
+        for r in results:
+            r["diff"] = r["total"] - last_prices.get(r["key"], 0)
+        headline = results[0]
+        others = [(r["name"], r["total"], r["diff"]) for r in results[1:]]
         
         # Send report with diff
-        notifier.send_report(today, coolpc_total, image_url, os.environ["GOOGLE_SHEET_URL"], price_diff=diff)
+        with tracing.span("notify"):
+            notifier.send_report(today, headline["total"], image_url, os.environ["GOOGLE_SHEET_URL"],
+                                 price_diff=headline["diff"], other_builds=others)
         print("LINE Flex Message sent successfully.")
         
         print("-" * 30)
         print(f"Date: {today}")
-        print(f"Coolpc Total: ${coolpc_total:,}")
-        print(f"Diff: ${diff:,}")
-        print("-" * 30)
-        print("Coolpc Details:")
-        for k, v in coolpc_prices.items():
-            print(f"  {k}: ${v[0]:,} ({v[1]})")
+        print(f"Fetch: {coolpc_scraper.fetch_path} ({coolpc_scraper.fetch_seconds:.2f}s)")
+        for r in results:
+            print("-" * 30)
+            print(f"{r['name']} ({r['key']}) Total: ${r['total']:,}")
+            print(f"Diff: ${r['diff']:,}")
+            print("Details:")
+            for k, v in r["prices"].items():
+                print(f"  {k}: ${v[0]:,} ({v[1]})")
         print("-" * 30)
         
         print("Data saved to Google Sheets.")
@@ -486,4 +633,6 @@ def main():
         print(f"Error sending LINE notification: {e}")
 
 if __name__ == "__main__":
+    if startup_budget.requested():
+        sys.exit(startup_budget.report(HEAVY_MODULES))
     main()
@@ -4,24 +4,9 @@ echo ===================================================
 echo      PC Price Tracker - Manual Trigger Tool
 echo ===================================================
 echo.
-echo [1/5] 正在執行：氣象預報 (Weather)...
-python tools/weather_scraper.py
-echo.
-
-echo [2/5] 正在執行：電腦零組件報價 (PC Price)...
-python main.py
-echo.
-
-echo [3/5] 正在執行：每日新聞 (News)...
-python tools/news_scraper.py
-echo.
-
-echo [4/5] 正在執行：遊戲特價 (Games)...
-python tools/game_scraper.py
-echo.
-
-echo [5/5] 正在執行：金屬行情 (Metal)...
-python tools/metal_scraper.py
+echo 正在以單一程序同時執行：氣象、電腦報價、新聞、遊戲、金屬行情...
+echo (各任務輸出會以 [weather] [pc_price] [news] [games] [metal] 標示)
+python tools/job_runner.py
 echo.
 
 echo ===================================================
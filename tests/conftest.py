@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The tools are plain scripts importing each other by module name
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "tools"))
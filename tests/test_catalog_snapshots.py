@@ -0,0 +1,70 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from catalog_snapshots import SnapshotStore, apply_delta, encode_delta
+
+DAY_1 = [
+    ("CPU", "Core Ultra 7 265KF", 10990),
+    ("CPU", "Core Ultra 5 225", 6990),
+    ("VGA", "TUF-RTX5070Ti-O16G", 28990),
+    ("SSD", "T700 2TB", 7490),
+]
+
+def day(n):
+    return f"2026-10-{n:02d}"
+
+def catalog(n):
+    """Day n: one price moves every day, an item comes and goes, one is added for good."""
+    rows = [(c, name, price + (n if name == "T700 2TB" else 0)) for c, name, price in DAY_1]
+    if n % 2 == 0:
+        rows.append(("RAM", f"LancerBlade 64G rev{n}", 4000 + n))
+    if n >= 4:
+        rows.append(("Case", "GT502 Horizon", 3290))
+    return rows
+
+def record(store, date_str):
+    with gzip.open(os.path.join(store.directory, f"{date_str}.json.gz"), "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def test_delta_round_trip():
+    base = sorted(catalog(1))
+    items = sorted(catalog(2))
+    assert apply_delta(base, encode_delta(base, items)) == items
+
+def test_save_and_load_across_keyframe_boundary(tmp_path):
+    store = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    for n in range(1, 9):
+        store.save(day(n), catalog(n))
+
+    # keyframe, delta, delta, keyframe, ...
+    kinds = ["items" in record(store, day(n)) for n in range(1, 9)]
+    assert kinds == [True, False, False, True, False, False, True, False]
+
+    # A fresh store has nothing cached and must replay from the files
+    for n in reversed(range(1, 9)):
+        assert SnapshotStore(str(tmp_path), keyframe_interval=3).load(day(n)) == sorted(catalog(n))
+
+    # Forward scans reuse the previous day across the keyframe as well
+    scan = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    assert [scan.load(day(n)) for n in range(1, 9)] == [sorted(catalog(n)) for n in range(1, 9)]
+
+def test_duplicate_names_keep_first_price(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(day(1), [("CPU", "X", 100), ("CPU", "X", 200)])
+    assert store.load(day(1)) == [("CPU", "X", 100)]
+
+def test_older_snapshot_is_refused(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    store.save(day(2), catalog(2))
+    with pytest.raises(ValueError):
+        store.save(day(1), catalog(1))
+
+def test_history_filters_by_keywords_and_dates(tmp_path):
+    store = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    for n in range(1, 6):
+        store.save(day(n), catalog(n))
+    prices = [(d, p) for d, _, _, p in store.history("t700 2tb", start=day(2), end=day(4))]
+    assert prices == [(day(2), 7492), (day(3), 7493), (day(4), 7494)]
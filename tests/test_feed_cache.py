@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+import http_client
+import news_scraper
+from feed_cache import FeedCache
+
+URL = "https://news.google.com/rss/search?q=AI"
+BODY = b"<rss><channel><item><title>t</title></item></channel></rss>"
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+class FakeFeed:
+    """Answers 304 to a request carrying the current ETag, else 200 with the body."""
+
+    def __init__(self, etag='"v1"', body=BODY):
+        self.etag = etag
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        validators = {"ETag": self.etag, "Last-Modified": "Fri, 16 Oct 2026 08:00:00 GMT"} if self.etag else {}
+        return FakeResponse(200, self.body, validators)
+
+@pytest.fixture
+def feed(monkeypatch):
+    fake = FakeFeed()
+    monkeypatch.setattr(http_client, "get", fake.get)
+    return fake
+
+def test_unchanged_feed_is_answered_from_the_stored_body(tmp_path, feed):
+    cache = FeedCache(str(tmp_path))
+    assert news_scraper.fetch_feed(URL, cache) == (BODY, 200)
+    assert feed.requests == [{}]
+    cache.save()
+
+    # Next run: conditional request, 304, stored body
+    cache = FeedCache(str(tmp_path))
+    assert news_scraper.fetch_feed(URL, cache) == (BODY, 304)
+    assert feed.requests[-1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Fri, 16 Oct 2026 08:00:00 GMT"}
+
+    # Changed feed: new body and validators are kept
+    feed.etag, feed.body = '"v2"', BODY.replace(b"<title>t", b"<title>u")
+    assert news_scraper.fetch_feed(URL, cache) == (feed.body, 200)
+    assert cache.body(URL) == feed.body
+    assert cache.headers(URL)["If-None-Match"] == '"v2"'
+
+def test_304_without_a_stored_body_refetches(tmp_path, feed):
+    cache = FeedCache(str(tmp_path))
+    news_scraper.fetch_feed(URL, cache)
+    os.remove(cache._path(URL))
+    assert cache.headers(URL) == {}  # nothing to validate against
+    feed.requests.clear()
+
+    # A stale 304 (e.g. the file disappears between headers() and body())
+    cache.headers = lambda url: {"If-None-Match": '"v1"'}
+    assert news_scraper.fetch_feed(URL, cache) == (BODY, 200)
+    assert feed.requests == [{"If-None-Match": '"v1"'}, {}]
+
+def test_responses_without_validators_are_not_cached(tmp_path, feed):
+    feed.etag = None
+    cache = FeedCache(str(tmp_path))
+    assert news_scraper.fetch_feed(URL, cache) == (BODY, 200)
+    assert cache.headers(URL) == {} and cache.body(URL) is None
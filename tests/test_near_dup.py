@@ -0,0 +1,45 @@
+import pytest
+
+import near_dup
+from news_scraper import deduplicate_news
+
+SAME_STORY = [
+    ("台積電2奈米量產進度超前 蘋果搶首批產能 - 經濟日報", "台積電2奈米量產進度超前，蘋果搶下首批產能 - 自由時報"),
+    ("輝達財報優於預期 盤後股價大漲5% - 中央社", "輝達財報優於預期，盤後股價漲5% - 鉅亨網"),
+    ("Nvidia beats estimates, shares jump after hours - Reuters",
+     "Nvidia beats estimates; shares jump in after-hours trading - CNBC"),
+]
+
+DIFFERENT_STORIES = [
+    ("鴻海9月營收創同期新高 - 中央社", "廣達9月營收創同期新高 - 中央社"),
+    ("特斯拉第三季交車量創新高 - 中央社", "比亞迪第三季交車量創新高 - 中央社"),
+    ("台積電ADR大漲3% 台股期貨夜盤走高 - 經濟日報", "台積電ADR大跌3% 台股期貨夜盤走低 - 經濟日報"),
+    ("台積電法說會釋利多 第四季營收展望優於預期 - 經濟日報", "台積電美國廠二期動工 預計2028年量產 - 經濟日報"),
+]
+
+def similarity(a, b):
+    return near_dup.jaccard(near_dup.shingle_hashes(a), near_dup.shingle_hashes(b))
+
+@pytest.mark.parametrize("first, second", SAME_STORY)
+def test_same_story_from_two_outlets_is_merged(first, second):
+    assert similarity(first, second) >= near_dup.DEFAULT_THRESHOLD
+    index = near_dup.NearDuplicateIndex()
+    assert index.add(first)
+    assert not index.add(second)
+    assert index.find(second) == first
+
+@pytest.mark.parametrize("first, second", DIFFERENT_STORIES)
+def test_different_stories_from_one_outlet_are_kept(first, second):
+    assert similarity(first, second) < near_dup.DEFAULT_THRESHOLD
+    index = near_dup.NearDuplicateIndex()
+    assert index.add(first)
+    assert index.add(second)
+
+def test_source_suffix_is_ignored():
+    assert near_dup.normalize_title("央行利率維持不變 - 中央社") == near_dup.normalize_title("央行利率維持不變 - 自由財經")
+
+def test_deduplicate_news_keeps_first_of_each_story():
+    titles = [SAME_STORY[0][0], DIFFERENT_STORIES[0][0], SAME_STORY[0][1], DIFFERENT_STORIES[0][1]]
+    items = [{"title": t, "link": f"https://example.com/{i}"} for i, t in enumerate(titles)]
+    kept = [item["title"] for item in deduplicate_news(items)]
+    assert kept == [titles[0], titles[1], titles[3]]
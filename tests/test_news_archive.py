@@ -0,0 +1,46 @@
+from news_archive import NewsArchive
+
+NEWS = {
+    "半導體": [
+        {"title": "台積電2奈米量產進度超前", "link": "https://n.example.com/1", "source": "經濟日報",
+         "published": "2026-10-14T08:30"},
+        {"title": "AI晶片需求推升先進封裝", "link": "https://n.example.com/2", "source": "工商時報",
+         "published": "2026-10-15T09:00"},
+    ],
+    "電動車": [
+        {"title": "Tesla 發表新款 Model Y", "link": "https://n.example.com/3", "source": "自由時報",
+         "published": "2026-10-16T21:15"},
+        {"title": "", "link": "https://n.example.com/4"},  # no title: skipped
+    ],
+}
+
+def titles(rows):
+    return [r["title"] for r in rows]
+
+def test_add_upserts_by_link(tmp_path):
+    archive = NewsArchive(str(tmp_path / "news.sqlite3"))
+    assert archive.add(NEWS, seen_on="2026-10-16") == 3
+    assert archive.add(NEWS, seen_on="2026-10-17") == 0
+    assert len(archive) == 3
+    assert archive.add(NEWS, seen_on="2026-10-15") == 0  # an older run does not move last_seen back
+
+    first, last = archive.conn.execute(
+        "SELECT first_seen, last_seen FROM news WHERE link = ?", ("https://n.example.com/1",)).fetchone()
+    assert (first, last) == ("2026-10-16", "2026-10-17")
+
+def test_search_long_and_short_terms(tmp_path):
+    archive = NewsArchive(str(tmp_path / "news.sqlite3"))
+    archive.add(NEWS, seen_on="2026-10-16")
+    assert titles(archive.search("台積電 2奈米")) == ["台積電2奈米量產進度超前"]
+    assert titles(archive.search("ai")) == ["AI晶片需求推升先進封裝"]  # under 3 characters: LIKE
+    assert titles(archive.search("時報")) == ["Tesla 發表新款 Model Y", "AI晶片需求推升先進封裝"]  # source, newest first
+    assert titles(archive.search("model")) == ["Tesla 發表新款 Model Y"]
+    assert archive.search("台積電 Tesla") == []
+
+def test_search_date_range_is_inclusive(tmp_path):
+    archive = NewsArchive(str(tmp_path / "news.sqlite3"))
+    archive.add(NEWS, seen_on="2026-10-16")
+    rows = archive.search("時報", start="2026-10-15", end="2026-10-15")
+    assert titles(rows) == ["AI晶片需求推升先進封裝"]
+    assert rows[0]["category"] == "半導體" and rows[0]["first_seen"] == "2026-10-16"
+    assert titles(archive.first_seen("時報")) == ["AI晶片需求推升先進封裝", "Tesla 發表新款 Model Y"]
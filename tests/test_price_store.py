@@ -0,0 +1,62 @@
+import re
+
+from price_store import PriceStore
+
+class FakeWorksheet:
+    """Price_History rows (header excluded) answering get("A<n>:D")."""
+
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.reads = []
+
+    def get(self, a1):
+        start = int(re.match(r"A(\d+):D$", a1).group(1))
+        self.reads.append(a1)
+        return [list(r) for r in self.rows[start - 2:]]
+
+ROWS = [
+    ["2026-10-01", "Coolpc", "$52,980", "CPU: ..."],
+    ["2026-10-01", "Coolpc-Office", "21980", ""],
+    ["2026-10-02", "Coolpc", "51980", ""],
+]
+
+def test_pull_reads_only_new_rows(tmp_path):
+    store = PriceStore(str(tmp_path / "prices.sqlite3"))
+    ws = FakeWorksheet(ROWS)
+    assert store.pull(ws) == 3
+    assert store.last_row() == (4, "2026-10-02", "Coolpc", 51980)
+
+    ws.rows.append(["2026-10-03", "Coolpc", "50980", ""])
+    ws.reads.clear()
+    assert store.pull(ws) == 1
+    assert ws.reads == ["A4:D"]  # our last row again, then the new one
+    assert store.last_price("Coolpc") == 50980
+    assert store.last_price("Coolpc-Office") == 21980
+
+def test_pull_rebuilds_when_the_overlap_row_differs(tmp_path):
+    store = PriceStore(str(tmp_path / "prices.sqlite3"))
+    store.pull(FakeWorksheet(ROWS))
+
+    # Sheet reset and refilled: row 4 now holds something else
+    reset = FakeWorksheet([["2026-10-05", "Coolpc", "49980", ""], ["2026-10-05", "Coolpc-Office", "20980", ""],
+                           ["2026-10-06", "Coolpc", "48980", ""]])
+    assert store.pull(reset) == 3
+    assert [r["Total Price"] for r in store.records()] == [49980, 20980, 48980]
+    assert reset.reads == ["A4:D", "A2:D"]
+
+def test_pull_rebuilds_when_the_sheet_shrank(tmp_path):
+    store = PriceStore(str(tmp_path / "prices.sqlite3"))
+    store.pull(FakeWorksheet(ROWS))
+    assert store.pull(FakeWorksheet(ROWS[:1])) == 1
+    assert store.records() == [{"Date": "2026-10-01", "Vendor": "Coolpc", "Total Price": 52980, "Details": "CPU: ..."}]
+
+def test_record_appended_uses_the_reported_range(tmp_path):
+    store = PriceStore(str(tmp_path / "prices.sqlite3"))
+    store.pull(FakeWorksheet(ROWS))
+    store.record_appended({"updates": {"updatedRange": "Price_History!A7:D8"}},
+                          [["2026-10-04", "Coolpc", "47980", ""], ["2026-10-04", "Coolpc-Office", "19980", ""]])
+    assert store.last_row() == (8, "2026-10-04", "Coolpc-Office", 19980)
+    # Without a response (queued write) the rows follow our last row
+    store.record_appended(None, [["2026-10-05", "Coolpc", "46980", ""]])
+    assert store.last_row()[0] == 9
+    assert store.records(["Coolpc"])[-1]["Total Price"] == 46980
@@ -0,0 +1,37 @@
+from seen_news import SeenNewsStore
+
+def item(n, source="經濟日報"):
+    return {"title": f"台積電第{n}季營收創新高 - {source}", "link": f"https://news.example.com/{n}"}
+
+def test_seen_by_link_or_title_until_expiry(tmp_path):
+    path = str(tmp_path / "seen.json")
+    store = SeenNewsStore(path, days=3, today=100)
+    store.mark([item(1)])
+    store.save()
+
+    later = SeenNewsStore(path, days=3, today=102)
+    assert later.seen(item(1))
+    # Same story from another source under another link
+    assert later.seen({"title": item(1, "工商時報")["title"], "link": "https://other.example.com/x"})
+    assert later.filter([item(1), item(2)]) == [item(2)]
+
+    # Day 100 is outside the 3-day window on day 103
+    assert not SeenNewsStore(path, days=3, today=103).seen(item(1))
+
+def test_cap_keeps_the_most_recently_sent(tmp_path):
+    store = SeenNewsStore(str(tmp_path / "seen.json"), days=30, max_entries=2, today=100)
+    for n in range(1, 4):
+        store.today = 100 + n
+        store.mark([item(n)])
+    assert len(store) == 4  # 2 links + 2 titles
+    assert [store.seen(item(n)) for n in range(1, 4)] == [False, True, True]
+
+def test_generic_link_does_not_mark_other_stories(tmp_path):
+    store = SeenNewsStore(str(tmp_path / "seen.json"), today=100)
+    store.mark([{"title": "長網址的新聞", "link": "https://news.google.com"}])
+    assert not store.seen({"title": "另一則新聞", "link": "https://news.google.com"})
+
+def test_unreadable_store_starts_empty(tmp_path):
+    path = tmp_path / "seen.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert len(SeenNewsStore(str(path), today=100)) == 0
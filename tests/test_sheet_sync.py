@@ -0,0 +1,108 @@
+import re
+
+from sheet_sync import SheetSync, sync_rows
+
+HEADERS = ["Date", "Copper_TWD_Kg", "Gold_USD"]
+
+class FakeClient:
+    def __init__(self, ws):
+        self.ws = ws
+        self.requests = []
+
+    def batch_update(self, spreadsheet_id, body):
+        for request in body["requests"]:
+            self.requests.append(request)
+            (kind, args), = request.items()
+            if kind == "appendDimension":
+                self.ws.grid.extend([] for _ in range(args["length"]))
+                continue
+            start, end = args["range"]["startIndex"], args["range"]["endIndex"]
+            if kind == "deleteDimension":
+                del self.ws.grid[start:end]
+            else:
+                self.ws.grid[start:start] = [[] for _ in range(end - start)]
+
+class FakeWorksheet:
+    """A grid (header included) answering the calls SheetSync makes."""
+
+    id = 7
+    spreadsheet_id = "metal"
+    title = "Metal_Prices"
+
+    def __init__(self, rows):
+        self.grid = [list(HEADERS)] + [list(r) for r in rows]
+        self.client = FakeClient(self)
+        self.writes = []
+
+    @property
+    def row_count(self):
+        return len(self.grid)
+
+    def batch_get(self, ranges):
+        out = []
+        for a1 in ranges:
+            if a1 == "1:1":
+                out.append(self.grid[:1])
+            elif a1 == "A2:A":
+                keys = [[r[0]] if r and r[0] != "" else [] for r in self.grid[1:]]
+                while keys and not keys[-1]:
+                    keys.pop()  # Sheets drops trailing empty rows
+                out.append(keys)
+            else:
+                first, last = map(int, re.match(r"A(\d+):[A-Z]+(\d+)$", a1).groups())
+                out.append([list(r) for r in self.grid[first - 1:last]])
+        return out
+
+    def batch_update(self, data):
+        for block in data:
+            first = int(re.match(r"A(\d+):", block["range"]).group(1))
+            self.writes.append(first)
+            for offset, values in enumerate(block["values"]):
+                self.grid[first - 1 + offset] = list(values)
+
+    def table(self):
+        return [r for r in self.grid[1:] if r]
+
+def row(date, copper=300.0, gold=2650.0):
+    return [date, copper, gold]
+
+def dimensions(ws, kind):
+    return [(r[kind]["range"]["startIndex"], r[kind]["range"]["endIndex"])
+            for r in ws.client.requests if kind in r]
+
+def test_apply_inserts_mid_table_and_prunes():
+    # 10-03 is missing mid-table, 10-02 is no longer in the history
+    ws = FakeWorksheet([row("2026-10-01"), row("2026-10-02"), row("2026-10-04"), row("2026-10-05")])
+    history = [row("2026-10-01"), row("2026-10-03"), row("2026-10-04"), row("2026-10-05", copper=301.5),
+               row("2026-10-06")]
+    result = sync_rows(ws, HEADERS, history, prune=True)
+
+    assert dimensions(ws, "deleteDimension") == [(2, 3)]
+    assert dimensions(ws, "insertDimension") == [(2, 3)]
+    assert [r["appendDimension"]["length"] for r in ws.client.requests if "appendDimension" in r] == [1]
+    assert sorted(ws.writes) == [3, 5]  # 10-03, then 10-05 and 10-06 in one range
+    assert ws.table() == history
+    assert (result.inserted, result.changed, result.removed) == (2, 1, 1)
+
+def test_blank_and_repeated_dates_are_unkeyed_rows():
+    ws = FakeWorksheet([row("2026-10-01"), ["", 1, 2], row("2026-10-03"), row("2026-10-03", copper=1.0),
+                        row("2026-10-05")])
+    sync = SheetSync(ws, HEADERS).load()
+    assert sync.dates == ["2026-10-01", None, "2026-10-03", None, "2026-10-05"]
+    assert sync.rows["2026-10-03"] == 4  # the first occurrence
+
+    sync.apply([row("2026-10-02"), row("2026-10-03", copper=302.0), row("2026-10-04")])
+    # New dates go before the next later date; blank and repeated rows keep their place
+    assert dimensions(ws, "insertDimension") == [(3, 4), (6, 7)]
+    assert [r[:2] for r in ws.table()] == [
+        ["2026-10-01", 300.0], ["", 1], ["2026-10-02", 300.0], ["2026-10-03", 302.0],
+        ["2026-10-03", 1.0], ["2026-10-04", 300.0], ["2026-10-05", 300.0],
+    ]
+    assert sync.rows == {"2026-10-01": 2, "2026-10-02": 4, "2026-10-03": 5, "2026-10-04": 7, "2026-10-05": 8}
+
+def test_prune_removes_blank_and_repeated_rows():
+    ws = FakeWorksheet([row("2026-10-01"), [], row("2026-10-02"), row("2026-10-02", copper=1.0)])
+    result = sync_rows(ws, HEADERS, [row("2026-10-01"), row("2026-10-02")], prune=True)
+    assert dimensions(ws, "deleteDimension") == [(4, 5), (2, 3)]  # bottom up
+    assert ws.table() == [row("2026-10-01"), row("2026-10-02")]
+    assert (result.inserted, result.changed, result.removed) == (0, 0, 2)
@@ -0,0 +1,42 @@
+from build_pricing import builds_hash
+from catalog_snapshots import SnapshotStore
+from coolpc_catalog import catalog_hash, matched_hash
+
+ENTRIES = [("CPU", "Core Ultra 7 265KF 盒裝, $10990"), ("VGA", "TUF-RTX5070Ti-O16G, $28990")]
+
+def results(cpu_price):
+    return [{"key": "Coolpc", "name": "原價屋", "total": cpu_price + 28990,
+             "prices": {"CPU": (cpu_price, f"Core Ultra 7 265KF, ${cpu_price}"),
+                        "VGA": (28990, "TUF-RTX5070Ti-O16G, $28990")}}]
+
+def test_catalog_hash_ignores_whitespace_only():
+    spaced = [(c, f"  {text.replace(' ', '   ')} ") for c, text in ENTRIES]
+    assert catalog_hash(spaced) == catalog_hash(ENTRIES)
+    repriced = [ENTRIES[0], ("VGA", "TUF-RTX5070Ti-O16G, $27990")]
+    assert catalog_hash(repriced) != catalog_hash(ENTRIES)
+    assert catalog_hash(list(reversed(ENTRIES))) != catalog_hash(ENTRIES)
+
+def test_matched_hash_follows_picked_parts_only():
+    assert matched_hash(results(10990)) == matched_hash(results(10990))
+    assert matched_hash(results(10490)) != matched_hash(results(10990))
+
+def test_builds_hash_changes_with_the_builds():
+    builds = [{"key": "Coolpc", "name": "原價屋", "parts": [{"name": "CPU", "model": "265KF"}]}]
+    edited = [{"key": "Coolpc", "name": "原價屋", "parts": [{"name": "CPU", "model": "265K"}]}]
+    assert builds_hash(builds) != builds_hash(edited)
+
+def test_save_unchanged_repeats_the_latest_snapshot(tmp_path):
+    rows = [("CPU", "Core Ultra 7 265KF", 10990), ("VGA", "TUF-RTX5070Ti-O16G", 28990)]
+    store = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    assert store.save_unchanged("2026-10-01") == 0  # nothing to repeat yet
+    store.save("2026-10-01", rows)
+    for n in range(2, 6):
+        assert store.save_unchanged(f"2026-10-{n:02d}") > 0
+    assert store.save_unchanged("2026-10-03") == 0  # not after the latest day
+
+    fresh = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    assert fresh.dates() == [f"2026-10-{n:02d}" for n in range(1, 6)]
+    for date_str in fresh.dates():
+        assert SnapshotStore(str(tmp_path)).load(date_str) == sorted(rows)
+    # The delta chain still restarts at the keyframe interval
+    assert fresh._chain_length("2026-10-05") < 3
@@ -1,17 +1,16 @@
 
-import json
-import yfinance as yf
-import pandas as pd
 from datetime import datetime
+from metal_store import MetalStore
+import metal_history
 
 def backfill_json():
-    json_path = "docs/metal_data.json"
-    
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print("docs/metal_data.json not found.")
+    import pandas as pd
+    import yfinance as yf
+
+    store = MetalStore()
+    data = store.records()
+    if not data:
+        print("docs/metal_data/ is empty.")
         return
 
     # Get date range
@@ -25,38 +24,25 @@ def backfill_json():
     # Fetch data
     df = yf.download(tickers, start=start_date, end=end_date)
     
-    # Fill data
+    # Fill blanks column-wise: closes aligned to the stored dates (NaN where the
+    # market was closed, which ends up as null for plotly)
+    dates_index = pd.to_datetime(dates)
+    close = metal_history.close_prices(df, tickers).reindex(dates_index)
+    traded = close.notna().any(axis=1).tolist()
+    filled = {
+        "China_Steel_Price": metal_history.column_values(close["2002.TW"]),
+        "Feng_Hsin_Price": metal_history.column_values(close["2015.TW"]),
+    }
+
     updated_count = 0
-    for entry in data:
-        date_str = entry["Date"]
-        try:
-            # Check if we have data for this date
-            # yfinance returns Timestamp index
-            ts = pd.Timestamp(date_str)
-            
-            if ts in df.index:
-                # China Steel
-                if not entry.get("China_Steel_Price") or entry["China_Steel_Price"] == "":
-                     val = df["Close"]["2002.TW"].loc[ts]
-                     entry["China_Steel_Price"] = float(val)
-                
-                # Feng Hsin
-                if not entry.get("Feng_Hsin_Price") or entry["Feng_Hsin_Price"] == "":
-                     val = df["Close"]["2015.TW"].loc[ts]
-                     entry["Feng_Hsin_Price"] = float(val)
-                
-                updated_count += 1
-        except Exception as e:
-            # Date might be missing in stock data (weekend/holiday)
-            # If missing, we can forward fill from previous or leave as null (plotly handles null)
-            # But the JSON currently has "", let's change to null if not found
-            if entry.get("China_Steel_Price") == "": entry["China_Steel_Price"] = None
-            if entry.get("Feng_Hsin_Price") == "": entry["Feng_Hsin_Price"] = None
-            pass
+    for i, entry in enumerate(data):
+        for key, values in filled.items():
+            if not entry.get(key):
+                entry[key] = values[i]
+        updated_count += traded[i]
 
     # Save
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    store.replace_all(data)
         
     print(f"Backfill complete. Updated {updated_count} records.")
 
@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+
+from coolpc_catalog import select_target
+
+# Build definitions, see README "多組配置 (config/builds.json)".
+# {
+#   "builds": [
+#     {"key": "Coolpc", "name": "電競主機", "parts": [{"name": "CPU", "model": "Core Ultra 7 265KF"}, ...]},
+#     {"key": "Coolpc-Office", "name": "文書機", "parts": [...]}
+#   ]
+# }
+# "key" is what goes into the Vendor column of Price_History, so every build keeps
+# its own history series. The first build is the headline of the LINE report.
+BUILDS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "builds.json")
+
+def load_builds(path=BUILDS_PATH):
+    """Returns the list of builds. config/builds.json is the only definition of the builds."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No build definitions: {path} is missing")
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    builds = []
+    seen = set()
+    for build in config.get("builds", []):
+        key = build.get("key") or build.get("name")
+        if not key or key in seen:
+            raise ValueError(f"Build needs a unique key: {build}")
+        parts = build.get("parts", [])
+        for part in parts:
+            if not part.get("name") or not part.get("model"):
+                raise ValueError(f"Build '{key}' has a part without name/model: {part}")
+        seen.add(key)
+        builds.append({"key": key, "name": build.get("name", key), "parts": parts})
+
+    if not builds:
+        raise ValueError(f"No builds defined in {path}")
+    return builds
+
+def builds_hash(builds):
+    """Fingerprint of the build definitions, so editing builds.json invalidates cached results."""
+    return hashlib.sha256(json.dumps(builds, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def price_parts(catalog, parts, matches=None):
+    """Prices one build against a CatalogIndex: {part name: (price, matched option)}.
+
+    `matches` caches the pick per (part name, model), so parts shared between
+    builds are only matched once per run.
+    """
+    if matches is None:
+        matches = {}
+    prices = {}
+    for target in parts:
+        model_keyword = target["model"]
+        cache_key = (target["name"], model_keyword)
+
+        if cache_key not in matches:
+            # Multi-keyword matching logic
+            # Split model_keyword by space and require ALL parts to be present
+            candidates = catalog.match(model_keyword)
+            if candidates:
+                print(f"DEBUG: Candidates for {target['name']} ({model_keyword}):")
+                for c in candidates:
+                    print(f"  - {c.name}")
+            matches[cache_key] = select_target(target, candidates)
+
+        best_match = matches[cache_key]
+        if best_match is not None and best_match.price > 0:
+            prices[target["name"]] = (best_match.price, best_match.name)
+            print(f"[Coolpc] Found {target['name']}: ${best_match.price} ({best_match.name})")
+        else:
+            print(f"[Coolpc] Not found: {target['name']}")
+            prices[target["name"]] = (0, "")
+    return prices
+
+def price_builds(catalog, builds):
+    """Prices every build from the same catalog. Returns [{key, name, total, prices}]."""
+    matches = {}
+    results = []
+    for build in builds:
+        print(f"Pricing build: {build['name']} ({build['key']})")
+        prices = price_parts(catalog, build["parts"], matches)
+        results.append({
+            "key": build["key"],
+            "name": build["name"],
+            "total": sum(item[0] for item in prices.values()),
+            "prices": prices,
+        })
+    return results
+
+def format_details(prices):
+    """Details cell for Price_History."""
+    return "\n".join([f"{k}: ${v[0]} ({v[1]})" for k, v in prices.items()])
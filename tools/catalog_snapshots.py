@@ -0,0 +1,186 @@
+import os
+import sys
+import gzip
+import json
+
+# Daily full-catalog snapshots of Coolpc evaluate.php.
+#
+# One gzip JSON file per day in SNAPSHOT_DIR. Most days are a delta against the
+# previous snapshot: items that did not change are not written at all (they are
+# referenced implicitly by position in the previous day), only removed positions,
+# re-priced positions and brand new items are stored. Every KEYFRAME_INTERVAL days
+# a full copy is written, so rebuilding any day replays at most that many deltas.
+#
+#   keyframe: {"date": "2026-10-17", "items": [[category, name, price], ...]}
+#   delta:    {"date": "2026-10-18", "base": "2026-10-17",
+#              "removed": [[start, count], ...],    # ranges of base positions
+#              "repriced": [[position, price], ...],
+#              "added": [[category, name, price], ...]}
+#
+# Items are kept sorted by (category, name), so positions are stable between days.
+
+SNAPSHOT_DIR = os.environ.get(
+    "COOLPC_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "coolpc_snapshots")
+)
+KEYFRAME_INTERVAL = 30
+
+def _normalize(rows):
+    # Same (category, name) listed twice keeps the first price
+    items = {}
+    for category, name, price in rows:
+        items.setdefault((category, name), int(price))
+    return [(c, n, p) for (c, n), p in sorted(items.items())]
+
+def _ranges(positions):
+    ranges = []
+    for pos in positions:
+        if ranges and ranges[-1][0] + ranges[-1][1] == pos:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([pos, 1])
+    return ranges
+
+def encode_delta(base, items):
+    """Delta that turns sorted snapshot `base` into sorted snapshot `items`."""
+    current = {(c, n): p for c, n, p in items}
+    removed = []
+    repriced = []
+    for pos, (category, name, price) in enumerate(base):
+        new_price = current.pop((category, name), None)
+        if new_price is None:
+            removed.append(pos)
+        elif new_price != price:
+            repriced.append([pos, new_price])
+    added = [[c, n, p] for (c, n), p in sorted(current.items())]
+    return {"removed": _ranges(removed), "repriced": repriced, "added": added}
+
+def apply_delta(base, delta):
+    items = list(base)
+    for pos, price in delta["repriced"]:
+        category, name, _ = items[pos]
+        items[pos] = (category, name, price)
+    for start, count in reversed(delta["removed"]):
+        del items[start:start + count]
+    if delta["added"]:
+        items.extend(tuple(row) for row in delta["added"])
+        items.sort()
+    return items
+
+class SnapshotStore:
+    def __init__(self, directory=SNAPSHOT_DIR, keyframe_interval=KEYFRAME_INTERVAL):
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        # Only the last rebuilt day is kept, which is all that forward scans need
+        self._cache = {}
+
+    def _path(self, date_str):
+        return os.path.join(self.directory, f"{date_str}.json.gz")
+
+    def _read(self, date_str):
+        with gzip.open(self._path(date_str), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, date_str, record):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._path(date_str) + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self._path(date_str))
+
+    def dates(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(".json.gz")] for name in os.listdir(self.directory) if name.endswith(".json.gz"))
+
+    def save(self, date_str, rows):
+        """Stores the (category, name, price) rows for `date_str`. Returns bytes written."""
+        items = _normalize(rows)
+        dates = self.dates()
+        if dates and date_str < dates[-1]:
+            raise ValueError(f"Snapshot {date_str} is older than the latest one ({dates[-1]}), later deltas depend on it.")
+
+        earlier = [d for d in dates if d < date_str]
+        chain = self._chain_length(earlier[-1]) if earlier else None
+        if chain is None or chain + 1 >= self.keyframe_interval:
+            record = {"date": date_str, "items": [list(item) for item in items]}
+        else:
+            record = {"date": date_str, "base": earlier[-1]}
+            record.update(encode_delta(self.load(earlier[-1]), items))
+
+        self._write(date_str, record)
+        self._cache = {date_str: items}
+        return os.path.getsize(self._path(date_str))
+
+    def save_unchanged(self, date_str):
+        """Records `date_str` as identical to the latest snapshot without re-parsing the page."""
+        dates = self.dates()
+        if not dates or dates[-1] >= date_str:
+            return 0
+        if self._chain_length(dates[-1]) + 1 >= self.keyframe_interval:
+            return self.save(date_str, self.load(dates[-1]))
+        self._write(date_str, {"date": date_str, "base": dates[-1], "removed": [], "repriced": [], "added": []})
+        return os.path.getsize(self._path(date_str))
+
+    def _chain_length(self, date_str):
+        """Number of deltas between `date_str` and its keyframe."""
+        length = 0
+        record = self._read(date_str)
+        while "base" in record:
+            length += 1
+            record = self._read(record["base"])
+        return length
+
+    def load(self, date_str):
+        """Rebuilds the full sorted item list for one day."""
+        if date_str in self._cache:
+            return self._cache[date_str]
+
+        # Walk back to the nearest keyframe (or the cached day), then replay forward
+        records = []
+        record = self._read(date_str)
+        while "base" in record and record["base"] not in self._cache:
+            records.append(record)
+            record = self._read(record["base"])
+        if "base" in record:
+            items = self._cache[record["base"]]
+            records.append(record)
+        else:
+            items = [tuple(row) for row in record["items"]]
+        for record in reversed(records):
+            items = apply_delta(items, record)
+        self._cache = {date_str: items}
+        return items
+
+    def history(self, keyword, category=None, start=None, end=None):
+        """[(date, category, name, price)] for every item whose name contains all keywords."""
+        keywords = keyword.lower().split()
+        results = []
+        for date_str in self.dates():
+            if (start and date_str < start) or (end and date_str > end):
+                continue
+            for c, n, p in self.load(date_str):
+                if category and c != category:
+                    continue
+                if all(k in n.lower() for k in keywords):
+                    results.append((date_str, c, n, p))
+        return results
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("show", "history"):
+        print("Usage: python tools/catalog_snapshots.py show YYYY-MM-DD")
+        print("       python tools/catalog_snapshots.py history \"KEYWORDS\" [START] [END]")
+        return
+
+    store = SnapshotStore()
+    if sys.argv[1] == "show":
+        for category, name, price in store.load(sys.argv[2]):
+            print(f"{category}\t{name}\t${price:,}")
+    else:
+        start = sys.argv[3] if len(sys.argv) > 3 else None
+        end = sys.argv[4] if len(sys.argv) > 4 else None
+        for date_str, category, name, price in store.history(sys.argv[2], start=start, end=end):
+            print(f"{date_str}\t{category}\t{name}\t${price:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import re
+import json
+import codecs
+import hashlib
+from bisect import bisect_right
+from html.parser import HTMLParser
+
+# Coolpc evaluate.php lists every part as an <option> inside one <select> per category.
+# The page has thousands of options, so anything below this is a broken / blocked page.
+MIN_OPTION_COUNT = 100
+MIN_PRICED_RATIO = 0.5
+
+META_CHARSET_RE = re.compile(rb'charset\s*=\s*["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+# Latin/digit runs are one token each, any other word characters (CJK) become bigrams
+TOKEN_RE = re.compile(r"[0-9a-z]+|[^\W0-9a-z_]+")
+PRICE_RE = re.compile(r"(\d+)")
+
+class OptionTextParser(HTMLParser):
+    """Collects the text of every <option> while the page is fed in chunks.
+
+    Each option also gets a category: the label of its <optgroup>, or the name of
+    its <select> when it is not inside a group.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.options = []
+        self.categories = []
+        self._buffer = None
+        self._select = ""
+        self._group = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "option":
+            # </option> is optional in HTML, a new <option> closes the previous one
+            self._flush()
+            self._buffer = []
+        elif tag == "select":
+            self._flush()
+            self._select = dict(attrs).get("name") or ""
+            self._group = ""
+        elif tag == "optgroup":
+            self._flush()
+            self._group = (dict(attrs).get("label") or "").strip()
+
+    def handle_endtag(self, tag):
+        if tag in ("option", "select", "optgroup"):
+            self._flush()
+        if tag == "optgroup":
+            self._group = ""
+        elif tag == "select":
+            self._select = self._group = ""
+
+    def handle_data(self, data):
+        if self._buffer is not None:
+            self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        if self._buffer is None:
+            return
+        text = "".join(self._buffer).strip()
+        if text:
+            self.options.append(text)
+            self.categories.append(self._group or self._select)
+        self._buffer = None
+
+def normalize_encoding(name):
+    name = (name or "").strip().lower()
+    # cp950 is the Windows superset of Big5 and decodes the extra vendor characters
+    if name in ("big5", "big-5", "x-big5"):
+        return "cp950"
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+def sniff_encoding(content_type, head):
+    """Picks the charset from the Content-Type header, then the <meta> tag, then utf-8."""
+    if content_type and "charset=" in content_type.lower():
+        enc = normalize_encoding(content_type.lower().split("charset=")[-1].split(";")[0])
+        if enc:
+            return enc
+    match = META_CHARSET_RE.search(head or b"")
+    if match:
+        enc = normalize_encoding(match.group(1).decode("ascii", "ignore"))
+        if enc:
+            return enc
+    return "utf-8"
+
+def _feed_stream(chunks, content_type):
+    parser = OptionTextParser()
+    decoder = None
+    head = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decoder is None:
+            # Hold bytes back until there is enough of the <head> to find the charset
+            head += chunk
+            if len(head) < 4096:
+                continue
+            decoder = codecs.getincrementaldecoder(sniff_encoding(content_type, head[:4096]))(errors="replace")
+            chunk, head = head, b""
+        parser.feed(decoder.decode(chunk))
+    if decoder is None:
+        decoder = codecs.getincrementaldecoder(sniff_encoding(content_type, head))(errors="replace")
+    parser.feed(decoder.decode(head, final=True))
+    parser.close()
+    return parser
+
+def parse_option_stream(chunks, content_type=None):
+    """Streams raw HTML byte chunks through OptionTextParser and returns option texts."""
+    return _feed_stream(chunks, content_type).options
+
+def parse_catalog_stream(chunks, content_type=None):
+    """Like parse_option_stream, but returns (category, option text) pairs."""
+    parser = _feed_stream(chunks, content_type)
+    return list(zip(parser.categories, parser.options))
+
+def validate_options(options):
+    """Returns True if the option list looks like a real evaluate.php catalog."""
+    if len(options) < MIN_OPTION_COUNT:
+        return False
+    priced = sum(1 for opt in options if "$" in opt)
+    return priced >= len(options) * MIN_PRICED_RATIO
+
+def extract_name(text):
+    """Option text without the trailing price and markers ("..., $10990 ◆ ★熱賣")."""
+    if '$' not in text:
+        return text.strip()
+    return text.rsplit('$', 1)[0].rstrip(" ,，")
+
+def extract_price(text):
+    """Price is the first number after the last '$' in an option, 0 if there is none."""
+    if '$' not in text:
+        return 0
+    match = PRICE_RE.search(text.rsplit('$', 1)[-1])
+    return int(match.group(1)) if match else 0
+
+def tokenize(text):
+    """Normalized tokens for an option name or a search keyword (lower-cased)."""
+    tokens = []
+    for run in TOKEN_RE.findall(text.lower()):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+class CatalogItem:
+    __slots__ = ("category", "name", "lower", "tokens", "price")
+
+    def __init__(self, name, category=""):
+        self.category = category
+        self.name = name
+        self.lower = name.lower()
+        self.tokens = frozenset(tokenize(name))
+        self.price = extract_price(name)
+
+class CatalogIndex:
+    """evaluate.php options parsed once, with a token -> option posting list index.
+
+    Matching keeps the old rule (every space separated keyword is a substring of the
+    option), but only options on the intersected posting lists are checked.
+    """
+
+    def __init__(self, options):
+        # options: option texts, or (category, text) pairs from parse_catalog_stream
+        self.items = [
+            CatalogItem(opt[1], opt[0]) if isinstance(opt, tuple) else CatalogItem(opt)
+            for opt in options
+        ]
+        self.postings = {}
+        for i, item in enumerate(self.items):
+            for token in item.tokens:
+                self.postings.setdefault(token, []).append(i)
+
+        # All index tokens in one string, so "which tokens contain X" is a C-level search
+        self._vocab = list(self.postings)
+        self._vocab_text = "\n".join(self._vocab)
+        self._vocab_starts = []
+        pos = 0
+        for token in self._vocab:
+            self._vocab_starts.append(pos)
+            pos += len(token) + 1
+        self._expanded = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def _posting(self, token):
+        """Ids of options that have a token containing `token` (e.g. 64g -> 64gb)."""
+        ids = self._expanded.get(token)
+        if ids is None:
+            ids = set()
+            seen = set()
+            start = self._vocab_text.find(token)
+            while start != -1:
+                slot = bisect_right(self._vocab_starts, start) - 1
+                if slot not in seen:
+                    seen.add(slot)
+                    ids.update(self.postings[self._vocab[slot]])
+                start = self._vocab_text.find(token, start + 1)
+            self._expanded[token] = ids
+        return ids
+
+    def match(self, model_keyword):
+        """Returns items containing every keyword of `model_keyword`, in catalog order."""
+        keywords = model_keyword.lower().split()
+        query_tokens = set()
+        for k in keywords:
+            query_tokens.update(tokenize(k))
+
+        if query_tokens:
+            postings = sorted((self._posting(t) for t in query_tokens), key=len)
+            ids = set(postings[0])
+            for posting in postings[1:]:
+                if not ids:
+                    break
+                ids &= posting
+            ids = sorted(ids)
+        else:
+            ids = range(len(self.items))
+
+        return [self.items[i] for i in ids if all(k in self.items[i].lower for k in keywords)]
+
+    def snapshot_rows(self):
+        """(category, name, price) for every priced option, as stored by catalog_snapshots."""
+        return [(item.category, extract_name(item.name), item.price) for item in self.items if item.price > 0]
+
+def select_target(target, candidates):
+    """Picks one candidate for a build part ({"name", "model"}), or None."""
+    if not candidates:
+        return None
+    if target["name"] == "Case":
+        # For cases, prefer higher price to avoid accessories (fans, kits)
+        return max(candidates, key=lambda item: item.price)
+    # Default: pick shortest match (most precise)
+    return min(candidates, key=lambda item: len(item.name))
+
+def catalog_hash(entries):
+    """sha256 of the whitespace-normalized (category, option text) list, in page order."""
+    digest = hashlib.sha256()
+    for entry in entries:
+        category, text = entry if isinstance(entry, tuple) else ("", entry)
+        digest.update(f"{category}\t{' '.join(text.split())}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def matched_hash(results):
+    """sha256 of just the options picked for each build part (see build_pricing.price_builds)."""
+    picked = [[r["key"], sorted((part, price, name) for part, (price, name) in r["prices"].items())] for r in results]
+    return hashlib.sha256(json.dumps(picked, ensure_ascii=False).encode("utf-8")).hexdigest()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+# Base URL of every external service the jobs talk to.
+#
+# Each one can be overridden on its own (LINE_API_BASE=http://127.0.0.1:8765) or
+# all at once with MOCK_BASE_URL, which is how tools/mock_services.py points the
+# jobs at its local stand-ins. Read once at import time.
+
+MOCK_BASE_URL = os.environ.get("MOCK_BASE_URL", "").rstrip("/")
+
+GOOGLE_SHEETS_BASE = "https://sheets.googleapis.com"
+GOOGLE_DRIVE_BASE = "https://www.googleapis.com"
+
+def _base(env_name, default):
+    return (os.environ.get(env_name) or MOCK_BASE_URL or default).rstrip("/")
+
+LINE_API_BASE = _base("LINE_API_BASE", "https://api.line.me")
+IMGBB_API_BASE = _base("IMGBB_API_BASE", "https://api.imgbb.com")
+SHEETS_API_BASE = _base("SHEETS_API_BASE", GOOGLE_SHEETS_BASE)
+DRIVE_API_BASE = _base("DRIVE_API_BASE", GOOGLE_DRIVE_BASE)
+COOLPC_BASE = _base("COOLPC_BASE", "https://www.coolpc.com.tw")
+GOOGLE_NEWS_BASE = _base("GOOGLE_NEWS_BASE", "https://news.google.com")
+EPIC_API_BASE = _base("EPIC_API_BASE", "https://store-site-backend-static-ipv4.ak.epicgames.com")
+STEAM_API_BASE = _base("STEAM_API_BASE", "https://store.steampowered.com")
+OPEN_METEO_BASE = _base("OPEN_METEO_BASE", "https://api.open-meteo.com")
+
+LINE_PUSH_URL = LINE_API_BASE + "/v2/bot/message/push"
+IMGBB_UPLOAD_URL = IMGBB_API_BASE + "/1/upload"
+COOLPC_EVALUATE_URL = COOLPC_BASE + "/evaluate.php"
+GOOGLE_NEWS_RSS_URL = GOOGLE_NEWS_BASE + "/rss/search"
+EPIC_FREE_GAMES_URL = EPIC_API_BASE + "/freeGamesPromotions"
+STEAM_FEATURED_URL = STEAM_API_BASE + "/api/featuredcategories"
+OPEN_METEO_FORECAST_URL = OPEN_METEO_BASE + "/v1/forecast"
+
+def sheets_mocked():
+    return SHEETS_API_BASE != GOOGLE_SHEETS_BASE
+
+def _redirect_gspread_urls():
+    """gspread keeps its endpoints as module constants (and copies them into the
+    modules that import them), so every loaded gspread module is rewritten."""
+    targets = [(GOOGLE_SHEETS_BASE, SHEETS_API_BASE), (GOOGLE_DRIVE_BASE, DRIVE_API_BASE)]
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "gspread" or name.startswith("gspread.")):
+            continue
+        for attr, value in list(vars(module).items()):
+            if not isinstance(value, str):
+                continue
+            for default, base in targets:
+                if value.startswith(default) and base != default:
+                    setattr(module, attr, base + value[len(default):])
+
+def mock_sheets_client(http_client=None):
+    """gspread client for the stand-in Sheets API at SHEETS_API_BASE (no
+    credentials needed), or None when the real Google API is configured."""
+    if not sheets_mocked():
+        return None
+    import gspread
+    from google.auth.credentials import AnonymousCredentials
+
+    _redirect_gspread_urls()
+    if http_client is None:
+        return gspread.Client(AnonymousCredentials())
+    return gspread.Client(AnonymousCredentials(), http_client=http_client)
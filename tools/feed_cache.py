@@ -0,0 +1,84 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+# Conditional-GET cache for RSS feeds.
+#
+#   data/news_feeds/
+#       feeds.json          {url: {"etag": ..., "last_modified": ..., "file": "<sha1>.xml", "fetched": ...}}
+#       <sha1>.xml          last feed body received for the url
+#
+# Requests carry If-None-Match / If-Modified-Since from the last 200, so an
+# unchanged feed comes back as a 304 with no body and the stored body is parsed
+# instead. Safe to share between threads; call save() once after the fetches.
+
+FEED_CACHE_DIR = os.environ.get(
+    "NEWS_FEED_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "news_feeds")
+)
+
+class FeedCache:
+    def __init__(self, directory=FEED_CACHE_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "feeds.json")
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".xml")
+
+    def headers(self, url):
+        """Conditional request headers for `url` (empty when nothing is stored)."""
+        with self.lock:
+            entry = self.entries.get(url)
+        if not entry or not os.path.exists(self._path(url)):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body(self, url):
+        try:
+            with open(self._path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url, response):
+        """Keeps the body and validators of a 200 response."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp, path)
+        with self.lock:
+            self.entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "file": os.path.basename(path),
+                "fetched": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self.lock:
+            tmp = self.manifest_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.manifest_path)
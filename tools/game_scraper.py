@@ -1,17 +1,23 @@
 
-import requests
+import sys
+import startup_budget
+startup_budget.install()
+
+import http_client
+import endpoints
 import json
 import os
 from datetime import datetime
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 
 def fetch_epic_free_games():
     """Fetches current free games from Epic Games Store."""
-    url = "https://store-site-backend-static-ipv4.ak.epicgames.com/freeGamesPromotions"
+    url = endpoints.EPIC_FREE_GAMES_URL
     params = {"locale": "zh-Hant", "country": "TW", "allowCountries": "TW"}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -73,11 +79,11 @@ def fetch_epic_free_games():
 
 def fetch_steam_specials():
     """Fetches top specials from Steam."""
-    url = "https://store.steampowered.com/api/featuredcategories"
+    url = endpoints.STEAM_FEATURED_URL
     params = {"cc": "TW", "l": "tchinese"}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -111,7 +117,7 @@ class LineBotNotifier:
     def __init__(self, access_token, user_id):
         self.access_token = access_token
         self.user_id = user_id
-        self.api_url = "https://api.line.me/v2/bot/message/push"
+        self.api_url = endpoints.LINE_PUSH_URL
 
     def send_game_deals(self, games):
         if not self.access_token or not self.user_id:
@@ -257,7 +263,7 @@ class LineBotNotifier:
         }
 
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = http_client.post(self.api_url, headers=headers, data=json.dumps(payload))
             if response.status_code == 200:
                 print("Game deals sent successfully!")
             else:
@@ -265,13 +271,16 @@ class LineBotNotifier:
         except Exception as e:
             print(f"Error sending game deals: {e}")
 
-def main():
-    print("Fetching Epic Games...")
-    epic_games = fetch_epic_free_games()
+def main(max_workers=2):
+    # Epic and Steam are independent, fetch them at the same time
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        print("Fetching Epic Games...")
+        epic_future = pool.submit(fetch_epic_free_games)
+        print("Fetching Steam Specials...")
+        steam_future = pool.submit(fetch_steam_specials)
+        epic_games = epic_future.result()
+        steam_games = steam_future.result()
     print(f"Found {len(epic_games)} Epic free games.")
-    
-    print("Fetching Steam Specials...")
-    steam_games = fetch_steam_specials()
     print(f"Found {len(steam_games)} Steam specials.")
     
     all_games = epic_games + steam_games
@@ -295,4 +304,6 @@ def main():
         print("LINE credentials not found. Skipping notification.")
 
 if __name__ == "__main__":
+    if startup_budget.requested():
+        sys.exit(startup_budget.report())
     main()
@@ -0,0 +1,71 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One pooled HTTP client for every scraper and notifier.
+#
+# - keep-alive connection pool per host (no new TLS handshake per call)
+# - default (connect, read) timeout on every request
+# - bounded exponential back-off retries on connection errors, and on 429/5xx
+#   for idempotent methods only (a retried LINE push could be delivered twice)
+
+DEFAULT_TIMEOUT = (
+    float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.environ.get("HTTP_READ_TIMEOUT", "30")),
+)
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_HOSTS = 16
+POOL_SIZE_PER_HOST = 10
+
+_lock = threading.Lock()
+_session = None
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies DEFAULT_TIMEOUT when the caller gives none."""
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().request(method, url, **kwargs)
+
+def _build_session():
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE_PER_HOST, max_retries=retry)
+    session = TimeoutSession()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session():
+    """The process-wide pooled session (shared by all jobs in job_runner)."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+def request(method, url, **kwargs):
+    """requests-style call through the shared session. Returns a requests.Response."""
+    return get_session().request(method, url, **kwargs)
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Runs the daily jobs in one Python process.
+#
+#   python tools/job_runner.py                 # all jobs
+#   python tools/job_runner.py weather news    # selected jobs
+#
+# Modules are imported once and every job runs in its own thread, so the batch
+# takes about as long as the slowest job instead of the sum of all of them.
+# Jobs that accept `max_workers` get their own cap for their I/O stages.
+# Sheets writes of all jobs are queued and sent together once every job is
+# done (see sheet_batch.py).
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "tools"))
+
+import startup_budget
+startup_budget.install()
+import sheet_batch
+
+# name -> module, per-job concurrency cap for jobs whose main() takes max_workers
+JOBS = [
+    {"name": "weather", "module": "weather_scraper", "max_workers": 3},
+    {"name": "pc_price", "module": "main", "max_workers": None},
+    {"name": "news", "module": "news_scraper", "max_workers": 4},
+    {"name": "games", "module": "game_scraper", "max_workers": 2},
+    {"name": "metal", "module": "metal_scraper", "max_workers": None},
+]
+MAX_PARALLEL_JOBS = int(os.environ.get("MAX_PARALLEL_JOBS", "5"))
+
+class _JobStdout:
+    """Prefixes every printed line with the name of the job thread that printed it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        name = getattr(self.local, "job", None)
+        if name is None:
+            return self.stream.write(text)
+        with self.lock:
+            # Buffer per thread so lines from different jobs do not interleave mid-line
+            pending = getattr(self.local, "pending", "") + text
+            *lines, self.local.pending = pending.split("\n")
+            for line in lines:
+                self.stream.write(f"[{name}] {line}\n")
+        return len(text)
+
+    def flush(self):
+        name = getattr(self.local, "job", None)
+        pending = getattr(self.local, "pending", "")
+        if name is not None and pending:
+            with self.lock:
+                self.stream.write(f"[{name}] {pending}\n")
+                self.local.pending = ""
+        self.stream.flush()
+
+    def __getattr__(self, attr):
+        return getattr(self.stream, attr)
+
+def load_jobs(names=None):
+    """Imports the job modules once. Returns [(job, module)]."""
+    import importlib
+
+    selected = [job for job in JOBS if not names or job["name"] in names]
+    unknown = set(names or []) - {job["name"] for job in JOBS}
+    if unknown:
+        raise SystemExit(f"Unknown jobs: {', '.join(sorted(unknown))}")
+    return [(job, importlib.import_module(job["module"])) for job in selected]
+
+def run_job(job, module, stdout):
+    import inspect
+
+    stdout.local.job = job["name"]
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        kwargs = {}
+        if job["max_workers"] and "max_workers" in inspect.signature(module.main).parameters:
+            kwargs["max_workers"] = job["max_workers"]
+        module.main(**kwargs)
+    except BaseException as e:
+        status = f"failed: {e!r}"
+        stdout.flush()
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        stdout.flush()
+        stdout.local.job = None
+    return job["name"], time.perf_counter() - start, status
+
+def run_jobs(names=None, max_parallel=MAX_PARALLEL_JOBS):
+    os.chdir(ROOT_DIR)
+    jobs = load_jobs(names)
+
+    stdout = _JobStdout(sys.stdout)
+    sys.stdout = stdout
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="job") as pool:
+            with sheet_batch.held():
+                futures = [pool.submit(run_job, job, module, stdout) for job, module in jobs]
+                results = [f.result() for f in futures]
+    finally:
+        sys.stdout = stdout.stream
+
+    flush_start = time.perf_counter()
+    try:
+        flushed = sheet_batch.flush_all()
+        sheets_status = "ok" if flushed["writes"] else "nothing to write"
+    except Exception as e:
+        flushed = None
+        sheets_status = f"failed: {e!r}"
+        traceback.print_exc(file=sys.stdout)
+    results.append(("sheets", time.perf_counter() - flush_start, sheets_status))
+    total = time.perf_counter() - start
+
+    print("=" * 50)
+    print(f"{'job':<12}{'wall s':>10}  status")
+    for name, seconds, status in results:
+        print(f"{name:<12}{seconds:>10.2f}  {status}")
+    print("-" * 50)
+    print(f"{'total':<12}{total:>10.2f}  (sum of jobs {sum(r[1] for r in results):.2f}s)")
+    if flushed and flushed["writes"]:
+        import sheets_client
+        print(f"sheets: {sheet_batch.report(flushed)}")
+        # One per spreadsheet when every job shares the cached metadata
+        print(f"sheets: {sheets_client.metadata_fetches()} spreadsheet metadata fetches")
+    return 0 if all(r[2] in ("ok", "nothing to write") for r in results) else 1
+
+if __name__ == "__main__":
+    names = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if startup_budget.requested():
+        modules = load_jobs(names)
+        sys.exit(startup_budget.report(sorted({m for _, mod in modules for m in getattr(mod, "HEAVY_MODULES", [])})))
+    sys.exit(run_jobs(names))
@@ -0,0 +1,191 @@
+import os
+import json
+import threading
+from datetime import date, timedelta
+
+# Per-ticker daily bar cache for yfinance.
+#
+#   data/market_cache/
+#       manifest.json          {"GC=F": {"first": "2024-01-02", "last": "2026-10-16", "checked": "2026-10-17"}}
+#       GC=F.parquet           Open/High/Low/Close/Volume by date (GC=F.npz without pyarrow)
+#
+# fetch_history() only downloads the dates a ticker is missing (before the first
+# cached bar, and from the last cached bar on, which is re-fetched because the
+# latest close can still move), batching tickers that miss the same range into
+# one yf.download call. It returns the frame yf.download would: columns
+# (field, ticker), so data["Close"]["GC=F"] keeps working.
+
+CACHE_DIR = os.environ.get(
+    "MARKET_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "market_cache")
+)
+
+_lock = threading.Lock()
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        try:
+            import fastparquet  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+def _file_stem(ticker):
+    # "^TWII" / "TWD=X" are fine on every filesystem except for the odd character
+    return "".join(ch if ch.isalnum() or ch in "=.-_^" else "_" for ch in ticker)
+
+class MarketCache:
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.use_parquet = _parquet_available()
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def _path(self, ticker, parquet):
+        return os.path.join(self.directory, _file_stem(ticker) + (".parquet" if parquet else ".npz"))
+
+    def load(self, ticker):
+        """Cached bars of one ticker (DataFrame indexed by date) or None."""
+        import pandas as pd
+        import numpy as np
+
+        parquet_path = self._path(ticker, True)
+        if self.use_parquet and os.path.exists(parquet_path):
+            return pd.read_parquet(parquet_path)
+        npz_path = self._path(ticker, False)
+        if not os.path.exists(npz_path):
+            return None
+        with np.load(npz_path, allow_pickle=False) as npz:
+            frame = pd.DataFrame(npz["values"], columns=[str(c) for c in npz["columns"]],
+                                 index=pd.to_datetime(npz["dates"], unit="D"))
+        frame.index.name = "Date"
+        return frame
+
+    def save(self, ticker, frame):
+        import numpy as np
+
+        os.makedirs(self.directory, exist_ok=True)
+        if self.use_parquet:
+            frame.to_parquet(self._path(ticker, True))
+        else:
+            days = frame.index.values.astype("datetime64[D]").astype("int64")
+            with open(self._path(ticker, False), "wb") as f:
+                np.savez_compressed(f, dates=days, columns=np.array(frame.columns, dtype=str),
+                                    values=frame.to_numpy(dtype="float64"))
+        entry = self.manifest.setdefault(ticker, {})
+        if len(frame):
+            entry["first"] = frame.index[0].strftime("%Y-%m-%d")
+            entry["last"] = frame.index[-1].strftime("%Y-%m-%d")
+
+    def mark_checked(self, ticker, day):
+        self.manifest.setdefault(ticker, {})["checked"] = day.isoformat()
+
+    def write_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def missing_ranges(self, ticker, start, today):
+        """[(start, end_exclusive)] still to download for `ticker` from `start` to today."""
+        entry = self.manifest.get(ticker, {})
+        if "first" not in entry:
+            return [] if entry.get("checked") == today.isoformat() else [(start, today + timedelta(days=1))]
+        first = date.fromisoformat(entry["first"])
+        last = date.fromisoformat(entry["last"])
+        ranges = []
+        if start < first and entry.get("from", entry["first"]) > start.isoformat():
+            ranges.append((start, first))
+        if entry.get("checked") != today.isoformat():
+            ranges.append((last, today + timedelta(days=1)))
+        return ranges
+
+def _split_by_ticker(frame, tickers):
+    """yf.download result -> {ticker: frame with one column per price field}."""
+    import pandas as pd
+
+    if frame is None or frame.empty:
+        return {}
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return {tickers[0]: frame}
+    # yfinance puts the field first (Price, Ticker); older versions can group by ticker
+    level = 1 if set(tickers) & set(frame.columns.get_level_values(1)) else 0
+    result = {}
+    for ticker in tickers:
+        if ticker in frame.columns.get_level_values(level):
+            result[ticker] = frame.xs(ticker, axis=1, level=level)
+    return result
+
+def _merge(cached, fresh):
+    import pandas as pd
+
+    fresh = fresh.dropna(how="all")
+    if fresh.index.tz is not None:
+        fresh = fresh.tz_localize(None)
+    fresh.index = fresh.index.normalize()
+    if cached is None or cached.empty:
+        merged = fresh
+    else:
+        merged = pd.concat([cached, fresh])
+        merged = merged[~merged.index.duplicated(keep="last")]
+    merged = merged.sort_index()
+    merged.index.name = "Date"
+    return merged
+
+def fetch_history(tickers, start, cache=None, today=None):
+    """Daily bars of `tickers` from `start` (date or "YYYY-MM-DD") to today, downloading
+    only what the cache is missing. Returns a yf.download-shaped DataFrame."""
+    import pandas as pd
+    import yfinance as yf
+
+    if isinstance(start, str):
+        start = date.fromisoformat(start)
+    today = today or date.today()
+    tickers = list(dict.fromkeys(tickers))
+
+    with _lock:
+        cache = cache or MarketCache()
+        # Group tickers by the range they miss, one download per distinct range
+        wanted = {}
+        for ticker in tickers:
+            for missing in cache.missing_ranges(ticker, start, today):
+                wanted.setdefault(missing, []).append(ticker)
+
+        frames = {ticker: cache.load(ticker) for ticker in tickers}
+        for (range_start, range_end), group in sorted(wanted.items()):
+            print(f"Downloading {', '.join(group)} {range_start} .. {range_end - timedelta(days=1)}")
+            fresh = yf.download(group, start=range_start.isoformat(), end=range_end.isoformat())
+            pieces = _split_by_ticker(fresh, group)
+            for ticker in group:
+                piece = pieces.get(ticker)
+                if piece is None or piece.dropna(how="all").empty:
+                    # Failed or empty download: leave the range uncovered so the next run asks again
+                    print(f"Warning: no bars for {ticker} {range_start} .. {range_end - timedelta(days=1)}")
+                    continue
+                frames[ticker] = _merge(frames[ticker], piece)
+                cache.save(ticker, frames[ticker])
+                # Earliest date asked for, so a ticker listed after `start` is not re-asked every run
+                entry = cache.manifest.setdefault(ticker, {})
+                entry["from"] = min(entry.get("from", range_start.isoformat()), range_start.isoformat())
+                if range_end > today:
+                    cache.mark_checked(ticker, today)
+        if wanted:
+            cache.write_manifest()
+
+    parts = {t: f.loc[f.index >= pd.Timestamp(start)] for t, f in frames.items() if f is not None and not f.empty}
+    if not parts:
+        return pd.DataFrame()
+    combined = pd.concat(parts, axis=1)
+    combined = combined.swaplevel(0, 1, axis=1)
+    # Tickers without any bars get all-NaN columns, as yf.download gives them
+    fields = sorted(set(combined.columns.get_level_values(0)))
+    combined = combined.reindex(columns=pd.MultiIndex.from_product([fields, sorted(tickers)]))
+    combined.columns.names = ["Price", "Ticker"]
+    return combined
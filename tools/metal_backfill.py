@@ -1,11 +1,8 @@
 
-import gspread
-import yfinance as yf
-import pandas as pd
+import sheets_client
 from datetime import datetime, timedelta
-import os
 from dotenv import load_dotenv
-import json
+from sheet_sync import sync_rows
 
 # Rebar Data Construction (Based on Research)
 # Feb 9: 16900
@@ -26,23 +23,16 @@ REBAR_HISTORY = [
 
 def get_google_sheet():
     load_dotenv()
-    json_str = os.environ.get("GSPREAD_JSON")
-    sheet_url = os.environ.get("GOOGLE_SHEET_URL")
-    
-    if not json_str or not sheet_url:
-        print("Missing secrets")
-        return None
-
     try:
-        creds_dict = json.loads(json_str)
-        gc = gspread.service_account_from_dict(creds_dict)
-        sheet = gc.open_by_url(sheet_url)
-        return sheet
+        return sheets_client.open_spreadsheet()
     except Exception as e:
         print(f"Error connecting to GSheet: {e}")
         return None
 
 def backfill():
+    import pandas as pd
+    import yfinance as yf
+
     print("Fetching historical data...")
     
     # 1. Copper (HG=F) and Nickel (Ni=F for Stainless proxy) / TWD=X for conversion if needed?
@@ -105,16 +95,11 @@ def backfill():
     sheet = get_google_sheet()
     if sheet:
         try:
-            try:
-                ws = sheet.worksheet("Metal_Prices")
-            except:
-                ws = sheet.add_worksheet(title="Metal_Prices", rows=1000, cols=10)
+            ws = sheets_client.worksheet(sheet, "Metal_Prices")
             
-            ws.clear()
-            # Prepare data including header
-            data_to_write = [final_df.columns.values.tolist()] + final_df.values.tolist()
-            ws.update(data_to_write)
-            print("Backfill complete.")
+            # Date-keyed sync: only new or changed rows are written
+            result = sync_rows(ws, final_df.columns.values.tolist(), final_df.values.tolist(), prune=True)
+            print(f"Backfill complete ({result}).")
         except Exception as e:
             print(f"Error writing to sheet: {e}")
             import traceback
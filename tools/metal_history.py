@@ -0,0 +1,91 @@
+import math
+
+# Dashboard rows from a yf.download-shaped frame (columns (Price, Ticker)).
+#
+# Every value is computed column-wise on the whole frame, then the rows are
+# serialized in one pass:
+#
+#   close   = Close prices, 0 treated as missing (yfinance fills holidays with 0 for TW tickers)
+#   Copper_TWD_Kg     = CPER * TWD=X (FX_FALLBACK where the FX rate is missing), 2 decimals
+#   Stock_<ticker>    = close[ticker] for each configured stock
+#   Stainless_Index / China_Steel_Price / Feng_Hsin_Price = 2027.TW / 2002.TW / 2015.TW
+#
+# A ticker that is not in the frame gives an all-None column.
+
+BASE_TICKERS = ["CPER", "TWD=X", "GC=F", "SI=F"]
+FX_FALLBACK = 32.5
+
+# Legacy dashboard columns that are a plain copy of a stock's close
+LEGACY_COLUMNS = {
+    "Stainless_Index": "2027.TW",
+    "China_Steel_Price": "2002.TW",
+    "Feng_Hsin_Price": "2015.TW",
+}
+
+def close_prices(df, tickers):
+    """Close prices of `tickers` (one column each, in that order) with 0 masked to NaN."""
+    import pandas as pd
+
+    if df is None or df.empty:
+        return pd.DataFrame(columns=tickers, dtype="float64")
+    close = df["Close"]
+    if isinstance(close, pd.Series):
+        # Single-ticker download without a ticker level
+        close = close.to_frame(tickers[0])
+    close = close.reindex(columns=tickers).astype("float64")
+    return close.where(close != 0)
+
+def history_frame(df, stock_tickers=(), rebar=None, stock_columns=True):
+    """Dashboard columns indexed by date. `rebar` fills Steel_Rebar_TWD_Ton (None = empty)."""
+    import pandas as pd
+
+    stock_tickers = list(stock_tickers)
+    tickers = list(dict.fromkeys(BASE_TICKERS + stock_tickers + list(LEGACY_COLUMNS.values())))
+    close = close_prices(df, tickers)
+
+    twd = close["TWD=X"]
+    out = pd.DataFrame(index=close.index)
+    out["Copper_TWD_Kg"] = (close["CPER"] * twd.fillna(FX_FALLBACK)).round(2)
+    out["Steel_Rebar_TWD_Ton"] = rebar
+    out["Stainless_Index"] = close[LEGACY_COLUMNS["Stainless_Index"]]
+    out["Gold_USD"] = close["GC=F"]
+    out["Silver_USD"] = close["SI=F"]
+    out["Exchange_Rate_TWD"] = twd
+    if stock_columns:
+        for ticker in stock_tickers:
+            out[f"Stock_{ticker}"] = close[ticker]
+    out["China_Steel_Price"] = close[LEGACY_COLUMNS["China_Steel_Price"]]
+    out["Feng_Hsin_Price"] = close[LEGACY_COLUMNS["Feng_Hsin_Price"]]
+    return out
+
+def _plain(value):
+    # NaN -> None, numpy scalars -> Python numbers (json.dump and gspread want those)
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if hasattr(value, "item"):
+        value = value.item()
+        return None if isinstance(value, float) and math.isnan(value) else value
+    return value
+
+def column_values(series):
+    """One column as a Python list, NaN -> None."""
+    # tolist() converts to Python scalars in C; only columns with gaps need a second pass
+    values = series.tolist()
+    return [_plain(v) for v in values] if series.hasnans else values
+
+def to_records(frame):
+    """[{"Date": "YYYY-MM-DD", column: value}] with None for missing values."""
+    keys = ["Date"] + [str(c) for c in frame.columns]
+    dates = frame.index.strftime("%Y-%m-%d").tolist()
+    columns = [column_values(frame[c]) for c in frame.columns]
+    return [dict(zip(keys, row)) for row in zip(dates, *columns)]
+
+def build_history(df, stock_tickers=(), rebar=None, stock_columns=True, require=None):
+    """Row dicts for MetalStore.replace_all. Rows where every column in `require` is
+    missing are dropped (e.g. weekends that only have an FX quote)."""
+    frame = history_frame(df, stock_tickers, rebar=rebar, stock_columns=stock_columns)
+    if require:
+        frame = frame.dropna(subset=list(require), how="all")
+    return to_records(frame)
@@ -1,39 +1,35 @@
 
 import os
-import requests
+import sys
+import startup_budget
+startup_budget.install()
+
+import http_client
+import endpoints
+import sheets_client
+import sheet_batch
+import tracing
+import market_cache
+from metal_store import MetalStore
 import json
-import gspread
-import yfinance as yf
-import pandas as pd
-from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from datetime import datetime, date, timedelta
 from dotenv import load_dotenv
 
+# gspread, yfinance, pandas and matplotlib are imported where they are used
+HEAVY_MODULES = ["gspread", "yfinance", "pandas", "matplotlib.figure"]
+
 def get_google_sheet():
     load_dotenv()
-    json_str = os.environ.get("GSPREAD_JSON")
     sheet_url = os.environ.get("GOOGLE_SHEET_URL")
-    
-    if not json_str or not sheet_url:
+
+    # Local stand-in Sheets API (SHEETS_API_BASE / MOCK_BASE_URL) needs no credentials
+    if not sheet_url or not (os.environ.get("GSPREAD_JSON") or endpoints.sheets_mocked()):
         print("Missing secrets")
         return None
 
     try:
-        if not json_str.strip():
-             print("GSPREAD_JSON is empty.")
-             return None
-        
-        # Check if it's a file path
-        if os.path.exists(json_str):
-            with open(json_str, "r", encoding="utf-8") as f:
-                creds_dict = json.load(f)
-        else:
-            creds_dict = json.loads(json_str)
-            
-        gc = gspread.service_account_from_dict(creds_dict)
-        sheet = gc.open_by_url(sheet_url)
-        return sheet
+        # Shared with main.py when both run under job_runner
+        return sheets_client.open_spreadsheet(sheet_url)
     except Exception as e:
         print(f"Error connecting to GSheet: {e}")
         return None
@@ -54,8 +50,9 @@ def fetch_market_data():
     base_tickers = ["CPER", "TWD=X", "GC=F", "SI=F"]
     
     tickers = base_tickers + stock_tickers
-    # Fetch 5 days to ensure we get a valid close price even on weekends
-    data = yf.download(tickers, period="5d")
+    # Last week, to ensure we get a valid close price even on weekends. Only the
+    # bars not yet in data/market_cache are downloaded.
+    data = market_cache.fetch_history(tickers, start=date.today() - timedelta(days=7))
     
     try:
         if data.empty:
@@ -74,19 +71,25 @@ def fetch_market_data():
             except:
                 return None
             
-        hg = get_last_valid(data["Close"]["CPER"])
-        twd = get_last_valid(data["Close"]["TWD=X"])
-        gold = get_last_valid(data["Close"]["GC=F"])
-        silver = get_last_valid(data["Close"]["SI=F"])
+        # A ticker with no bars at all (delisted, wrong code) has no usable close
+        def last_close(ticker):
+            if ticker not in data["Close"].columns:
+                return None
+            return get_last_valid(data["Close"][ticker])
+
+        hg = last_close("CPER")
+        twd = last_close("TWD=X")
+        gold = last_close("GC=F")
+        silver = last_close("SI=F")
         
         # Dynamic Stocks
         stock_prices = {}
         for ticker in stock_tickers:
-            stock_prices[ticker] = get_last_valid(data["Close"][ticker])
+            stock_prices[ticker] = last_close(ticker)
 
-        if twd == 0: twd = 32.5 # Fallback
+        if not twd: twd = 32.5 # Fallback
         
-        copper_twd = hg * twd
+        copper_twd = hg * twd if hg is not None else None
         
         result = {
             "copper": round(copper_twd, 2) if copper_twd else None,
@@ -108,57 +111,53 @@ def fetch_market_data():
         print(f"Error parsing yfinance: {e}")
         return None
 
-def update_sheet_and_get_history(market_data):
+METAL_SHEET_HEADERS = ["Date", "Copper_TWD_Kg", "Steel_Rebar_TWD_Ton", "Stainless_Index", "China_Steel_Price", "Feng_Hsin_Price", "Gold_USD", "Silver_USD", "Exchange_Rate_TWD"]
+
+def update_sheet(market_data):
+    """Upserts today's row of Metal_Prices (date-keyed, only the changed cells are sent).
+    The write is queued on the run's Sheets batch. Returns the SyncResult."""
+    from sheet_sync import SheetSync
+
     sheet = get_google_sheet()
     if not sheet: return None
     
-    try:
-        ws = sheet.worksheet("Metal_Prices")
-        headers = ws.row_values(1)
-        expected_headers = ["Date", "Copper_TWD_Kg", "Steel_Rebar_TWD_Ton", "Stainless_Index", "China_Steel_Price", "Feng_Hsin_Price", "Gold_USD", "Silver_USD", "Exchange_Rate_TWD"]
-        if  len(headers) < 9:
-             ws.update('A1:I1', [expected_headers])
-             print("Updated Sheet Headers.")
-    except:
-        print("Worksheet not found, creating new one...")
-        ws = sheet.add_worksheet("Metal_Prices", 1000, 10)
-        ws.append_row(["Date", "Copper_TWD_Kg", "Steel_Rebar_TWD_Ton", "Stainless_Index", "China_Steel_Price", "Feng_Hsin_Price", "Gold_USD", "Silver_USD", "Exchange_Rate_TWD"])
-        
-    all_values = ws.get_all_values()
-    last_row = all_values[-1] if len(all_values) > 1 else None
-    
+    ws = sheets_client.worksheet(sheet, "Metal_Prices")
+
+    # Reads the Date column and header only, then the last row for the rebar price
+    sync = SheetSync(ws, METAL_SHEET_HEADERS).load()
+    today = datetime.now().strftime("%Y-%m-%d")
+    last_date = sync.last_date()
+    stored = sync.fetch([d for d in (last_date, today) if d])
+
+    # Rebar is maintained by hand in the sheet: carry the latest value forward
     current_rebar = 16900 
-    if last_row:
+    if last_date:
         try:
-            current_rebar = float(last_row[2])
+            current_rebar = float(stored[last_date][2])
         except:
             pass
             
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    if last_row and last_row[0] == today:
-        print("Today already exists in Sheet, skipping append.")
-    else:
-        new_row = [
-            today,
-            market_data["copper"],
-            current_rebar,         
-            market_data["nickel"], 
-            market_data["china_steel"], 
-            market_data["feng_hsin"],   
-            market_data["gold"],
-            market_data["silver"],
-            market_data["twd"]
-        ]
-        # Replace None with empty string for Sheet
-        final_row = ["" if x is None else x for x in new_row]
-        ws.append_row(final_row)
-        print(f"Appended to Sheet: {final_row}")
-        
-    return ws.get_all_records()
+    new_row = [
+        today,
+        market_data["copper"],
+        current_rebar,         
+        market_data["nickel"], 
+        market_data["china_steel"], 
+        market_data["feng_hsin"],   
+        market_data["gold"],
+        market_data["silver"],
+        market_data["twd"]
+    ]
+    result = sync.apply([new_row], batch=sheet_batch.batch_for(sheet))
+    print(f"Metal_Prices synced: {result}")
+    return result
 
 def plot_trends(data, filename="metal_trend.png"):
     if not data: return None
+
+    import pandas as pd
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
     
     df = pd.DataFrame(data)
     df["Date"] = pd.to_datetime(df["Date"])
@@ -169,56 +168,62 @@ def plot_trends(data, filename="metal_trend.png"):
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce')
             
+    # ASCII minus signs, and the CJK font on Windows, for this chart only: the
+    # rc settings are restored when it is saved
     import platform
+    import matplotlib
+    rc = {"axes.unicode_minus": False}
     if platform.system() == "Windows":
-        plt.rcParams['font.sans-serif'] = ['Microsoft JhengHei']
-        plt.rcParams['axes.unicode_minus'] = False
+        rc["font.family"] = "Microsoft JhengHei"
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10), sharex=True)
+    # A Figure of its own on the Agg canvas, no pyplot global state
+    with matplotlib.rc_context(rc):
+        fig = Figure(figsize=(10, 10))
+        FigureCanvasAgg(fig)
+        ax1, ax2 = fig.subplots(2, 1, sharex=True)
     
-    # Top: Copper
-    ax1.set_title("國際原物料趨勢 (銅 / 鎳指標)", fontsize=14, fontweight="bold")
-    ax1.plot(df["Date"], df["Copper_TWD_Kg"], color="#b87333", label="銅價 (TWD/Kg)", linewidth=2)
-    ax1.set_ylabel("價格指數", fontsize=12)
-    ax1.legend(loc="upper left")
-    ax1.grid(True, linestyle=":", alpha=0.6)
+        # Top: Copper
+        ax1.set_title("國際原物料趨勢 (銅 / 鎳指標)", fontsize=14, fontweight="bold")
+        ax1.plot(df["Date"], df["Copper_TWD_Kg"], color="#b87333", label="銅價 (TWD/Kg)", linewidth=2)
+        ax1.set_ylabel("價格指數", fontsize=12)
+        ax1.legend(loc="upper left")
+        ax1.grid(True, linestyle=":", alpha=0.6)
     
-    # Bottom: Stocks & Rebar
-    ax2.set_title("國內鋼鐵行情", fontsize=14, fontweight="bold")
-    ax2_left = ax2
-    ax2_right = ax2.twinx()
+        # Bottom: Stocks & Rebar
+        ax2.set_title("國內鋼鐵行情", fontsize=14, fontweight="bold")
+        ax2_left = ax2
+        ax2_right = ax2.twinx()
     
-    if "China_Steel_Price" in df.columns:
-        l1 = ax2_left.plot(df["Date"], df["China_Steel_Price"], color="#4682B4", label="中鋼", linewidth=2)
-    else:
-        l1 = []
+        if "China_Steel_Price" in df.columns:
+            l1 = ax2_left.plot(df["Date"], df["China_Steel_Price"], color="#4682B4", label="中鋼", linewidth=2)
+        else:
+            l1 = []
         
-    if "Feng_Hsin_Price" in df.columns:
-        l2 = ax2_left.plot(df["Date"], df["Feng_Hsin_Price"], color="#2E8B57", label="豐興", linewidth=2)
-    else:
-        l2 = []
+        if "Feng_Hsin_Price" in df.columns:
+            l2 = ax2_left.plot(df["Date"], df["Feng_Hsin_Price"], color="#2E8B57", label="豐興", linewidth=2)
+        else:
+            l2 = []
         
-    ax2_left.set_ylabel("股價 (TWD)", fontsize=12)
+        ax2_left.set_ylabel("股價 (TWD)", fontsize=12)
     
-    l3 = ax2_right.plot(df["Date"], df["Steel_Rebar_TWD_Ton"], color="#708090", label="鋼筋", linewidth=2, linestyle="--")
-    ax2_right.set_ylabel("鋼筋盤價", fontsize=12, color="#708090")
+        l3 = ax2_right.plot(df["Date"], df["Steel_Rebar_TWD_Ton"], color="#708090", label="鋼筋", linewidth=2, linestyle="--")
+        ax2_right.set_ylabel("鋼筋盤價", fontsize=12, color="#708090")
     
-    lines = l1 + l2 + l3
-    labels = [l.get_label() for l in lines]
-    ax2_left.legend(lines, labels, loc="upper left")
+        lines = l1 + l2 + l3
+        labels = [l.get_label() for l in lines]
+        ax2_left.legend(lines, labels, loc="upper left")
     
-    ax2.grid(True, linestyle=":", alpha=0.6)
-    ax2.set_xlabel("日期", fontsize=12)
+        ax2.grid(True, linestyle=":", alpha=0.6)
+        ax2.set_xlabel("日期", fontsize=12)
     
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
+        fig.tight_layout()
+        fig.savefig(filename)
     return filename
 
 class ImgBBUploader:
     def __init__(self, api_key):
         self.api_key = api_key
-        self.upload_url = "https://api.imgbb.com/1/upload"
+        self.upload_url = endpoints.IMGBB_UPLOAD_URL
 
     def upload(self, image_path):
         if not self.api_key: return None
@@ -226,7 +231,8 @@ class ImgBBUploader:
             with open(image_path, "rb") as file:
                 payload = {"key": self.api_key}
                 files = {"image": file}
-                response = requests.post(self.upload_url, payload, files=files)
+                response = http_client.post(self.upload_url, data=payload, files=files)
+                tracing.annotate(http_status=response.status_code, bytes=os.path.getsize(image_path))
                 if response.status_code == 200:
                     return response.json()["data"]["url"]
         except Exception as e:
@@ -298,79 +304,79 @@ def send_line_notify(market_data, image_url):
         "Content-Type": "application/json",
         "Authorization": f"Bearer {token}"
     }
-    requests.post("https://api.line.me/v2/bot/message/push", headers=headers, data=json.dumps(payload))
+    response = http_client.post(endpoints.LINE_PUSH_URL, headers=headers, data=json.dumps(payload))
+    tracing.annotate(http_status=response.status_code)
     print("LINE notification sent.")
 
 def main():
-    data = fetch_market_data()
+    with tracing.trace("metal"):
+        try:
+            run()
+        finally:
+            with tracing.span("flush"):
+                sheet_batch.commit()
+
+def run():
+    with tracing.span("fetch") as span:
+        data = fetch_market_data()
+        span.set("tickers", len(data["stocks"]) if data else 0)
     if not data: return
     
     # Update GSheet (Only basic columns)
-    update_sheet_and_get_history(data)
-    
-    # Update JSON (Dynamic)
-    json_path = "docs/metal_data.json"
-    existing_data = []
-    if os.path.exists(json_path):
-        with open(json_path, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-            
-    today_str = datetime.now().strftime("%Y-%m-%d")
+    with tracing.span("sheet") as span:
+        result = update_sheet(data)
+        if result:
+            span.set("api_calls", result.calls)
+            span.set("cells", result.cells)
     
-    record = {
-        "Date": today_str,
-        "Copper_TWD_Kg": data["copper"],
-        "Steel_Rebar_TWD_Ton": data["rebar_ref"],
-        "Stainless_Index": data["nickel"],
-        "China_Steel_Price": data["china_steel"],
-        "Feng_Hsin_Price": data["feng_hsin"],
-        "Gold_USD": data["gold"],
-        "Silver_USD": data["silver"],
-        "Exchange_Rate_TWD": data["twd"]
-    }
-    # Dynamic Stocks
-    for code, price in data["stocks"].items():
-        record[f"Stock_{code}"] = price
-        
-    updated = False
-    for i, row in enumerate(existing_data):
-        if row["Date"] == today_str:
-            existing_data[i] = record
-            updated = True
-            break
-    if not updated:
-        existing_data.append(record)
+    # Update dashboard data (only this year's shard of docs/metal_data/ is rewritten)
+    with tracing.span("export") as span:
+        today_str = datetime.now().strftime("%Y-%m-%d")
         
-    # Export JSON
-    # Ensure docs dir exists
-    if not os.path.exists("docs"):
-        os.makedirs("docs")
+        record = {
+            "Date": today_str,
+            "Copper_TWD_Kg": data["copper"],
+            "Steel_Rebar_TWD_Ton": data["rebar_ref"],
+            "Stainless_Index": data["nickel"],
+            "China_Steel_Price": data["china_steel"],
+            "Feng_Hsin_Price": data["feng_hsin"],
+            "Gold_USD": data["gold"],
+            "Silver_USD": data["silver"],
+            "Exchange_Rate_TWD": data["twd"]
+        }
+        # Dynamic Stocks
+        for code, price in data["stocks"].items():
+            record[f"Stock_{code}"] = price
+
+        store = MetalStore()
+        written = store.upsert(record)
+        print(f"Dashboard data exported to {os.path.relpath(store.directory)}/{today_str[:4]}.json")
+        span.set("bytes", written)
+        span.set("lod_points", {level: lod["points"] for level, lod in store.manifest.get("lod", {}).items()})
         
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=2)
-    print("Dashboard data exported to docs/metal_data.json")
-    
-    # Export Config
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "stocks.json")
-    if os.path.exists(config_path):
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-        with open("docs/metal_config.json", "w", encoding="utf-8") as f:
-            json.dump(cfg, f, ensure_ascii=False, indent=2)
+        # Export Config
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "stocks.json")
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+            with open("docs/metal_config.json", "w", encoding="utf-8") as f:
+                json.dump(cfg, f, ensure_ascii=False, indent=2)
 
     # Plot & Notify
-    # Note: plot_trends reads from DataFrame made of `existing_data` if we passed it,
-    # but currently we aren't passing `existing_data` to plot_trends in this clean version?
-    # Ah, I missed passing it.
-    
-    plot_file = plot_trends(existing_data)
+    history = store.records()
+    with tracing.span("plot", rows=len(history)):
+        plot_file = plot_trends(history)
     
     load_dotenv()
-    imgbb = ImgBBUploader(os.environ.get("IMGBB_API_KEY"))
-    url = imgbb.upload(plot_file)
+    with tracing.span("upload"):
+        imgbb = ImgBBUploader(os.environ.get("IMGBB_API_KEY"))
+        url = imgbb.upload(plot_file)
     print(f"Chart uploaded: {url}")
     
-    send_line_notify(data, url)
+    with tracing.span("notify"):
+        send_line_notify(data, url)
 
 if __name__ == "__main__":
+    if startup_budget.requested():
+        sys.exit(startup_budget.report(HEAVY_MODULES))
     main()
@@ -0,0 +1,290 @@
+import os
+import sys
+import json
+import bisect
+from datetime import datetime
+
+# Dashboard data for docs/index.html, one columnar shard per year:
+#
+#   docs/metal_data/manifest.json
+#       {"version": 1, "updated": "...", "last_date": "2026-10-17",
+#        "series": ["Copper_TWD_Kg", ..., "Stock_2002.TW"],
+#        "shards": [{"year": 2024, "file": "2024.json", "first": "2024-01-01", "last": "2024-12-31", "rows": 262}, ...]}
+#   docs/metal_data/2026.json
+#       {"year": 2026, "dates": ["2026-01-02", ...], "series": {"Copper_TWD_Kg": [402.1, ...], ...}}
+#
+# Every series array is aligned with "dates" (null where there is no value).
+# Daily writes only rewrite the shard of the record's year, the manifest and the
+# two level-of-detail files below.
+#
+# Level-of-detail files for the long dashboard ranges, rebuilt on every write:
+#
+#   docs/metal_data/lod/1y.json    min/max of LOD_WEEKS equal buckets (about one per week)
+#                                  over the last year (<= 2 * LOD_WEEKS points per series)
+#   docs/metal_data/lod/all.json   min/max of LOD_BUCKETS equal date buckets over the whole
+#                                  history (<= 2 * LOD_BUCKETS points per series, however long)
+#   Both keep each bucket's low and high, so intra-week spikes stay visible.
+#       {"level": "All", "start": "2024-01-01",
+#        "series": {"Gold_USD": {"days": [1, 5, ...], "values": [2064.4, ...]}, ...}}
+#   ("days" are offsets from "start", values are rounded to 4 decimals)
+#
+# 1M/3M are drawn from the daily shards.
+#
+#   python tools/metal_store.py migrate     # docs/metal_data.json (row dicts) -> shards
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METAL_DATA_DIR = os.environ.get("METAL_DATA_DIR", os.path.join(ROOT_DIR, "docs", "metal_data"))
+LEGACY_PATH = os.path.join(ROOT_DIR, "docs", "metal_data.json")
+FORMAT_VERSION = 1
+LOD_BUCKETS = 200
+LOD_WEEKS = 53
+
+def minmax_decimate(dates, values, buckets=LOD_BUCKETS):
+    """Keeps the lowest and highest point of each of `buckets` equal slices, in date
+    order, so spikes survive while the point count stays bounded."""
+    points = [(d, v) for d, v in zip(dates, values) if v is not None]
+    if len(points) <= 2 * buckets:
+        return [d for d, _ in points], [v for _, v in points]
+    out = []
+    size = len(points) / buckets
+    for b in range(buckets):
+        chunk = points[int(b * size):int((b + 1) * size)]
+        if not chunk:
+            continue
+        low = min(range(len(chunk)), key=lambda i: chunk[i][1])
+        high = max(range(len(chunk)), key=lambda i: chunk[i][1])
+        for i in sorted({low, high}):
+            out.append(chunk[i])
+    return [d for d, _ in out], [v for _, v in out]
+
+def _dump(obj, path):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+class MetalStore:
+    def __init__(self, directory=METAL_DATA_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.manifest = {"version": FORMAT_VERSION, "series": [], "shards": []}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def years(self):
+        return [shard["year"] for shard in self.manifest["shards"]]
+
+    def load_shard(self, year):
+        path = os.path.join(self.directory, f"{year}.json")
+        if not os.path.exists(path):
+            return {"year": year, "dates": [], "series": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_shard(self, shard):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{shard['year']}.json")
+        _dump(shard, path)
+
+        entries = [s for s in self.manifest["shards"] if s["year"] != shard["year"]]
+        if shard["dates"]:
+            entries.append({
+                "year": shard["year"],
+                "file": f"{shard['year']}.json",
+                "first": shard["dates"][0],
+                "last": shard["dates"][-1],
+                "rows": len(shard["dates"]),
+            })
+        else:
+            os.remove(path)
+        self.manifest["shards"] = sorted(entries, key=lambda s: s["year"])
+        for key in shard["series"]:
+            if key not in self.manifest["series"]:
+                self.manifest["series"].append(key)
+        return os.path.getsize(path) if shard["dates"] else 0
+
+    def _columns(self, start=None):
+        """(dates, {series: values}) of every shard from `start` on, concatenated."""
+        dates = []
+        series = {key: [] for key in self.manifest["series"]}
+        for shard_info in self.manifest["shards"]:
+            if start and shard_info["last"] < start:
+                continue
+            shard = self.load_shard(shard_info["year"])
+            first = 0
+            while start and first < len(shard["dates"]) and shard["dates"][first] < start:
+                first += 1
+            dates.extend(shard["dates"][first:])
+            for key, values in series.items():
+                column = shard["series"].get(key)
+                values.extend(column[first:] if column is not None else [None] * (len(shard["dates"]) - first))
+        return dates, series
+
+    def write_lod(self):
+        """Rebuilds the 1Y and All (min/max decimated) files listed in the manifest."""
+        lod_dir = os.path.join(self.directory, "lod")
+        os.makedirs(lod_dir, exist_ok=True)
+        self.manifest["lod"] = {}
+        if not self.manifest["shards"]:
+            return
+
+        last = self.manifest["shards"][-1]["last"]
+        year_ago = f"{int(last[:4]) - 1}{last[4:]}"
+        levels = [
+            ("1Y", "1y.json", year_ago, LOD_WEEKS),
+            ("All", "all.json", None, LOD_BUCKETS),
+        ]
+        for level, name, start, buckets in levels:
+            dates, columns = self._columns(start)
+            if not dates:
+                continue
+            base = datetime.strptime(dates[0], "%Y-%m-%d")
+            series = {}
+            points = 0
+            for key, values in columns.items():
+                lod_dates, lod_values = minmax_decimate(dates, values, buckets)
+                series[key] = {
+                    "days": [(datetime.strptime(d, "%Y-%m-%d") - base).days for d in lod_dates],
+                    "values": [round(v, 4) if isinstance(v, float) else v for v in lod_values],
+                }
+                points = max(points, len(lod_dates))
+            _dump({"level": level, "start": dates[0], "series": series}, os.path.join(lod_dir, name))
+            self.manifest["lod"][level] = {"file": f"lod/{name}", "points": points}
+
+    def _write_manifest(self):
+        self.write_lod()
+        self.manifest["version"] = FORMAT_VERSION
+        self.manifest["updated"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.manifest["last_date"] = self.manifest["shards"][-1]["last"] if self.manifest["shards"] else None
+        os.makedirs(self.directory, exist_ok=True)
+        _dump(self.manifest, self.manifest_path)
+
+    def records(self, start=None, end=None):
+        """Row dicts ({"Date": ..., series: value}) between start and end (inclusive, "YYYY-MM-DD")."""
+        rows = []
+        keys = self.manifest["series"]
+        for shard_info in self.manifest["shards"]:
+            if (start and shard_info["last"] < start) or (end and shard_info["first"] > end):
+                continue
+            shard = self.load_shard(shard_info["year"])
+            series = shard["series"]
+            for i, day in enumerate(shard["dates"]):
+                if (start and day < start) or (end and day > end):
+                    continue
+                row = {"Date": day}
+                for key in keys:
+                    values = series.get(key)
+                    row[key] = values[i] if values is not None else None
+                rows.append(row)
+        return rows
+
+    def upsert(self, record):
+        """Adds or replaces the row of record["Date"]. Only that year's shard is rewritten.
+        Returns the bytes written for the shard."""
+        day = record["Date"]
+        shard = self.load_shard(int(day[:4]))
+        dates, series = shard["dates"], shard["series"]
+
+        for key in record:
+            if key != "Date" and key not in series:
+                series[key] = [None] * len(dates)
+
+        i = bisect.bisect_left(dates, day)
+        if i < len(dates) and dates[i] == day:
+            # Same day again: the new record replaces the old row entirely
+            for key, values in series.items():
+                values[i] = record.get(key)
+        else:
+            dates.insert(i, day)
+            for key, values in series.items():
+                values.insert(i, record.get(key))
+
+        written = self._write_shard(shard)
+        self._write_manifest()
+        return written
+
+    def replace_all(self, records):
+        """Rewrites every shard from row dicts (backfills). Returns the number of rows."""
+        by_year = {}
+        keys = []
+        for record in sorted(records, key=lambda r: r["Date"]):
+            by_year.setdefault(int(record["Date"][:4]), []).append(record)
+            for key in record:
+                if key != "Date" and key not in keys:
+                    keys.append(key)
+
+        for year in set(self.years()) - set(by_year):
+            self._write_shard({"year": year, "dates": [], "series": {}})
+        self.manifest["series"] = list(keys)
+        for year, rows in sorted(by_year.items()):
+            self._write_shard({
+                "year": year,
+                "dates": [r["Date"] for r in rows],
+                "series": {key: [r.get(key) for r in rows] for key in keys},
+            })
+        self._write_manifest()
+        return len(records)
+
+    def merge_series(self, key, values_by_date):
+        """Sets one series from {"YYYY-MM-DD": value} on the dates already stored (new
+        stock added to the watch list). Other series are kept as they are and only
+        shards with a matching date are rewritten. Returns the number of values set."""
+        by_year = {}
+        for day, value in values_by_date.items():
+            by_year.setdefault(int(day[:4]), {})[day] = value
+
+        merged = 0
+        for year in self.years():
+            values = by_year.get(year)
+            if not values:
+                continue
+            shard = self.load_shard(year)
+            column = shard["series"].get(key) or [None] * len(shard["dates"])
+            hits = 0
+            for i, day in enumerate(shard["dates"]):
+                if day in values:
+                    column[i] = values[day]
+                    hits += 1
+            if hits:
+                shard["series"][key] = column
+                self._write_shard(shard)
+                merged += hits
+        if merged:
+            self._write_manifest()
+        return merged
+
+    def drop_series(self, key):
+        """Removes one series from every shard that has it. Returns the shards changed."""
+        changed = 0
+        for year in self.years():
+            shard = self.load_shard(year)
+            if key in shard["series"]:
+                del shard["series"][key]
+                self._write_shard(shard)
+                changed += 1
+        if key in self.manifest["series"]:
+            self.manifest["series"].remove(key)
+            changed = changed or 1
+        if changed:
+            self._write_manifest()
+        return changed
+
+def migrate_legacy(legacy_path=LEGACY_PATH, store=None):
+    """Converts the old docs/metal_data.json (list of row dicts) into shards."""
+    with open(legacy_path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    store = store or MetalStore()
+    store.replace_all(records)
+    return len(records)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        count = migrate_legacy()
+        store = MetalStore()
+        print(f"Migrated {count} rows into {len(store.years())} shards in {store.directory}")
+    else:
+        store = MetalStore()
+        for shard in store.manifest["shards"]:
+            print(f"{shard['year']}: {shard['rows']} rows ({shard['first']} .. {shard['last']})")
+        print(f"series: {', '.join(store.manifest['series'])}")
@@ -0,0 +1,599 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+# Local stand-ins for LINE, ImgBB, Google Sheets and the data feeds, for load
+# testing without touching real quotas.
+#
+#   python tools/mock_services.py serve [--port 8765] [--latency-ms 50] [--jitter-ms 20]
+#                                       [--rate-429 0.05] [--rate-5xx 0.02] [--only line,sheets]
+#                                       [--log logs/mock_requests.jsonl]
+#   MOCK_BASE_URL=http://127.0.0.1:8765 python main.py
+#
+#   python tools/mock_services.py load line --runs 300 --concurrency 30 [fault options]
+#
+# Every request is recorded (service, method, path, status, bytes, ms). Control
+# endpoints: GET /__mock__/stats, GET /__mock__/requests, POST /__mock__/reset,
+# POST /__mock__/config with {"latency_ms": .., "rate_429": .., ...}.
+# The data feeds are answered from bench/fixtures (see bench/record_fixtures.py).
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "tools"))
+FIXTURE_DIR = os.path.join(ROOT_DIR, "bench", "fixtures")
+DEFAULT_PORT = 8765
+
+# path prefix -> service name
+ROUTES = [
+    ("/v2/bot/message/push", "line"),
+    ("/1/upload", "imgbb"),
+    ("/v4/spreadsheets", "sheets"),
+    ("/drive/", "drive"),
+    ("/evaluate.php", "coolpc"),
+    ("/rss/search", "news"),
+    ("/freeGamesPromotions", "epic"),
+    ("/api/featuredcategories", "steam"),
+    ("/v1/forecast", "open_meteo"),
+]
+FEED_FIXTURES = {
+    "coolpc": "coolpc_evaluate.html",
+    "news": "news_rss.xml",
+    "epic": "epic_free_games.json",
+    "steam": "steam_featured.json",
+    "open_meteo": "open_meteo.json",
+}
+
+def _col_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+def _col_letters(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def parse_a1(label, default_sheet):
+    """"'Price_History'!A2:D" -> (sheet, row0, col0, row1, col1), 0-based with None for open ends."""
+    sheet, sep, cells = label.rpartition("!")
+    if not sep:
+        if re.fullmatch(r"[A-Z]*\d*(:[A-Z]*\d*)?", label):
+            sheet, cells = default_sheet, label
+        else:
+            sheet, cells = label, ""
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+
+    bounds = []
+    for part in (cells.split(":") if cells else []):
+        match = re.fullmatch(r"([A-Z]*)(\d*)", part)
+        bounds.append((
+            int(match.group(2)) - 1 if match.group(2) else None,
+            _col_index(match.group(1)) if match.group(1) else None,
+        ))
+    if not bounds:
+        return sheet, None, None, None, None
+    start = bounds[0]
+    end = bounds[1] if len(bounds) > 1 else bounds[0]
+    return sheet, start[0], start[1], end[0], end[1]
+
+class MockSpreadsheets:
+    """In-memory subset of the Sheets v4 API used by gspread in this repo:
+    metadata, addSheet/deleteSheet, row insert/delete, appendCells, values
+    get/update/append/batchGet/batchUpdate/clear. The grid grows as needed."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.books = {}
+
+    def _book(self, spreadsheet_id):
+        if spreadsheet_id not in self.books:
+            self.books[spreadsheet_id] = {"next_id": 1, "sheets": {"Sheet1": {"id": 0, "rows": []}}}
+        return self.books[spreadsheet_id]
+
+    def metadata(self, spreadsheet_id):
+        book = self._book(spreadsheet_id)
+        sheets = []
+        for index, (title, sheet) in enumerate(book["sheets"].items()):
+            sheets.append({"properties": {
+                "sheetId": sheet["id"], "title": title, "index": index, "sheetType": "GRID",
+                "gridProperties": {"rowCount": max(1000, len(sheet["rows"])), "columnCount": 26},
+            }})
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "properties": {"title": f"Mock {spreadsheet_id}", "locale": "zh_TW", "timeZone": "Asia/Taipei"},
+            "sheets": sheets,
+            "spreadsheetUrl": f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/edit",
+        }
+
+    def batch_update(self, spreadsheet_id, body):
+        book = self._book(spreadsheet_id)
+        replies = []
+        for request in body.get("requests", []):
+            if "addSheet" in request:
+                props = dict(request["addSheet"].get("properties", {}))
+                title = props.get("title") or f"Sheet{book['next_id'] + 1}"
+                book["sheets"][title] = {"id": book["next_id"], "rows": []}
+                props.update({"sheetId": book["next_id"], "title": title, "index": len(book["sheets"]) - 1})
+                props.setdefault("sheetType", "GRID")
+                props.setdefault("gridProperties", {"rowCount": 1000, "columnCount": 26})
+                book["next_id"] += 1
+                replies.append({"addSheet": {"properties": props}})
+            elif "deleteSheet" in request:
+                sheet_id = request["deleteSheet"]["sheetId"]
+                book["sheets"] = {t: s for t, s in book["sheets"].items() if s["id"] != sheet_id}
+                replies.append({})
+            elif "insertDimension" in request or "deleteDimension" in request:
+                kind = "insertDimension" if "insertDimension" in request else "deleteDimension"
+                span = request[kind]["range"]
+                sheet = next(s for s in book["sheets"].values() if s["id"] == span["sheetId"])
+                if span.get("dimension", "ROWS") == "ROWS":
+                    start, end = span["startIndex"], span["endIndex"]
+                    if kind == "insertDimension":
+                        if start < len(sheet["rows"]):
+                            sheet["rows"][start:start] = [[] for _ in range(end - start)]
+                    else:
+                        del sheet["rows"][start:end]
+                replies.append({})
+            elif "appendCells" in request:
+                spec = request["appendCells"]
+                sheet = next(s for s in book["sheets"].values() if s["id"] == spec["sheetId"])
+                r0 = len(sheet["rows"])
+                while r0 and not any(cell != "" for cell in sheet["rows"][r0 - 1]):
+                    r0 -= 1
+                values = [[next(iter(cell.get("userEnteredValue", {"": ""}).values())) for cell in row.get("values", [])]
+                          for row in spec.get("rows", [])]
+                self._write(sheet, r0, 0, values)
+                replies.append({})
+            else:
+                replies.append({})
+        return {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+    def _sheet(self, spreadsheet_id, label):
+        book = self._book(spreadsheet_id)
+        default = next(iter(book["sheets"]))
+        title, r0, c0, r1, c1 = parse_a1(label, default)
+        if title not in book["sheets"]:
+            raise KeyError(f"Unable to parse range: {label}")
+        return title, book["sheets"][title], r0, c0, r1, c1
+
+    @staticmethod
+    def _cell(value):
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return value if isinstance(value, str) else str(value)
+
+    def get(self, spreadsheet_id, label):
+        title, sheet, r0, c0, r1, c1 = self._sheet(spreadsheet_id, label)
+        rows = sheet["rows"][(r0 or 0):(None if r1 is None else r1 + 1)]
+        values = []
+        for row in rows:
+            row = row[(c0 or 0):(None if c1 is None else c1 + 1)]
+            while row and row[-1] == "":
+                row = row[:-1]
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        cells = label.rpartition("!")[2] if "!" in label else ""
+        result = {"range": f"'{title}'!{cells or 'A1:Z' + str(max(1, len(sheet['rows'])))}", "majorDimension": "ROWS"}
+        if values:
+            result["values"] = values
+        return result
+
+    def _write(self, sheet, r0, c0, values):
+        for i, row in enumerate(values):
+            target = r0 + i
+            while len(sheet["rows"]) <= target:
+                sheet["rows"].append([])
+            cells = sheet["rows"][target]
+            for j, value in enumerate(row):
+                while len(cells) <= c0 + j:
+                    cells.append("")
+                cells[c0 + j] = self._cell(value)
+
+    def _updated_range(self, title, r0, c0, values):
+        width = max((len(row) for row in values), default=1)
+        return f"'{title}'!{_col_letters(c0)}{r0 + 1}:{_col_letters(c0 + width - 1)}{r0 + len(values)}"
+
+    def update(self, spreadsheet_id, label, body):
+        title, sheet, r0, c0, _, _ = self._sheet(spreadsheet_id, label)
+        values = body.get("values", [])
+        r0, c0 = r0 or 0, c0 or 0
+        self._write(sheet, r0, c0, values)
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "updatedRange": self._updated_range(title, r0, c0, values),
+            "updatedRows": len(values),
+            "updatedCells": sum(len(row) for row in values),
+        }
+
+    def append(self, spreadsheet_id, label, body):
+        title, sheet, _, c0, _, _ = self._sheet(spreadsheet_id, label)
+        values = body.get("values", [])
+        r0 = len(sheet["rows"])
+        while r0 and not any(cell != "" for cell in sheet["rows"][r0 - 1]):
+            r0 -= 1
+        c0 = c0 or 0
+        self._write(sheet, r0, c0, values)
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "tableRange": f"'{title}'!A1:{_col_letters(c0 + max((len(r) for r in values), default=1) - 1)}{r0}",
+            "updates": {
+                "spreadsheetId": spreadsheet_id,
+                "updatedRange": self._updated_range(title, r0, c0, values),
+                "updatedRows": len(values),
+                "updatedCells": sum(len(row) for row in values),
+            },
+        }
+
+    def clear(self, spreadsheet_id, label):
+        title, sheet, r0, c0, r1, c1 = self._sheet(spreadsheet_id, label)
+        for row in sheet["rows"][(r0 or 0):(None if r1 is None else r1 + 1)]:
+            for j in range(c0 or 0, len(row) if c1 is None else min(len(row), c1 + 1)):
+                row[j] = ""
+        return {"spreadsheetId": spreadsheet_id, "clearedRange": label}
+
+    def handle(self, method, path, query, body):
+        """Returns (status, payload) for a /v4/spreadsheets/... request."""
+        match = re.match(r"/v4/spreadsheets/([^/:]+)(.*)", path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Not found"}}
+        spreadsheet_id, rest = match.group(1), unquote(match.group(2))
+        with self.lock:
+            try:
+                if rest == "" and method == "GET":
+                    return 200, self.metadata(spreadsheet_id)
+                if rest == ":batchUpdate":
+                    return 200, self.batch_update(spreadsheet_id, body)
+                if rest == "/values:batchGet":
+                    return 200, {"spreadsheetId": spreadsheet_id,
+                                 "valueRanges": [self.get(spreadsheet_id, r) for r in query.get("ranges", [])]}
+                if rest == "/values:batchUpdate":
+                    responses = [self.update(spreadsheet_id, d["range"], d) for d in body.get("data", [])]
+                    return 200, {"spreadsheetId": spreadsheet_id, "responses": responses,
+                                 "totalUpdatedCells": sum(r["updatedCells"] for r in responses)}
+                if rest == "/values:batchClear":
+                    return 200, {"spreadsheetId": spreadsheet_id,
+                                 "clearedRanges": [self.clear(spreadsheet_id, r)["clearedRange"] for r in body.get("ranges", [])]}
+                if rest.startswith("/values/"):
+                    label, action = re.fullmatch(r"(.*?)(?::(append|clear))?", rest[len("/values/"):]).groups()
+                    if action == "append":
+                        return 200, self.append(spreadsheet_id, label, body)
+                    if action == "clear":
+                        return 200, self.clear(spreadsheet_id, label)
+                    if method == "PUT":
+                        return 200, self.update(spreadsheet_id, label, body)
+                    return 200, self.get(spreadsheet_id, label)
+            except KeyError as e:
+                return 400, {"error": {"code": 400, "message": str(e).strip("'"), "status": "INVALID_ARGUMENT"}}
+        return 404, {"error": {"code": 404, "message": f"Unsupported: {method} {path}"}}
+
+class MockState:
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, rate_429=0.0, rate_5xx=0.0, only=None, log_path=None, seed=None):
+        self.lock = threading.Lock()
+        self.config = {
+            "latency_ms": latency_ms, "jitter_ms": jitter_ms,
+            "rate_429": rate_429, "rate_5xx": rate_5xx,
+            "retry_after": 0, "only": sorted(only) if only else None,
+        }
+        self.random = random.Random(seed)
+        self.records = []
+        self.log_path = log_path
+        self.sheets = MockSpreadsheets()
+        self.uploads = 0
+
+    def fault_for(self, service):
+        """Latency to add and the injected status for this request (None = answer normally)."""
+        with self.lock:
+            cfg = self.config
+            if cfg["only"] and service not in cfg["only"]:
+                return 0.0, None
+            delay = max(0.0, cfg["latency_ms"] + self.random.uniform(-cfg["jitter_ms"], cfg["jitter_ms"])) / 1000
+            roll = self.random.random()
+            if roll < cfg["rate_429"]:
+                return delay, 429
+            if roll < cfg["rate_429"] + cfg["rate_5xx"]:
+                return delay, self.random.choice([500, 502, 503])
+            return delay, None
+
+    def record(self, entry):
+        with self.lock:
+            self.records.append(entry)
+            if self.log_path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def stats(self):
+        with self.lock:
+            records = list(self.records)
+        per_service = {}
+        for r in records:
+            s = per_service.setdefault(r["service"], {"requests": 0, "bytes_in": 0, "statuses": {}, "ms": []})
+            s["requests"] += 1
+            s["bytes_in"] += r["bytes"]
+            s["statuses"][str(r["status"])] = s["statuses"].get(str(r["status"]), 0) + 1
+            s["ms"].append(r["ms"])
+        for s in per_service.values():
+            ms = sorted(s.pop("ms"))
+            s["p50_ms"] = ms[len(ms) // 2]
+            s["p95_ms"] = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        return {"requests": len(records), "services": per_service, "config": self.config}
+
+    def reset(self):
+        with self.lock:
+            self.records = []
+            self.sheets = MockSpreadsheets()
+            self.uploads = 0
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockServices/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _reply(self, status, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def _dispatch(self, method):
+        state = self.server.state
+        start = time.perf_counter()
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if parts.path.startswith("/__mock__/"):
+            self._control(method, parts.path, raw)
+            return
+
+        service = next((name for prefix, name in ROUTES if parts.path.startswith(prefix)), "unknown")
+        delay, injected = state.fault_for(service)
+        if delay:
+            time.sleep(delay)
+
+        if injected == 429:
+            status = 429
+            self._reply(429, {"message": "Too Many Requests (injected)"},
+                        headers={"Retry-After": str(state.config["retry_after"])})
+        elif injected:
+            status = injected
+            self._reply(injected, {"message": f"Injected {injected}"})
+        else:
+            status = self._answer(service, method, parts.path, query, raw)
+
+        state.record({
+            "ts": round(time.time(), 3),
+            "service": service,
+            "method": method,
+            "path": parts.path,
+            "status": status,
+            "bytes": len(raw),
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+
+    def _answer(self, service, method, path, query, raw):
+        state = self.server.state
+        if service == "line":
+            try:
+                payload = json.loads(raw or b"{}")
+            except ValueError:
+                payload = {}
+            if not payload.get("to") or not payload.get("messages"):
+                self._reply(400, {"message": "The request body has 1 error(s)"})
+                return 400
+            self._reply(200, {}, headers={"X-Line-Request-Id": f"mock-{time.time_ns()}"})
+            return 200
+        if service == "imgbb":
+            with state.lock:
+                state.uploads += 1
+                n = state.uploads
+            host = self.headers.get("Host", "127.0.0.1")
+            url = f"http://{host}/i/{n}.png"
+            self._reply(200, {"data": {"id": str(n), "url": url, "display_url": url}, "success": True, "status": 200})
+            return 200
+        if service == "sheets":
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = {}
+            status, payload = state.sheets.handle(method, path, query, body)
+            self._reply(status, payload)
+            return status
+        if service in FEED_FIXTURES:
+            fixture = os.path.join(FIXTURE_DIR, FEED_FIXTURES[service])
+            if not os.path.exists(fixture):
+                self._reply(404, {"message": f"No fixture {fixture}, run bench/record_fixtures.py"})
+                return 404
+            with open(fixture, "rb") as f:
+                body = f.read()
+            content_type = "application/json"
+            if service == "coolpc":
+                content_type = "text/html"
+            elif service == "news":
+                content_type = "application/xml; charset=utf-8"
+            # Conditional GET like a real feed server: unchanged fixture -> 304, no body
+            etag = '"%x-%x"' % (int(os.path.getmtime(fixture)), len(body))
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, b"", content_type=content_type, headers={"ETag": etag})
+                return 304
+            self._reply(200, body, content_type=content_type, headers={"ETag": etag})
+            return 200
+        self._reply(404, {"message": f"No mock for {path}"})
+        return 404
+
+    def _control(self, method, path, raw):
+        state = self.server.state
+        if path == "/__mock__/stats":
+            self._reply(200, state.stats())
+        elif path == "/__mock__/requests":
+            with state.lock:
+                self._reply(200, list(state.records))
+        elif path == "/__mock__/reset" and method == "POST":
+            state.reset()
+            self._reply(200, {"reset": True})
+        elif path == "/__mock__/config" and method == "POST":
+            with state.lock:
+                state.config.update(json.loads(raw or b"{}"))
+                config = dict(state.config)
+            self._reply(200, config)
+        else:
+            self._reply(404, {"message": "Unknown control endpoint"})
+
+def start_server(state, host="127.0.0.1", port=DEFAULT_PORT):
+    """Starts the mock server in a daemon thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="mock-services", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+# --- Load test -------------------------------------------------------------
+
+MOCK_SHEET_URL = "https://docs.google.com/spreadsheets/d/mock-load-test/edit"
+
+def _point_jobs_at(base_url, work_dir):
+    """Must run before the job modules (and endpoints) are imported."""
+    os.environ["MOCK_BASE_URL"] = base_url
+    os.environ["LINE_CHANNEL_ACCESS_TOKEN"] = "mock-token"
+    os.environ["LINE_USER_ID"] = "mock-user"
+    os.environ["IMGBB_API_KEY"] = "mock-key"
+    os.environ["GOOGLE_SHEET_URL"] = MOCK_SHEET_URL
+    os.environ["GSPREAD_JSON"] = ""
+    # Keep local state of load runs away from the real data/ and logs/
+    os.environ["PRICE_DB_PATH"] = os.path.join(work_dir, "price_history.sqlite3")
+    os.environ["COOLPC_SNAPSHOT_DIR"] = os.path.join(work_dir, "coolpc_snapshots")
+    os.environ["COOLPC_STATE_PATH"] = os.path.join(work_dir, "coolpc_state.json")
+    os.environ["TRACE_FILE"] = os.path.join(work_dir, "trace.jsonl")
+
+def _scenario(name, work_dir):
+    """Returns a callable doing one run of the scenario."""
+    if name == "line":
+        from main import LineBotNotifier
+        notifier = LineBotNotifier(os.environ["LINE_CHANNEL_ACCESS_TOKEN"], os.environ["LINE_USER_ID"])
+        return lambda: notifier.send_report("2026-10-17", 123456, "http://127.0.0.1/i/1.png", MOCK_SHEET_URL, -500)
+    if name == "imgbb":
+        from main import ImgBBUploader
+        image = os.path.join(work_dir, "chart.png")
+        with open(image, "wb") as f:
+            f.write(os.urandom(64 * 1024))
+        uploader = ImgBBUploader(os.environ["IMGBB_API_KEY"])
+        return lambda: uploader.upload(image)
+    if name == "sheet":
+        from main import SheetManager
+        import sheet_batch
+        manager = SheetManager("", MOCK_SHEET_URL)
+
+        def append():
+            # Concurrent runs share the batch, so one flush can carry several appends
+            manager.save_to_sheet([["2026-10-17", "Coolpc", 123456, "load test"]])
+            sheet_batch.commit()
+        return append
+
+    import job_runner
+    (job, module), = job_runner.load_jobs([name])
+    return module.main
+
+def run_load(name, runs, concurrency, state):
+    from concurrent.futures import ThreadPoolExecutor
+    import contextlib
+    import io
+
+    work_dir = tempfile.mkdtemp(prefix="mock_load_")
+    server, base_url = start_server(state, port=0)
+    _point_jobs_at(base_url, work_dir)
+    os.chdir(work_dir)
+
+    run_once = _scenario(name, work_dir)
+    state.reset()
+    errors = []
+    latencies = []
+
+    def one(_):
+        t = time.perf_counter()
+        try:
+            run_once()
+        except Exception as e:
+            errors.append(repr(e))
+        latencies.append(time.perf_counter() - t)
+
+    # Job output is noise at hundreds of runs; failures are counted instead
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(runs)))
+    total = time.perf_counter() - start
+    server.shutdown()
+
+    latencies.sort()
+    print(f"Scenario {name}: {runs} runs, concurrency {concurrency}, {total:.2f}s "
+          f"({runs / total * 60:.0f} runs/min)")
+    print(f"run latency p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+          f"p95 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000:.0f} ms, "
+          f"{len(errors)} raised")
+    stats = state.stats()
+    print(f"{'service':<12}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}  statuses")
+    for service, s in sorted(stats["services"].items()):
+        print(f"{service:<12}{s['requests']:>10}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}  {s['statuses']}")
+    for error in sorted(set(errors))[:5]:
+        print(f"  error: {error}")
+    return 0 if not errors else 1
+
+def _option(argv, name, default, cast=float):
+    return cast(argv[argv.index(name) + 1]) if name in argv else default
+
+if __name__ == "__main__":
+    argv = sys.argv[1:]
+    state = MockState(
+        latency_ms=_option(argv, "--latency-ms", 0.0),
+        jitter_ms=_option(argv, "--jitter-ms", 0.0),
+        rate_429=_option(argv, "--rate-429", 0.0),
+        rate_5xx=_option(argv, "--rate-5xx", 0.0),
+        only=_option(argv, "--only", None, lambda v: v.split(",")),
+        log_path=_option(argv, "--log", None, str),
+        seed=_option(argv, "--seed", None, int),
+    )
+    command = argv[0] if argv else "serve"
+    if command == "load":
+        if len(argv) < 2:
+            raise SystemExit("Usage: mock_services.py load line|imgbb|sheet|<job> [--runs N] [--concurrency C]")
+        sys.exit(run_load(argv[1], _option(argv, "--runs", 100, int), _option(argv, "--concurrency", 10, int), state))
+
+    server, base_url = start_server(state, port=_option(argv, "--port", DEFAULT_PORT, int))
+    print(f"Mock services on {base_url}  (MOCK_BASE_URL={base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import sqlite3
+from datetime import date
+
+# Local archive of every news item the scraper fetched, searchable by keyword.
+#
+#   python tools/news_archive.py search "台積電 2奈米" [START] [END]
+#   python tools/news_archive.py first "台積電 2奈米"
+#
+# One row per link with the day it was first and last fetched; titles and
+# sources are indexed in an FTS5 table with the trigram tokenizer, which matches
+# any substring of 3+ characters and so works for Chinese titles without word
+# segmentation. Shorter terms ("AI") fall back to LIKE. START/END (YYYY-MM-DD,
+# inclusive) filter on the publication date.
+
+NEWS_DB_PATH = os.environ.get(
+    "NEWS_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "news_archive.sqlite3")
+)
+COLUMNS = ["published", "first_seen", "category", "source", "title", "link"]
+
+def _match_expression(terms):
+    """FTS5 query ANDing the terms as phrases."""
+    return " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+class NewsArchive:
+    def __init__(self, path=NEWS_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS news (
+                id INTEGER PRIMARY KEY,
+                link TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                source TEXT,
+                category TEXT,
+                published TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_news_published ON news (published);
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                title, source, content='news', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS news_ai AFTER INSERT ON news BEGIN
+                INSERT INTO news_fts (rowid, title, source) VALUES (new.id, new.title, new.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS news_ad AFTER DELETE ON news BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, source) VALUES ('delete', old.id, old.title, old.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS news_au AFTER UPDATE OF title, source ON news BEGIN
+                INSERT INTO news_fts (news_fts, rowid, title, source) VALUES ('delete', old.id, old.title, old.source);
+                INSERT INTO news_fts (rowid, title, source) VALUES (new.id, new.title, new.source);
+            END;
+        """)
+
+    def add(self, news_by_category, seen_on=None):
+        """Stores {category: items} in one transaction. Known links only get their
+        last_seen date moved. Returns the number of new links."""
+        seen_on = seen_on or date.today().isoformat()
+        rows = [
+            (item["link"], item["title"], item.get("source", ""), category,
+             item.get("published") or None, seen_on, seen_on)
+            for category, items in news_by_category.items()
+            for item in items
+            if item.get("link") and item.get("title")
+        ]
+        before = len(self)
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO news (link, title, source, category, published, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (link) DO UPDATE SET last_seen = excluded.last_seen
+                WHERE excluded.last_seen > news.last_seen
+            """, rows)
+        return len(self) - before
+
+    def search(self, keywords, start=None, end=None, order="n.published DESC", limit=50):
+        """Items whose title or source contains every keyword, as dicts of COLUMNS."""
+        terms = [term for term in keywords.split() if term]
+        long_terms = [term for term in terms if len(term) >= 3]
+        sql = f"SELECT {', '.join('n.' + c for c in COLUMNS)} FROM news n"
+        where, params = [], []
+        if long_terms:
+            sql += " JOIN news_fts ON news_fts.rowid = n.id"
+            where.append("news_fts MATCH ?")
+            params.append(_match_expression(long_terms))
+        for term in terms:
+            if len(term) < 3:
+                where.append("(n.title LIKE ? OR n.source LIKE ?)")
+                params += [f"%{term}%"] * 2
+        if start:
+            where.append("n.published >= ?")
+            params.append(start)
+        if end:
+            where.append("n.published < ?")
+            params.append(end + "~")  # any time on the END day
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        return [dict(zip(COLUMNS, row)) for row in self.conn.execute(sql, params)]
+
+    def first_seen(self, keywords, start=None, end=None, limit=5):
+        """Earliest sightings of items matching `keywords`."""
+        return self.search(keywords, start, end, order="n.first_seen, n.published", limit=limit)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("search", "first"):
+        print("Usage: python tools/news_archive.py search \"KEYWORDS\" [START] [END]")
+        print("       python tools/news_archive.py first \"KEYWORDS\" [START] [END]")
+        return
+
+    archive = NewsArchive()
+    start = sys.argv[3] if len(sys.argv) > 3 else None
+    end = sys.argv[4] if len(sys.argv) > 4 else None
+    t0 = time.perf_counter()
+    if sys.argv[1] == "search":
+        rows = archive.search(sys.argv[2], start=start, end=end)
+    else:
+        rows = archive.first_seen(sys.argv[2], start=start, end=end)
+    elapsed = (time.perf_counter() - t0) * 1000
+    for row in rows:
+        print(f"{(row['published'] or '')[:16]}\t{row['first_seen']}\t{row['category']}\t"
+              f"{row['source']}\t{row['title']}\t{row['link']}")
+    print(f"{len(rows)} of {len(archive)} archived items in {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
 
-import feedparser
-import difflib
 import os
+import sys
+import startup_budget
+startup_budget.install()
+
 import json
-import requests
+import time
+import http_client
+import endpoints
+import near_dup
+import rss_stream
+from feed_cache import FeedCache
+from seen_news import SeenNewsStore
+from news_archive import NewsArchive
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from urllib.parse import quote
+from xml.etree.ElementTree import ParseError
 
 # Configuration
-RSS_BASE_URL = "https://news.google.com/rss/search?q={query}&hl=zh-TW&gl=TW&ceid=TW:zh-Hant"
+RSS_BASE_URL = endpoints.GOOGLE_NEWS_RSS_URL + "?q={query}&hl=zh-TW&gl=TW&ceid=TW:zh-Hant"
 
 CATEGORIES = [
     {
@@ -41,63 +51,146 @@ CATEGORIES = [
     }
 ]
 
-def fetch_news(query, limit=3):
-    """Fetches news from Google News RSS."""
+# Items shown per category, and candidates fetched per category so that stories
+# removed as duplicates of another category can be replaced
+NEWS_PER_CATEGORY = 3
+NEWS_CANDIDATES = int(os.environ.get("NEWS_CANDIDATES", "10"))
+
+# feedparser is only imported for feeds the streaming parser rejects
+HEAVY_MODULES = ["feedparser"]
+
+def feed_url(query):
     # Use quote_plus to ensure spaces are handled correctly for URLs
     from urllib.parse import quote_plus
-    encoded_query = quote_plus(query)
-    url = RSS_BASE_URL.format(query=encoded_query)
-    feed = feedparser.parse(url)
-    
-    news_items = []
-    for entry in feed.entries[:limit]:
-        published_parsed = entry.get("published_parsed")
-        date_str = ""
-        if published_parsed:
-            date_str = datetime(*published_parsed[:6]).strftime("%m/%d %H:%M")
-            
-        link = entry.link
-        if len(link) > 1000:
-            print(f"Link too long ({len(link)}), using base URL.")
-            link = "https://news.google.com"
-
-        news_items.append({
-            "title": entry.title,
-            "link": link,
-            "date": date_str,
-            "source": entry.source.title if hasattr(entry, "source") else ""
-        })
-    return news_items
-
-def deduplicate_news(items, threshold=0.8):
-    unique_items = []
-    seen_titles = []
-    
-    for item in items:
-        is_duplicate = False
-        for seen in seen_titles:
-            # Check similarity
-            ratio = difflib.SequenceMatcher(None, item['title'], seen).ratio()
-            if ratio > threshold:
-                is_duplicate = True
+    return RSS_BASE_URL.format(query=quote_plus(query))
+
+def fetch_feed(url, feed_cache=None):
+    """Feed body of `url` -> (content, status). With a FeedCache the request is
+    conditional and a 304 is answered from the stored body."""
+    headers = feed_cache.headers(url) if feed_cache else {}
+    response = http_client.get(url, headers=headers)
+    if response.status_code == 304 and headers:
+        content = feed_cache.body(url)
+        if content is not None:
+            return content, 304
+        response = http_client.get(url)
+    response.raise_for_status()
+    if feed_cache:
+        feed_cache.store(url, response)
+    return response.content, response.status_code
+
+def flex_link(link):
+    """LINE rejects action URIs over 1000 characters: those open the Google News
+    home page. Only the Flex payload uses this; items keep the original link for
+    the seen-news store and the archive."""
+    if len(link) > 1000:
+        print(f"Link too long ({len(link)}), using base URL.")
+        return "https://news.google.com"
+    return link
+
+def _news_item(title, link, published_at, source):
+    date_str = published = ""
+    if published_at:
+        date_str = published_at.strftime("%m/%d %H:%M")
+        published = published_at.isoformat(timespec="minutes")
+
+    return {
+        "title": title,
+        "link": link,
+        "date": date_str,
+        "published": published,
+        "source": source
+    }
+
+def _parse_news_feedparser(content, limit):
+    import feedparser
+    feed = feedparser.parse(content)
+    return [
+        _news_item(
+            entry.title,
+            entry.link,
+            datetime(*entry.published_parsed[:6]) if entry.get("published_parsed") else None,
+            entry.source.title if hasattr(entry, "source") else ""
+        )
+        for entry in feed.entries[:limit]
+    ]
+
+def parse_news(content, limit=3):
+    """RSS body -> [{"title", "link", "date", "published", "source"}] of the first
+    `limit` entries ("published" is ISO, for the archive). Parsing stops after the
+    `limit`-th item (rss_stream.py); feedparser handles feeds expat rejects."""
+    try:
+        return [
+            _news_item(item["title"], item["link"], rss_stream.published_parsed(item["pubDate"]), item["source"])
+            for item in rss_stream.iter_items(content, limit)
+        ]
+    except ParseError as e:
+        print(f"Malformed feed ({e}), parsing it with feedparser.")
+        return _parse_news_feedparser(content, limit)
+
+def fetch_news(query, limit=3, feed_cache=None):
+    """Fetches news from Google News RSS."""
+    try:
+        content, _ = fetch_feed(feed_url(query), feed_cache)
+    except Exception as e:
+        print(f"Error fetching news for {query}: {e}")
+        return []
+    return parse_news(content, limit)
+
+def fetch_all(categories=CATEGORIES, limit=3, max_workers=4, feed_cache=None):
+    """Fetches every category feed on a bounded pool.
+    Returns ({category name: items}, [(name, seconds, status, count)])."""
+    def fetch_one(cat):
+        start = time.perf_counter()
+        try:
+            content, status = fetch_feed(feed_url(cat["query"]), feed_cache)
+            items = parse_news(content, limit)
+        except Exception as e:
+            print(f"Error fetching news for {cat['query']}: {e}")
+            items, status = [], "error"
+        return items, time.perf_counter() - start, status
+
+    all_news, timings = {}, []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(cat["name"], pool.submit(fetch_one, cat)) for cat in categories]
+        for name, future in futures:
+            items, seconds, status = future.result()
+            all_news[name] = items
+            timings.append((name, seconds, status, len(items)))
+    return all_news, timings
+
+def deduplicate_news(items, threshold=near_dup.DEFAULT_THRESHOLD):
+    """Keeps the first of every group of near-duplicate titles (MinHash index,
+    `threshold` is the Jaccard similarity of the title bigrams)."""
+    index = near_dup.NearDuplicateIndex(threshold)
+    return [item for item in items if index.add(item['title'])]
+
+def deduplicate_categories(all_news, per_category=3, threshold=near_dup.DEFAULT_THRESHOLD):
+    """Drops stories already shown in an earlier category (CATEGORIES order) and
+    keeps the first `per_category` remaining items of each category."""
+    index = near_dup.NearDuplicateIndex(threshold)
+    result = {}
+    for cat in CATEGORIES:
+        kept = []
+        for item in all_news.get(cat["name"], []):
+            if len(kept) == per_category:
                 break
-        
-        if not is_duplicate:
-            unique_items.append(item)
-            seen_titles.append(item['title'])
-            
-    return unique_items
+            if index.add(item['title']):
+                kept.append(item)
+        result[cat["name"]] = kept
+    return result
 
 class LineBotNotifier:
     def __init__(self, access_token, user_id):
         self.access_token = access_token
         self.user_id = user_id
-        self.api_url = "https://api.line.me/v2/bot/message/push"
+        self.api_url = endpoints.LINE_PUSH_URL
 
     def send_news_report(self, all_news):
+        """Pushes the Flex carousel. Returns True when LINE accepted it."""
         if not self.access_token or not self.user_id:
             print("LINE Messaging API credentials not set.")
-            return
+            return False
 
         bubbles = []
         
@@ -106,11 +199,9 @@ class LineBotNotifier:
         for cat_data in CATEGORIES:
             category = cat_data["name"]
             query = cat_data["query"]
+            # Already deduplicated across categories (deduplicate_categories)
             items = all_news.get(category, [])
             
-            # Deduplicate news items for the current category
-            items = deduplicate_news(items)
-            
             if not items:
                 continue
                 
@@ -121,7 +212,7 @@ class LineBotNotifier:
                     "type": "box",
                     "layout": "vertical",
                     "margin": "md",
-                    "action": {"type": "uri", "uri": item['link']},
+                    "action": {"type": "uri", "uri": flex_link(item['link'])},
                     "contents": [
                         {
                             "type": "text",
@@ -215,6 +306,10 @@ class LineBotNotifier:
             }
             bubbles.append(bubble)
 
+        if not bubbles:
+            print("No new news to send.")
+            return False
+
         # Create Carousel wrapper
         flex_message = {
             "type": "carousel",
@@ -238,24 +333,49 @@ class LineBotNotifier:
         }
 
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = http_client.post(self.api_url, headers=headers, data=json.dumps(payload))
             if response.status_code == 200:
                 print("News report sent successfully!")
-            else:
-                print(f"Failed to send news report: {response.status_code} - {response.text}")
+                return True
+            print(f"Failed to send news report: {response.status_code} - {response.text}")
         except Exception as e:
             print(f"Error sending news report: {e}")
+        return False
 
-def main():
+def main(max_workers=4):
     print("Fetching news...")
-    all_news = {}
-    
-    for cat in CATEGORIES:
-        print(f"Searching for {cat['name']}...")
-        # Default limit 3
-        items = fetch_news(cat['query'], 3)
-        all_news[cat['name']] = items
-        print(f"Found {len(items)} items.")
+    start = time.perf_counter()
+    # Category feeds are fetched concurrently; unchanged feeds come back as 304
+    feed_cache = FeedCache()
+    candidates, timings = fetch_all(CATEGORIES, NEWS_CANDIDATES, max_workers=max_workers, feed_cache=feed_cache)
+    try:
+        feed_cache.save()
+    except OSError as e:
+        print(f"Could not save feed cache: {e}")
+    for name, seconds, status, count in timings:
+        note = "not modified" if status == 304 else status
+        print(f"{name}: {count} items in {seconds:.2f}s ({note})")
+    print(f"Fetched {len(timings)} feeds in {time.perf_counter() - start:.2f}s "
+          f"(slowest {max((t[1] for t in timings), default=0):.2f}s)")
+
+    # Everything fetched goes into the searchable archive (tools/news_archive.py)
+    try:
+        added = NewsArchive().add(candidates)
+        print(f"Archived {added} new items.")
+    except Exception as e:
+        print(f"Could not archive news: {e}")
+
+    # Stories sent in the last SEEN_NEWS_DAYS days are skipped
+    seen = SeenNewsStore()
+    fresh = {name: seen.filter(items) for name, items in candidates.items()}
+    skipped = sum(len(items) for items in candidates.values()) - sum(len(items) for items in fresh.values())
+    print(f"Skipped {skipped} items already sent in the last {seen.days} days.")
+
+    # The same story often tops several feeds: show it once, in the first category
+    all_news = deduplicate_categories(fresh, NEWS_PER_CATEGORY)
+    fetched = sum(len(items) for items in candidates.values())
+    shown = sum(len(items) for items in all_news.values())
+    print(f"Kept {shown} of {fetched} items after cross-category dedupe.")
 
     # Notify
     from dotenv import load_dotenv
@@ -267,9 +387,16 @@ def main():
     if token and user_id:
         print("Sending LINE notification...")
         notifier = LineBotNotifier(token, user_id)
-        notifier.send_news_report(all_news)
+        if notifier.send_news_report(all_news):
+            seen.mark([item for items in all_news.values() for item in items])
+            try:
+                seen.save()
+            except OSError as e:
+                print(f"Could not save seen-news store: {e}")
     else:
         print("LINE credentials not found. Skipping notification.")
 
 if __name__ == "__main__":
+    if startup_budget.requested():
+        sys.exit(startup_budget.report(HEAVY_MODULES))
     main()
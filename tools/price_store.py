@@ -0,0 +1,106 @@
+import os
+import re
+import sqlite3
+
+# Local mirror of the Price_History worksheet.
+#
+# Every sheet row is stored with its sheet row number, so a sync only has to read
+# the rows after the last one we have. Last-price lookups and the trend chart read
+# from here instead of downloading the whole sheet.
+
+PRICE_DB_PATH = os.environ.get(
+    "PRICE_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "price_history.sqlite3")
+)
+COLUMNS = ["Date", "Vendor", "Total Price", "Details"]
+
+def _to_int(value):
+    try:
+        return int(float(str(value).replace(",", "").replace("$", "").strip() or 0))
+    except ValueError:
+        return 0
+
+class PriceStore:
+    def __init__(self, path=PRICE_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS price_history (
+                sheet_row INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                vendor TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                details TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_vendor_date ON price_history (vendor, date);
+        """)
+
+    def last_row(self):
+        """(sheet row, date, vendor, total) of the newest mirrored row, or None."""
+        return self.conn.execute(
+            "SELECT sheet_row, date, vendor, total FROM price_history ORDER BY sheet_row DESC LIMIT 1"
+        ).fetchone()
+
+    def _insert(self, first_row, values):
+        rows = []
+        for offset, row in enumerate(values):
+            row = list(row) + [""] * (4 - len(row))
+            if not str(row[0]).strip():
+                continue
+            rows.append((first_row + offset, str(row[0]), str(row[1]), _to_int(row[2]), str(row[3])))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO price_history VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def pull(self, worksheet):
+        """Mirrors sheet rows we do not have yet. One Sheets read, sized by the new rows only."""
+        last = self.last_row()
+        # Re-read our last row too: if it no longer matches, the sheet was reset or edited
+        start = last[0] if last else 2
+        values = worksheet.get(f"A{start}:D")
+
+        if last:
+            head = list(values[0]) + [""] * 4 if values else None
+            if not head or head[0] != last[1] or head[1] != last[2] or _to_int(head[2]) != last[3]:
+                print("Local price mirror is out of sync with the sheet, rebuilding it.")
+                with self.conn:
+                    self.conn.execute("DELETE FROM price_history")
+                values = worksheet.get("A2:D")
+                start = 2
+            else:
+                values = values[1:]
+                start += 1
+
+        added = self._insert(start, values)
+        print(f"Price mirror synced: {added} new rows from sheet.")
+        return added
+
+    def record_appended(self, response, data_rows):
+        """Mirrors rows we just appended, using the range reported by append_rows."""
+        first_row = None
+        updated_range = ((response or {}).get("updates") or {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        if match:
+            first_row = int(match.group(1))
+        else:
+            last = self.last_row()
+            first_row = last[0] + 1 if last else 2
+        self._insert(first_row, data_rows)
+
+    def last_price(self, vendor):
+        row = self.conn.execute(
+            "SELECT total FROM price_history WHERE vendor = ? ORDER BY date DESC, sheet_row DESC LIMIT 1",
+            (vendor,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def records(self, vendors=None):
+        """Rows as get_all_records() would return them, oldest first."""
+        sql = "SELECT date, vendor, total, details FROM price_history"
+        params = []
+        if vendors:
+            sql += f" WHERE vendor IN ({', '.join('?' * len(vendors))})"
+            params = list(vendors)
+        sql += " ORDER BY date, sheet_row"
+        return [dict(zip(COLUMNS, row)) for row in self.conn.execute(sql, params)]
@@ -3,7 +3,7 @@ import os
 import sys
 import json
 import re
-import subprocess
+from metal_store import MetalStore
 
 # Expected Issue Title Formats:
 # "Add Stock: 2330.TW 台積電"
@@ -56,26 +56,13 @@ def main():
             print("Stock not found in config, but will check data.")
             changed = True # Force save to ensure clean slate if needed
             
-        # Remove from Data (metal_data.json)
-        data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "docs", "metal_data.json")
-        if os.path.exists(data_path):
-            try:
-                with open(data_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                
-                data_changed = False
-                target_key = f"Stock_{code}"
-                for row in data:
-                    if target_key in row:
-                        del row[target_key]
-                        data_changed = True
-                
-                if data_changed:
-                    with open(data_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
-                    print(f"Removed {target_key} from valid data records.")
-            except Exception as e:
-                print(f"Failed to clean data file: {e}")
+        # Remove from Data (docs/metal_data/ shards)
+        target_key = f"Stock_{code}"
+        try:
+            if MetalStore().drop_series(target_key):
+                print(f"Removed {target_key} from valid data records.")
+        except Exception as e:
+            print(f"Failed to clean data file: {e}")
 
 
     if changed:
@@ -87,11 +74,11 @@ def main():
         
         # Trigger Backfill if Added
         if match_add:
-            print("Running backfill...")
+            print(f"Backfilling {code}...")
             try:
-                # Import and run backfill function directly or via subprocess
-                # Subprocess is safer to avoid pollution
-                subprocess.run(["python", "tools/backfill_dynamic.py"], check=True)
+                # Only the new ticker: other series and cached tickers stay as they are
+                from backfill_dynamic import backfill_stock
+                backfill_stock(code)
             except Exception as e:
                 print(f"Backfill failed: {e}")
                 
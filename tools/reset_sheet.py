@@ -1,7 +1,6 @@
 
 import os
-import gspread
-import json
+import sheets_client
 from dotenv import load_dotenv
 
 # Works even if run from tools/ or root
@@ -18,28 +17,15 @@ def reset_sheet():
         print("Error: GSPREAD_JSON or GOOGLE_SHEET_URL not set in .env")
         return
 
-    # Handle file path or content
-    if os.path.exists(json_val):
-        gc = gspread.service_account(filename=json_val)
-    else:
-        try:
-            creds = json.loads(json_val)
-            gc = gspread.service_account_from_dict(creds)
-        except json.JSONDecodeError:
-             print("Error: GSPREAD_JSON is not a file and not valid JSON.")
-             return
-
     try:
-        sh = gc.open_by_url(sheet_url)
+        # GSPREAD_JSON may be a file path, JSON or base64 JSON (see sheets_client.py)
+        sh = sheets_client.open_spreadsheet(sheet_url)
         print(f"Opened sheet: {sh.title}")
         
-        try:
-            ws = sh.worksheet(WORKSHEET_NAME)
-            print(f"Clearing worksheet '{WORKSHEET_NAME}'...")
-            ws.clear()
-        except gspread.WorksheetNotFound:
-            print(f"Worksheet '{WORKSHEET_NAME}' not found, creating...")
-            ws = sh.add_worksheet(title=WORKSHEET_NAME, rows=1000, cols=10)
+        # Created when missing; clearing keeps the cached handle valid
+        ws = sheets_client.worksheet(sh, WORKSHEET_NAME, rows=1000, cols=10)
+        print(f"Clearing worksheet '{WORKSHEET_NAME}'...")
+        ws.clear()
         
         print("Adding headers...")
         # New Header Format: Date, Vendor, Total Price, Details
@@ -0,0 +1,61 @@
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import XMLPullParser
+
+# Top-N RSS parsing that stops reading once it has the items it needs.
+#
+# Google News feeds hold up to 100 items with long descriptions and we show a
+# handful; feedparser would parse, sanitize and keep all of them. Here the body
+# is fed to expat in chunks and parsing ends after the `limit`-th </item>; each
+# finished item is cleared so only the fields we read are kept. Raises
+# xml.etree.ElementTree.ParseError on XML that expat rejects (the caller falls back to feedparser).
+
+CHUNK_SIZE = 16 * 1024
+
+def _chunks(content, size=CHUNK_SIZE):
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if isinstance(content, (bytes, bytearray)):
+        for start in range(0, len(content), size):
+            yield content[start:start + size]
+    else:
+        yield from content  # already an iterable of chunks (e.g. iter_content())
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def published_parsed(value):
+    """RFC 822 pubDate -> naive UTC datetime (as feedparser's published_parsed), or None."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value.strip())
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def iter_items(content, limit=None):
+    """Yields {"title", "link", "pubDate", "source"} (text, "" when missing) of the
+    first `limit` <item>s of an RSS body (bytes, str or an iterable of chunks)."""
+    if limit is not None and limit <= 0:
+        return
+    parser = XMLPullParser(events=("end",))
+    found = 0
+    for chunk in _chunks(content):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if _local(elem.tag) != "item":
+                continue
+            fields = {"title": "", "link": "", "pubDate": "", "source": ""}
+            for child in elem:
+                name = _local(child.tag)
+                if name in fields and not fields[name]:
+                    fields[name] = (child.text or "").strip()
+            elem.clear()
+            yield fields
+            found += 1
+            if limit is not None and found >= limit:
+                return
+    parser.close()
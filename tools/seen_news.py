@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import hashlib
+
+import near_dup
+
+# News already pushed to LINE, kept across runs so a story that stays on top of
+# a feed is not sent again every morning.
+#
+#   data/news_seen.json   {"version": 1, "links": {fp: day}, "titles": {fp: day}}
+#
+# A fingerprint is the first 16 hex digits of the sha1 of the link, or of the
+# normalized title (near_dup.normalize_title: source suffix, case and punctuation
+# dropped), so the same story from another source or under another link is also
+# caught. `day` is the day number (days since 1970-01-01) it was last sent.
+# Lookups are dict lookups. Entries older than SEEN_NEWS_DAYS are dropped on load
+# and at most SEEN_NEWS_MAX of each kind are kept, the most recently sent ones.
+
+SEEN_NEWS_PATH = os.environ.get(
+    "SEEN_NEWS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "news_seen.json")
+)
+SEEN_NEWS_DAYS = int(os.environ.get("SEEN_NEWS_DAYS", "3"))
+SEEN_NEWS_MAX = int(os.environ.get("SEEN_NEWS_MAX", "5000"))
+
+def _today():
+    return int(time.time() // 86400)
+
+def _fingerprint(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+# Links that do not identify a story (the fallback used for over-long links);
+# fingerprinting them would mark every later story with the same link as seen
+GENERIC_LINKS = {"https://news.google.com", "https://news.google.com/"}
+
+def fingerprints(item):
+    """(link fingerprint, title fingerprint) of a news item; either may be None."""
+    link = (item.get("link") or "").strip()
+    if link in GENERIC_LINKS:
+        link = ""
+    title = near_dup.normalize_title(item.get("title"))
+    return (_fingerprint(link) if link else None), (_fingerprint(title) if title else None)
+
+class SeenNewsStore:
+    def __init__(self, path=SEEN_NEWS_PATH, days=SEEN_NEWS_DAYS, max_entries=SEEN_NEWS_MAX, today=None):
+        self.path = path
+        self.days = days
+        self.max_entries = max_entries
+        self.today = _today() if today is None else today
+        self.links = {}
+        self.titles = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.links = dict(data.get("links", {}))
+                self.titles = dict(data.get("titles", {}))
+            except (OSError, ValueError, AttributeError):
+                print(f"Ignoring unreadable seen-news store {path}")
+        self.expire()
+
+    def __len__(self):
+        return len(self.links) + len(self.titles)
+
+    def expire(self):
+        """Drops entries sent more than `days` days ago and the oldest beyond `max_entries`."""
+        oldest = self.today - self.days + 1
+        for table in (self.links, self.titles):
+            expired = [fp for fp, day in table.items() if day < oldest]
+            for fp in expired:
+                del table[fp]
+            if len(table) > self.max_entries:
+                keep = sorted(table.items(), key=lambda kv: kv[1], reverse=True)[:self.max_entries]
+                table.clear()
+                table.update(keep)
+
+    def seen(self, item):
+        link_fp, title_fp = fingerprints(item)
+        return (link_fp is not None and link_fp in self.links) or \
+               (title_fp is not None and title_fp in self.titles)
+
+    def filter(self, items):
+        """Items not sent within the last `days` days, in order."""
+        return [item for item in items if not self.seen(item)]
+
+    def mark(self, items):
+        """Records `items` as sent today."""
+        for item in items:
+            link_fp, title_fp = fingerprints(item)
+            if link_fp:
+                self.links[link_fp] = self.today
+            if title_fp:
+                self.titles[title_fp] = self.today
+        self.expire()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "links": self.links, "titles": self.titles}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
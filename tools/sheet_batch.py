@@ -0,0 +1,150 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+
+# Coalesced Sheets writes for one run.
+#
+# Jobs queue their writes on the shared batch of the spreadsheet instead of
+# calling the API themselves:
+#
+#   batch = sheet_batch.batch_for(spreadsheet)
+#   batch.append(ws, rows)                    # appendCells
+#   batch.structure(request)                  # insert/delete/appendDimension, ...
+#   batch.update(ws, [{"range": "A5:I5", "values": [[...]]}])   # values, like ws.batch_update
+#   sheet_batch.commit()                      # at the end of the job
+#
+# A flush sends every queued write of every worksheet in at most two requests:
+# one spreadsheets.batchUpdate (structure changes and appends, in queue order)
+# and one values.batchUpdate. Under tools/job_runner.py the jobs' commit() is
+# held and the runner flushes once after all jobs are done, so a full run costs
+# two write requests however many jobs write to the sheet.
+#
+# Each batchUpdate counts as one request against the per-minute write quota
+# (SHEETS_WRITE_QUOTA, 60 per user by default), whatever it contains.
+
+SHEETS_WRITE_QUOTA = int(os.environ.get("SHEETS_WRITE_QUOTA", "60"))
+
+_lock = threading.Lock()
+_batches = {}
+_held = 0
+
+def _cell_data(value):
+    # appendCells takes typed cells; strings are stored as-is (like append_rows with RAW input)
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+class SheetBatch:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+        self.lock = threading.Lock()
+        self.requests = []      # spreadsheets.batchUpdate requests, in queue order
+        self.data = []          # values.batchUpdate ranges
+        self.callbacks = []
+        self.writes = 0         # queued write operations, as separate API calls they would have been
+        self.stats = {"api_calls": 0, "writes": 0, "cells": 0, "bytes": 0}
+
+    def pending(self):
+        return bool(self.requests or self.data)
+
+    def append(self, ws, rows, on_flush=None):
+        """Appends `rows` below the last row with data of `ws`."""
+        with self.lock:
+            self.requests.append({"appendCells": {
+                "sheetId": ws.id,
+                "rows": [{"values": [_cell_data(v) for v in row]} for row in rows],
+                "fields": "userEnteredValue",
+            }})
+            self.writes += 1
+            if on_flush:
+                self.callbacks.append(on_flush)
+
+    def structure(self, *requests):
+        """Spreadsheet requests (insertDimension, deleteDimension, ...), sent before any values."""
+        with self.lock:
+            self.requests.extend(requests)
+            self.writes += 1
+
+    def update(self, ws, data):
+        """Value ranges of `ws` ([{"range": "A1:I1", "values": [[...]]}])."""
+        title = ws.title.replace("'", "''")
+        with self.lock:
+            self.data.extend({"range": f"'{title}'!{block['range']}", "values": block["values"]} for block in data)
+            self.writes += 1
+
+    def flush(self):
+        """Sends everything queued. Returns the stats of this flush."""
+        with self.lock:
+            requests, data, callbacks, writes = self.requests, self.data, self.callbacks, self.writes
+            self.requests, self.data, self.callbacks, self.writes = [], [], [], 0
+
+        stats = {"api_calls": 0, "writes": writes, "cells": 0, "bytes": 0}
+        if requests:
+            body = {"requests": requests}
+            self.spreadsheet.batch_update(body)
+            stats["api_calls"] += 1
+            stats["bytes"] += len(json.dumps(body))
+            stats["cells"] += sum(len(r["values"]) for req in requests
+                                  for r in req.get("appendCells", {}).get("rows", []))
+        if data:
+            body = {"valueInputOption": "RAW", "data": data}
+            self.spreadsheet.values_batch_update(body)
+            stats["api_calls"] += 1
+            stats["bytes"] += len(json.dumps(body))
+            stats["cells"] += sum(len(row) for block in data for row in block["values"])
+        for callback in callbacks:
+            callback()
+
+        for key, value in stats.items():
+            self.stats[key] += value
+        return stats
+
+def batch_for(spreadsheet):
+    """The shared batch of `spreadsheet` for this process."""
+    with _lock:
+        if spreadsheet.id not in _batches:
+            _batches[spreadsheet.id] = SheetBatch(spreadsheet)
+        return _batches[spreadsheet.id]
+
+def report(stats):
+    return (f"{stats['writes']} writes in {stats['api_calls']} API calls "
+            f"({stats['cells']} cells, {stats['bytes'] / 1024:.1f} KB), "
+            f"{stats['api_calls']}/{SHEETS_WRITE_QUOTA} of the per-minute write quota")
+
+def flush_all():
+    """Flushes every batch. Returns the combined stats."""
+    total = {"api_calls": 0, "writes": 0, "cells": 0, "bytes": 0}
+    with _lock:
+        batches = list(_batches.values())
+    for batch in batches:
+        if batch.pending():
+            for key, value in batch.flush().items():
+                total[key] += value
+    if total["writes"]:
+        print(f"Sheets flush: {report(total)}")
+    return total
+
+def commit():
+    """End of a job: flushes now, unless a runner holds the flush for the whole run."""
+    with _lock:
+        held = _held > 0
+    if not held:
+        return flush_all()
+    return None
+
+@contextmanager
+def held():
+    """Makes every commit() inside the block a no-op; the holder calls flush_all() after it."""
+    global _held
+    with _lock:
+        _held += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _held -= 1
@@ -0,0 +1,207 @@
+# Date-keyed differential sync of a worksheet whose first column is the key
+# (Metal_Prices: Date, Copper_TWD_Kg, ...).
+#
+#   sync = SheetSync(ws, headers)
+#   sync.load()                       # 1 call: key column + header row
+#   result = sync.apply(rows)         # rows: [[date, v1, v2, ...]]
+#
+# apply() reads the stored values of the given dates only (one batchGet), then
+# writes the inserted and changed rows, and the header if it differs, in one
+# values batchUpdate. With prune=True, rows whose date is not in `rows` are
+# deleted. Inserted dates are placed in date order (rows are inserted in the
+# middle of the table when needed) and grid growth and deletions go in one
+# spreadsheet batchUpdate. API calls and payload follow the size of the change,
+# not the length of the history.
+#
+# apply(rows, batch=...) queues both writes on a sheet_batch.SheetBatch instead,
+# to be sent together with the other worksheets' writes of the run.
+
+def _col_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _same(stored, value):
+    # Sheets returns text; compare numbers as numbers ("402.1" == 402.1, "16900" == 16900.0)
+    if value is None or value == "":
+        return stored in (None, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return float(str(stored).replace(",", "")) == float(value)
+        except ValueError:
+            return False
+    return str(stored) == str(value)
+
+def _runs(numbers):
+    """Sorted ints -> [(first, count)] of consecutive runs."""
+    runs = []
+    for n in numbers:
+        if runs and runs[-1][0] + runs[-1][1] == n:
+            runs[-1][1] += 1
+        else:
+            runs.append([n, 1])
+    return [tuple(r) for r in runs]
+
+def _merge(kept, new_dates):
+    """Sheet order after inserting sorted `new_dates`: each goes before the first
+    kept date after it (unkeyed rows stay where they are), the rest at the end."""
+    final = []
+    pending = iter(new_dates)
+    nxt = next(pending, None)
+    for d in kept:
+        while d and nxt is not None and nxt < d:
+            final.append(nxt)
+            nxt = next(pending, None)
+        final.append(d)
+    if nxt is not None:
+        final.append(nxt)
+        final.extend(pending)
+    return final
+
+class SyncResult:
+    def __init__(self):
+        self.inserted = 0
+        self.changed = 0
+        self.removed = 0
+        self.cells = 0
+        self.calls = 0
+
+    def __repr__(self):
+        return (f"inserted={self.inserted} changed={self.changed} removed={self.removed} "
+                f"cells={self.cells} api_calls={self.calls}")
+
+class SheetSync:
+    def __init__(self, ws, headers):
+        self.ws = ws
+        self.headers = list(headers)
+        self.width = len(self.headers)
+        self.last_col = _col_letter(self.width - 1)
+        self.header = []
+        self.dates = []       # key column below the header, in sheet order (None: unkeyed row)
+        self.rows = {}        # date -> sheet row number (1-based)
+        self.stored = {}      # date -> stored row (only dates fetched so far)
+        self.calls = 0
+
+    def load(self):
+        """Reads the header row and the key column (one batchGet).
+
+        Rows with a blank key, or repeating a key already seen above, are kept as
+        unkeyed rows (None in `dates`): they keep their place but are never
+        matched, updated or used to order inserted dates; prune=True deletes them."""
+        header, keys = self.ws.batch_get(["1:1", "A2:A"])
+        self.calls += 1
+        self.header = header[0] if header else []
+        self.dates = []
+        self.rows = {}
+        repeated = 0
+        for number, row in enumerate(keys, start=2):
+            date = str(row[0]).strip() if row and row[0] is not None else ""
+            if date and date not in self.rows:
+                self.rows[date] = number
+                self.dates.append(date)
+            else:
+                repeated += bool(date)
+                self.dates.append(None)
+        if repeated:
+            print(f"Warning: {repeated} repeated date row(s) in {getattr(self.ws, 'title', 'the sheet')}, "
+                  f"only the first row of each date is synced")
+        return self
+
+    def last_date(self):
+        return next((d for d in reversed(self.dates) if d), None)
+
+    def fetch(self, dates):
+        """Stored rows of `dates` ({date: [cells]}), one batchGet for all of them."""
+        wanted = sorted({self.rows[d] for d in dates if d in self.rows and d not in self.stored})
+        if wanted:
+            ranges = [f"A{first}:{self.last_col}{first + count - 1}" for first, count in _runs(wanted)]
+            self.calls += 1
+            for (first, count), values in zip(_runs(wanted), self.ws.batch_get(ranges)):
+                for offset in range(count):
+                    row = values[offset] if offset < len(values) else []
+                    self.stored[self.dates[first - 2 + offset]] = list(row) + [""] * (self.width - len(row))
+        return {d: self.stored[d] for d in dates if d in self.stored}
+
+    def apply(self, rows, prune=False, batch=None):
+        result = SyncResult()
+        incoming = {str(row[0]): ["" if v is None else v for v in row[:self.width]] for row in rows}
+        existing = set(self.rows)
+        self.fetch([d for d in incoming if d in existing])
+
+        # 1. Structure: deletions (bottom up), then insertions in date order
+        structure = []
+        removed = [i for i, d in enumerate(self.dates) if prune and d not in incoming]
+        for first, count in reversed(_runs(removed)):
+            structure.append(self._dimension("deleteDimension", first + 1, count))
+        result.removed = len(removed)
+        kept = [d for i, d in enumerate(self.dates) if not (prune and d not in incoming)]
+
+        new_dates = sorted(d for d in incoming if d not in existing)
+        keyed = [d for d in kept if d]
+        if all(a <= b for a, b in zip(keyed, keyed[1:])):
+            final = _merge(kept, new_dates)
+        else:
+            final = kept + new_dates
+        positions = {d: i for i, d in enumerate(final) if d}
+        # New dates before the last kept row need rows inserted; the rest go below the table
+        added = set(new_dates)
+        last_kept = max((i for i, d in enumerate(final) if d not in added), default=-1)
+        middle = sorted(positions[d] for d in new_dates if positions[d] < last_kept)
+        for first, count in _runs(middle):
+            structure.append(self._dimension("insertDimension", first + 1, count))
+        needed = len(final) + 1 - (self.ws.row_count - len(removed) + len(middle))
+        if needed > 0:
+            structure.append({"appendDimension": {"sheetId": self.ws.id, "dimension": "ROWS", "length": needed}})
+        if structure and batch is not None:
+            batch.structure(*structure)
+        elif structure:
+            self.ws.client.batch_update(self.ws.spreadsheet_id, {"requests": structure})
+            result.calls += 1
+
+        # 2. Values: header, inserted and changed rows
+        data = []
+        if [str(h) for h in self.header[:self.width]] != self.headers:
+            data.append({"range": f"A1:{self.last_col}1", "values": [self.headers]})
+        changed_rows = []
+        for date, row in incoming.items():
+            if date in existing:
+                stored = self.stored.get(date, [])
+                if all(_same(stored[j] if j < len(stored) else "", v) for j, v in enumerate(row)):
+                    continue
+                result.changed += 1
+            else:
+                result.inserted += 1
+            changed_rows.append((positions[date] + 2, row))
+        by_number = dict(changed_rows)
+        for first, count in _runs(sorted(by_number)):
+            data.append({
+                "range": f"A{first}:{self.last_col}{first + count - 1}",
+                "values": [by_number[n] for n in range(first, first + count)],
+            })
+        if data and batch is not None:
+            batch.update(self.ws, data)
+        elif data:
+            self.ws.batch_update(data)
+            result.calls += 1
+        if data:
+            result.cells = sum(len(v) for block in data for v in block["values"])
+
+        self.dates = final
+        self.rows = {d: i + 2 for i, d in enumerate(final) if d}
+        self.header = list(self.headers)
+        self.stored.update(incoming)
+        result.calls += self.calls
+        self.calls = 0
+        return result
+
+    def _dimension(self, kind, index, count):
+        # 0-based row index (the header is index 0), half-open range
+        return {kind: {"range": {"sheetId": self.ws.id, "dimension": "ROWS",
+                                 "startIndex": index, "endIndex": index + count}}}
+
+def sync_rows(ws, headers, rows, prune=False):
+    """One-shot load + apply. Returns the SyncResult."""
+    return SheetSync(ws, headers).load().apply(rows, prune=prune)
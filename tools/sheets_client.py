@@ -0,0 +1,139 @@
+import os
+import json
+import base64
+import threading
+from datetime import datetime
+
+import endpoints
+
+# Google Sheets access shared by every tool.
+#
+#   sheets_client.open_spreadsheet()            # GOOGLE_SHEET_URL
+#   sheets_client.worksheet(sheet, "Metal_Prices")
+#
+# - GSPREAD_JSON (path to the service-account key file, the JSON itself or the
+#   JSON in base64) is parsed once per process.
+# - The access token is cached in .cache/google_token.json (SHEETS_TOKEN_CACHE)
+#   until it expires, so runs within the hour do not ask Google for a new one and
+#   a run asks at most once.
+# - One gspread client per process (shared by the jobs of tools/job_runner.py),
+#   whose HTTP client keeps the spreadsheet metadata (sheets_http.py): opening the
+#   spreadsheet and looking up worksheets costs one metadata fetch in total.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_CACHE_PATH = os.environ.get("SHEETS_TOKEN_CACHE", os.path.join(ROOT_DIR, ".cache", "google_token.json"))
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+_lock = threading.Lock()
+_client = None
+_spreadsheets = {}
+_worksheets = {}
+
+def load_service_account_info(value):
+    """GSPREAD_JSON (path, raw JSON or base64 JSON) -> key dict."""
+    if not value or not value.strip():
+        raise ValueError("GSPREAD_JSON is empty.")
+    if os.path.exists(value):
+        with open(value, "r", encoding="utf-8") as f:
+            return json.load(f)
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        try:
+            return json.loads(base64.b64decode(value).decode("utf-8"))
+        except Exception as e:
+            raise ValueError(f"Error parsing GSPREAD_JSON: {e}")
+
+def _load_token(creds, path=TOKEN_CACHE_PATH):
+    """Puts the cached token on `creds` if it belongs to this account and is still valid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("client_email") != creds.service_account_email or cached.get("scopes") != SCOPES:
+            return False
+        creds.token = cached["token"]
+        creds.expiry = datetime.fromisoformat(cached["expiry"])
+    except (OSError, ValueError, KeyError):
+        return False
+    # google-auth treats the token as expired a few minutes early
+    return creds.valid
+
+def _save_token(creds, path=TOKEN_CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    # Only the owner may read the token
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({
+            "client_email": creds.service_account_email,
+            "scopes": SCOPES,
+            "token": creds.token,
+            "expiry": creds.expiry.isoformat(),  # naive UTC, as google-auth keeps it
+        }, f)
+    os.replace(tmp, path)
+
+def get_credentials(json_key_content=None):
+    """Service-account credentials with a valid access token (cached or freshly requested)."""
+    from google.oauth2 import service_account
+    from google.auth.transport.requests import Request
+
+    info = load_service_account_info(json_key_content or os.environ.get("GSPREAD_JSON", ""))
+    creds = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
+    if not _load_token(creds):
+        creds.refresh(Request())
+        try:
+            _save_token(creds)
+        except OSError as e:
+            print(f"Could not cache the Google token: {e}")
+    return creds
+
+def get_client(json_key_content=None):
+    """The shared gspread client (stand-in client when Sheets is mocked). The key
+    defaults to GSPREAD_JSON; only the first call's key is used."""
+    global _client
+    with _lock:
+        if _client is None:
+            import gspread
+            from sheets_http import CachedHTTPClient
+
+            # SHEETS_API_BASE / MOCK_BASE_URL point at a local stand-in that needs no credentials
+            _client = endpoints.mock_sheets_client(http_client=CachedHTTPClient)
+            if _client is None:
+                _client = gspread.Client(get_credentials(json_key_content), http_client=CachedHTTPClient)
+        return _client
+
+def open_spreadsheet(sheet_url=None):
+    """Spreadsheet handle for `sheet_url` (default GOOGLE_SHEET_URL), opened once per process."""
+    sheet_url = sheet_url or os.environ.get("GOOGLE_SHEET_URL")
+    if not sheet_url:
+        raise ValueError("GOOGLE_SHEET_URL is not set.")
+    client = get_client()
+    with _lock:
+        if sheet_url not in _spreadsheets:
+            _spreadsheets[sheet_url] = client.open_by_url(sheet_url)
+        return _spreadsheets[sheet_url]
+
+def worksheet(sheet, title, rows=1000, cols=10, header=None):
+    """Worksheet handle by title, created (with `header` as its first row) when missing.
+    Handles are kept per process."""
+    import gspread
+
+    key = (sheet.id, title)
+    with _lock:
+        if key in _worksheets:
+            return _worksheets[key]
+    try:
+        ws = sheet.worksheet(title)
+    except gspread.WorksheetNotFound:
+        print(f"Worksheet '{title}' not found, creating it...")
+        ws = sheet.add_worksheet(title=title, rows=rows, cols=cols)
+        if header:
+            ws.append_row(header)
+    with _lock:
+        return _worksheets.setdefault(key, ws)
+
+def metadata_fetches():
+    """Spreadsheet metadata requests this process has sent (0 before the first)."""
+    with _lock:
+        client = _client
+    return getattr(getattr(client, "http_client", None), "metadata_fetches", 0)
@@ -0,0 +1,45 @@
+import copy
+import threading
+
+from gspread.http_client import HTTPClient
+
+# gspread HTTP client that keeps spreadsheet metadata for the life of the process.
+#
+# gspread asks for the full spreadsheet metadata on open_by_url() and again on
+# every worksheet()/worksheets() call. With this client the first answer is
+# reused until a request that can change it (batchUpdate: added sheets, inserted
+# or appended rows; values append, which can grow the grid) is sent for that
+# spreadsheet. Imported by sheets_client.get_client() only, gspread is heavy.
+
+class CachedHTTPClient(HTTPClient):
+    def __init__(self, auth, session=None):
+        super().__init__(auth, session)
+        self._metadata = {}
+        self._metadata_lock = threading.Lock()
+        self.metadata_fetches = 0
+
+    def fetch_sheet_metadata(self, id, params=None):
+        if params is not None:
+            return super().fetch_sheet_metadata(id, params=params)
+        with self._metadata_lock:
+            if id not in self._metadata:
+                self._metadata[id] = super().fetch_sheet_metadata(id)
+                self.metadata_fetches += 1
+            # Callers keep references into it (worksheet properties), hand out a copy
+            return copy.deepcopy(self._metadata[id])
+
+    def forget_metadata(self, id):
+        with self._metadata_lock:
+            self._metadata.pop(id, None)
+
+    def batch_update(self, id, body):
+        try:
+            return super().batch_update(id, body)
+        finally:
+            self.forget_metadata(id)
+
+    def values_append(self, id, range, params, body):
+        try:
+            return super().values_append(id, range, params, body)
+        finally:
+            self.forget_metadata(id)
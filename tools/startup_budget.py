@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import builtins
+import importlib
+
+# Cold-start timing for the job scripts.
+#
+#   python main.py --startup-report
+#   python tools/metal_scraper.py --startup-report
+#
+# prints how long each top-level import took while the script was loading, the
+# total against STARTUP_BUDGET_MS, and what each lazily imported heavy dependency
+# costs on first use. Exits 1 when the start-up is over budget.
+
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "300"))
+REPORT_FLAG = "--startup-report"
+
+_start = time.perf_counter()
+_timings = {}
+_depth = 0
+_original_import = builtins.__import__
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _depth
+    if level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    _depth += 1
+    t = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _depth -= 1
+        # Only the outermost import is recorded, so times are inclusive per dependency
+        if _depth == 0:
+            _timings[name] = _timings.get(name, 0.0) + time.perf_counter() - t
+
+def requested():
+    return REPORT_FLAG in sys.argv
+
+def install():
+    """Starts timing imports, only when the script was run with --startup-report."""
+    if requested() and builtins.__import__ is not _timed_import:
+        builtins.__import__ = _timed_import
+
+def report(lazy_modules=(), budget_ms=STARTUP_BUDGET_MS):
+    """Prints the start-up report and returns the exit code (1 if over budget)."""
+    startup_ms = (time.perf_counter() - _start) * 1000
+    builtins.__import__ = _original_import
+
+    print(f"{'module':<32}{'ms':>10}")
+    for name, seconds in sorted(_timings.items(), key=lambda kv: kv[1], reverse=True):
+        print(f"{name:<32}{seconds * 1000:>10.1f}")
+    print("-" * 42)
+    status = "OK" if startup_ms <= budget_ms else "OVER BUDGET"
+    print(f"{'startup total':<32}{startup_ms:>10.1f}  (budget {budget_ms:.0f} ms) {status}")
+
+    if lazy_modules:
+        print()
+        print("Lazy imports (paid on first use only):")
+        for name in lazy_modules:
+            t = time.perf_counter()
+            try:
+                importlib.import_module(name)
+                print(f"{name:<32}{(time.perf_counter() - t) * 1000:>10.1f}")
+            except ImportError as e:
+                print(f"{name:<32}{'missing':>10}  ({e})")
+
+    return 0 if startup_ms <= budget_ms else 1
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# Per-stage timing, one JSON line per finished span:
+#
+#   {"ts": "2026-10-17T08:00:03", "trace": "3f2a...", "job": "pc_price", "span": "scrape",
+#    "parent": null, "ms": 1834.2, "status": "ok", "attrs": {"options": 5120, "path": "http"}}
+#
+#   with tracing.trace("pc_price"):
+#       with tracing.span("upload", bytes=size) as s:
+#           ...
+#           s.set("http_status", 200)      # or tracing.annotate(http_status=200) deeper down
+#
+# Summary of recent runs: python tools/tracing.py [job]
+
+TRACE_FILE = os.environ.get(
+    "TRACE_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "trace.jsonl")
+)
+
+_write_lock = threading.Lock()
+_local = threading.local()
+
+class Span:
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+
+    def set(self, key, value):
+        self.attrs[key] = value
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def _write(record):
+    try:
+        os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with _write_lock:
+            with open(TRACE_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except Exception as e:
+        # Tracing must never break a job
+        print(f"Trace write failed: {e}")
+
+@contextmanager
+def trace(job):
+    """Starts a trace for one job run (per thread), with a root span named after the job."""
+    _local.trace_id = uuid.uuid4().hex[:12]
+    _local.job = job
+    try:
+        with span(job) as root:
+            yield root
+    finally:
+        _local.trace_id = None
+        _local.job = None
+
+@contextmanager
+def span(name, **attrs):
+    stack = _stack()
+    current = Span(name, attrs)
+    parent = stack[-1].name if stack else None
+    stack.append(current)
+    status = "ok"
+    start = time.perf_counter()
+    started_at = datetime.now().isoformat(timespec="seconds")
+    try:
+        yield current
+    except BaseException as e:
+        status = "error"
+        current.attrs["error"] = repr(e)
+        raise
+    finally:
+        stack.pop()
+        _write({
+            "ts": started_at,
+            "trace": getattr(_local, "trace_id", None),
+            "job": getattr(_local, "job", None),
+            "span": name,
+            "parent": parent,
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            "status": status,
+            "attrs": current.attrs,
+        })
+
+def annotate(**attrs):
+    """Adds attributes to the innermost open span of this thread (no-op outside a span)."""
+    stack = _stack()
+    if stack:
+        stack[-1].attrs.update(attrs)
+
+def read_traces(path=TRACE_FILE, job=None):
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if job is None or record.get("job") == job:
+                records.append(record)
+    return records
+
+def summarize(records, runs=7):
+    """Per job/span durations of the last `runs` traces, newest last."""
+    by_trace = {}
+    for record in records:
+        by_trace.setdefault((record.get("job"), record.get("trace")), []).append(record)
+
+    per_job = {}
+    for (job, _), spans in by_trace.items():
+        per_job.setdefault(job, []).append(spans)
+
+    for job, traces in sorted(per_job.items(), key=lambda kv: str(kv[0])):
+        traces = sorted(traces, key=lambda spans: min(s["ts"] for s in spans))[-runs:]
+        names = []
+        for spans in traces:
+            for s in spans:
+                if s["span"] not in names:
+                    names.append(s["span"])
+        print(f"== {job}")
+        print(f"{'span':<20}" + "".join(f"{min(s['ts'] for s in spans)[5:16]:>14}" for spans in traces))
+        for name in names:
+            row = f"{name:<20}"
+            for spans in traces:
+                ms = sum(s["ms"] for s in spans if s["span"] == name)
+                row += f"{ms:>14.0f}" if any(s["span"] == name for s in spans) else f"{'-':>14}"
+            print(row)
+        print()
+
+if __name__ == "__main__":
+    summarize(read_traces(job=sys.argv[1] if len(sys.argv) > 1 else None))
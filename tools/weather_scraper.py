@@ -1,7 +1,13 @@
-import requests
+import sys
+import startup_budget
+startup_budget.install()
+
+import http_client
+import endpoints
 import json
 import os
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Open-Meteo API (No Key Required)
@@ -38,9 +44,9 @@ def get_weather_desc(code):
     return WMO_CODES.get(code, "❓ 未知")
 
 def fetch_weather(lat, lon):
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&daily=weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max&timezone=Asia%2FTaipei"
+    url = f"{endpoints.OPEN_METEO_FORECAST_URL}?latitude={lat}&longitude={lon}&daily=weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max&timezone=Asia%2FTaipei"
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         data = response.json()
         
         # Get today's data (index 0)
@@ -61,7 +67,7 @@ class LineBotNotifier:
     def __init__(self, access_token, user_id):
         self.access_token = access_token
         self.user_id = user_id
-        self.api_url = "https://api.line.me/v2/bot/message/push"
+        self.api_url = endpoints.LINE_PUSH_URL
 
     def send_weather_report(self, weather_data):
         if not self.access_token or not self.user_id:
@@ -145,19 +151,24 @@ class LineBotNotifier:
         }
         
         try:
-            requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            http_client.post(self.api_url, headers=headers, data=json.dumps(payload))
             print("Weather report sent.")
         except Exception as e:
             print(f"Error sending LINE: {e}")
 
-def main():
+def main(max_workers=3):
     print("Fetching weather...")
     results = {}
-    for loc in LOCATIONS:
-        print(f"Fetching {loc['name']}...")
-        data = fetch_weather(loc['lat'], loc['lon'])
-        if data:
-            results[loc['name']] = data
+    # One request per city, fetched concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for loc in LOCATIONS:
+            print(f"Fetching {loc['name']}...")
+            futures[loc['name']] = pool.submit(fetch_weather, loc['lat'], loc['lon'])
+        for name, future in futures.items():
+            data = future.result()
+            if data:
+                results[name] = data
     
     load_dotenv()
     token = os.environ.get("LINE_CHANNEL_ACCESS_TOKEN")
@@ -170,4 +181,6 @@ def main():
         print("Skipping notification (No data or no token)")
 
 if __name__ == "__main__":
+    if startup_budget.requested():
+        sys.exit(startup_budget.report())
     main()